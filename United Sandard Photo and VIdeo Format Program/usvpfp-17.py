@@ -1,562 +1,3041 @@
 # UNITED STANDARD VIDEO & PHOTO FORMAT PROGRAM (PYTHON 3)
 # 1 IMPORT LIBRARY
 # 1.1 IMPORT BUILD-IN LIBRARY
+import argparse
+import asyncio
+import bisect
+import collections
+import concurrent.futures
+import contextlib
+import functools
+import hashlib
+import io
+import itertools
+import json
 import os
 import pathlib
+import random
 import re
+import shutil
+import socket
+import sqlite3
+import struct
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+import zlib
 # 1.2 IMPORT EXTERNAL LIBRARY
 try:	
 	import ffmpeg
-	from PIL import Image
+	from PIL import GifImagePlugin, Image, ImageChops, features
 # 1.3 ERROR MODULE NOT FOUND HANDLING
 except ModuleNotFoundError:
 	print("[!] Module Not Found Error, try \"pip install ffmpeg-python pillow\"")
+# 1.4 IMPORT UNIX ONLY LIBRARY
+try:
+	import resource
+except ImportError:
+	resource = None
+# 1.5 IMPORT OPTIONAL PYAV LIBRARY FOR PROBE WITHOUT SPAWN PROCESS, PIP INSTALL AV
+try:
+	import av
+except ImportError:
+	av = None
 # 2 DEFINE VARIABLE
 # 2.1 DEFINE FOLDER AND RESOLUTION VARIABLE
 DEFAULT_WORKING_DIRECTORY     = pathlib.Path('.')
 DEFAULT_SHORT_SIDE_RESOLUTION = 720 # 1080 FOR BETTER RESOLUTION
 # 2.2 DEFINE FILE FORMAT VARIABLE
-SCAN_PHOTO_FORMAT             = {'.jpg', '.jpeg', '.png', '.bmp', '.webp', '.tiff', '.gif'}
+SCAN_PHOTO_FORMAT             = {'.jpg', '.jpeg', '.png', '.bmp', '.webp', '.avif', '.tiff', '.gif'}
 SCAN_VIDEO_FORMAT             = {'.mp4',  '.mkv', '.mov', '.avi',  '.flv',  '.wmv', '.webm', '.ts'}
 SCAN_ALL_FORMAT               = SCAN_PHOTO_FORMAT | SCAN_VIDEO_FORMAT
+OUTPUT_FORMAT                 = {'gif': '.gif', 'video': '.mp4'} # PHOTO FROM PHOTO OUTPUT FORMAT
+PHOTO_OUTPUT_FORMAT           = {'png': '.png', 'webp': '.webp', 'webp-lossless': '.webp', 'avif': '.avif'}
+PHOTO_OUTPUT_IMAGE_FORMAT     = {'.png': 'PNG', '.webp': 'WEBP', '.avif': 'AVIF'} # PILLOW FORMAT OF OUTPUT EXTENSION
+DEFAULT_PHOTO_OUTPUT          = 'png' # WEBP OR AVIF FOR SMALLER FILE, SMALL PHOTO ALSO RE-ENCODED TO IT
+DEFAULT_PHOTO_QUALITY         = 90 # LOSSY WEBP AND AVIF QUALITY
+# 2.3 DEFINE PARALLEL WORKER VARIABLE
+CPU_COUNT                     = os.cpu_count() or 1
+DEFAULT_PHOTO_WORKER_COUNT    = max(1, CPU_COUNT // 2) # PILLOW PROCESS, REST OF CORE LEFT TO FFMPEG
+DEFAULT_FFMPEG_THREAD_COUNT   = 0 # THREAD PER FFMPEG PROCESS, 0 FOR AUTO FROM SOURCE
+DEFAULT_VIDEO_CORE_BUDGET     = max(1, CPU_COUNT - DEFAULT_PHOTO_WORKER_COUNT) # CORE SHARED BY ALL RUNNING FFMPEG, PHOTO WORKER NOT COUNTED
+DEFAULT_VIDEO_WORKER_COUNT    = DEFAULT_VIDEO_CORE_BUDGET # MAX VIDEO JOB, REAL LIMIT IS CORE BUDGET
+DEFAULT_SHORT_VIDEO_SECOND    = 60 # HALF THREAD, MORE CONCURRENT JOB
+DEFAULT_LONG_VIDEO_SECOND     = 600 # DOUBLE THREAD, FINISH LONG SOURCE SOONER
+VIDEO_THREAD_PLAN             = ((1280 * 720, 2), (1920 * 1080, 4), (2560 * 1440, 6), (float('inf'), 8)) # MAX SOURCE PIXEL, THREAD
+DEFAULT_MAX_PENDING_JOB       = CPU_COUNT * 256 # SUBMITTED BUT NOT COMMITTED JOB
+# 2.4 DEFINE PHOTO DECODE VARIABLE
+PHOTO_DECODE_MODE             = ('quality', 'fast')
+DEFAULT_PHOTO_DECODE_MODE     = 'quality' # FAST FOR DRAFT JPEG DECODE
+DEFAULT_PHOTO_REDUCING_GAP    = 3.0
+GIF_RESIZE_BACKEND            = ('auto', 'stream', 'memory', 'ffmpeg')
+DEFAULT_GIF_BACKEND           = 'auto' # AUTO PICK FFMPEG FOR LARGE GIF, STREAM FOR SMALL GIF
+DEFAULT_GIF_FFMPEG_THRESHOLD  = 100 * 1920 * 1080 # FRAME x WIDTH x HEIGHT
+# 2.5 DEFINE VIDEO ENCODE VARIABLE
+VIDEO_ENCODE_PROFILE          = {
+	'archive'  : {'preset': 'slow',      'crf': 18},
+	'balanced' : {'preset': 'medium',    'crf': 20},
+	'fast'     : {'preset': 'veryfast',  'crf': 22},
+	'draft'    : {'preset': 'ultrafast', 'crf': 26},
+}
+DEFAULT_VIDEO_PROFILE         = 'archive' # LIBX264 PRESET AND CRF FROM VIDEO ENCODE PROFILE
+REMUX_VIDEO_CODEC             = {'h264', 'hevc'}
+REMUX_AUDIO_CODEC             = {'aac', 'mp3'}
+# 2.6 DEFINE PROBE CACHE VARIABLE
+DEFAULT_PROBE_CACHE_PATH      = DEFAULT_WORKING_DIRECTORY / '.usvpfp-probe-cache.sqlite3'
+PROBE_CACHE_VERSION           = 2
+PROBE_VIDEO_ENTRIES           = 'stream=codec_type,codec_name,width,height,nb_frames,duration:format=duration'
+PROBE_MEMO                    = {} # PARSED VIDEO PROBE PER RUN, KEY PATH SIZE MTIME
+DEFAULT_PROBE_WORKER_COUNT    = CPU_COUNT * 2 # CONCURRENT VIDEO PROBE
+DEFAULT_PROBE_WITH_PYAV       = True # USE PYAV INSTEAD OF FFPROBE PROCESS WHEN INSTALLED
+# 2.7 DEFINE INCREMENTAL STATE VARIABLE
+DEFAULT_INCREMENTAL_MODE      = True # FALSE FOR FULL SCAN EVERY RUN
+DEFAULT_STATE_PATH            = DEFAULT_WORKING_DIRECTORY / '.usvpfp-state.json'
+# 2.8 DEFINE FFMPEG RUNNER VARIABLE
+DEFAULT_FFMPEG_TIMEOUT        = 0 # SECOND PER FFMPEG JOB, 0 FOR NO LIMIT
+DEFAULT_FFMPEG_STALL_TIMEOUT  = 300 # SECOND WITHOUT PROGRESS BEFORE KILL, 0 FOR NO LIMIT
+DEFAULT_PROGRESS_INTERVAL     = 10 # SECOND BETWEEN PROGRESS LINE PER JOB, 0 FOR QUIET
+FFMPEG_RUNNER                 = {'loop': None, 'thread': None, 'condition': None, 'used': 0, 'waiting': None}
+FFMPEG_RUNNER_LOCK            = threading.Lock()
+# 2.9 DEFINE SEGMENT ENCODE VARIABLE
+DEFAULT_SEGMENT_MIN_SECOND    = 1800 # SPLIT SOURCE AT LEAST THIS LONG, 0 FOR NEVER
+DEFAULT_SEGMENT_SECOND        = 300 # TARGET SEGMENT LENGTH, CUT AT NEXT KEYFRAME
+DEFAULT_SEGMENT_TOLERANCE     = 0.1 # SECOND OF ALLOWED DURATION AND SYNC DRIFT
+# 2.10 DEFINE JOB JOURNAL VARIABLE
+DEFAULT_JOURNAL_PATH          = DEFAULT_WORKING_DIRECTORY / '.usvpfp-journal.jsonl'
+# 2.11 DEFINE CONVERTION PLAN VARIABLE
+PLAN_VERSION                  = 1
+PLAN_RESULT                   = {'reuse': 1, 'rename': 2, 'error': 3} # PLANNED ACTION RESOLVED WITHOUT WORKER
+PLAN_MARK                     = {'convert': '---', 'reuse': '---', 'rename': '>>>', 'error': 'XXX'}
+# 2.12 DEFINE DISTRIBUTED QUEUE VARIABLE
+DEFAULT_QUEUE_PATH            = DEFAULT_WORKING_DIRECTORY / '.usvpfp-queue.sqlite3'
+DEFAULT_QUEUE_TIMEOUT         = 60 # SECOND WAIT FOR SQLITE LOCK HELD BY OTHER HOST
+DEFAULT_LEASE_SECOND          = 120 # SECOND WITHOUT HEARTBEAT BEFORE LEASE GET RECLAIMED
+DEFAULT_HEARTBEAT_SECOND      = 20 # SECOND BETWEEN LEASE RENEWAL, WELL BELOW LEASE SECOND
+DEFAULT_LEASE_MAX_ATTEMPT     = 3 # CLAIM PER FOLDER BEFORE MARKED FAILED
+DEFAULT_WORKER_IDLE_SECOND    = 5 # SECOND BETWEEN QUEUE POLL WHILE NOTHING TO CLAIM
+DEFAULT_LEASE_MAX_PENDING_JOB = CPU_COUNT # CLAIMED BUT NOT COMMITTED JOB PER WORKER, LEAVE REST OF QUEUE TO OTHER WORKER
+QUEUE_VERSION                 = 1
+# 2.13 DEFINE NATURAL SORT VARIABLE
+NATURAL_SORT_PATTERN          = re.compile(r'(\d+)')
+SORT_KEY_CACHE_SIZE           = 1 << 18 # FILE NAME WITH CACHED SORT KEY, ENOUGH FOR LARGE CAMERA DUMP FOLDER
+# 2.14 DEFINE BENCHMARK SUITE VARIABLE
+BENCHMARK_VERSION             = 1
+BENCHMARK_CORPUS              = {
+	'quick' : {'megapixel': (2, 12),     'photo_count': 2, 'gif': (1024, 768, 24),  'gif_count': 2, 'video_duration': 1, 'rename_count': 20000},
+	'full'  : {'megapixel': (2, 12, 24), 'photo_count': 4, 'gif': (1920, 1080, 90), 'gif_count': 3, 'video_duration': 5, 'rename_count': 100000},
+}
+BENCHMARK_PHOTO_FORMAT        = ('.jpg', '.png', '.webp')
+BENCHMARK_VIDEO_SIZE          = {'480p': (854, 480), '1080p': (1920, 1080), '4k': (3840, 2160)}
+BENCHMARK_STAGE               = ('scan', 'probe', 'photo-convert', 'gif-convert', 'video-encode', 'rename', 'end-to-end')
+# 2.15 DEFINE RUN METRIC VARIABLE
+DEFAULT_METRICS_PATH          = DEFAULT_WORKING_DIRECTORY / '.usvpfp-metrics.json'
+DEFAULT_METRICS_TEXTFILE      = None # PROMETHEUS NODE EXPORTER TEXTFILE PATH, NONE FOR OFF
+METRIC_STAGE                  = ('scan', 'probe', 'decode', 'resize', 'encode', 'save', 'rename', 'delete', 'optimize')
+METRIC_BUCKET                 = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 10, 60, 300, 1800) # SECOND, +INF BUCKET AFTER LAST
+RUN_METRIC                    = {'stage': {}, 'extension': {}, 'folder': {}, 'profile': collections.Counter()}
+RUN_METRIC_LOCK               = threading.Lock()
+METRIC_LOCAL                  = threading.local() # COLLECTOR OF CURRENT CONVERT CALL, GO BACK WITH RESULT FROM PHOTO PROCESS
+# 2.16 DEFINE PROFILE VARIABLE
+DEFAULT_PROFILE_PATH          = None # COLLAPSED STACK OUTPUT, NONE FOR PROFILE OFF
+DEFAULT_PROFILE_INTERVAL      = 0.005 # SECOND BETWEEN STACK SAMPLE
+PROFILE_ROOT                  = ('ProbeAndConvertFile', 'Main')
+PROFILE_THREAD                = {} # THREAD IDENT TO LABEL STACK AND SAMPLE COUNTER
+PROFILE_LOCK                  = threading.Lock()
+PROFILE_SAMPLER_PID           = None
+# 2.17 DEFINE PNG ENCODE VARIABLE
+PNG_ENCODE_PROFILE            = {
+	'fast'     : {'compress_level': 1, 'compress_type': zlib.Z_RLE},
+	'balanced' : {'compress_level': 6},
+	'small'    : {'compress_level': 9},
+	'optimize' : {'optimize': True},
+}
+DEFAULT_PNG_PROFILE           = 'balanced' # PILLOW DEFAULT, FAST FOR LESS ZLIB TIME ON CAMERA PHOTO
+PNG_OPTIMIZER_COMMAND         = {
+	'oxipng'   : ('oxipng', '-o', '2', '--strip', 'safe', '-q', '--out', '{output}', '{input}'),
+	'optipng'  : ('optipng', '-o2', '-quiet', '-out', '{output}', '{input}'),
+	'zopflipng': ('zopflipng', '-y', '{input}', '{output}'),
+}
+DEFAULT_PNG_OPTIMIZER         = None # NONE FOR OFF, RUN AFTER COMMIT IN BACKGROUND POOL
+DEFAULT_PNG_OPTIMIZER_WORKER  = max(1, CPU_COUNT // 2)
+DEFAULT_PNG_OPTIMIZER_TIMEOUT = 600 # SECOND PER FILE, 0 FOR NO LIMIT
+PNG_OPTIMIZER                 = {'pool': None, 'count': 0, 'saved': 0}
+PNG_OPTIMIZER_LOCK            = threading.Lock()
 # 3 DEFINE FUNCTION
 # 3.1 SCAN WORKING DIRECTORY FUNCTION
-def ScanDirectoryWithPathlib(ROOT_PATH):
-	SCAN_RESULT ={}
-	# 3.1.1 RECURSIVE SCAN WITH PATHLIB
-	try:
-		for FILE in ROOT_PATH.rglob('*'):
+def ScanDirectoryWithScandir(ROOT_PATH, STATE=None):
+	FOLDER_STATE = STATE.setdefault('folder', {}) if STATE is not None else {}
+	VISITED_SET  = set()
+	FOLDER_STACK = [ROOT_PATH]
+	# 3.1.1 LOOPING FOLDER STACK
+	while FOLDER_STACK:
+		FOLDER_NAME = FOLDER_STACK.pop()
+		FOLDER_KEY  = os.path.abspath(FOLDER_NAME)
+		RECORD      = FOLDER_STATE.get(FOLDER_KEY)
+		# 3.1.2 SKIP UNCHANGED NORMALIZED FOLDER WITHOUT LISTING
+		if STATE is not None:
 			try:
-				# 3.1.2 FILTER NO FILE IN PATH
-				if not FILE.is_file():
-					continue
-				# 3.1.3 FILTER NOT IN CONTEXT FILE
-				if not FILE.suffix.lower() in SCAN_ALL_FORMAT:
-					continue
-				# 3.1.4 INSERT FILE INTO SCAN RESULT
-				SCAN_RESULT.setdefault(FILE.parent, []).append(FILE)
-			# 3.1.5 ERROR FILE PREMISSION DENIED HANDLING 
-			except PermissionError:
-				print("[!] File %s Permission Denied Error" % FILE[-64:])
-	# 3.1.6 ERROR ROOT DIRECTORY PREMISSION DENIED HANDLING 
-	except PermissionError:
-		print("[!] Root Directory Permission Denied Error")
-		return SCAN_RESULT
-	# 3.1.7 RETURN SECTION
-	return SCAN_RESULT
+				FOLDER_MTIME = os.stat(FOLDER_NAME).st_mtime_ns
+			# 3.1.3 ERROR FOLDER DISAPPEARED OR PERMISSION DENIED HANDLING
+			except OSError:
+				print("[!] Folder %s Stat Error" % str(FOLDER_NAME)[-64:])
+				continue
+			VISITED_SET.add(FOLDER_KEY)
+			if RECORD is not None and RECORD['normalized'] and RECORD['mtime'] == FOLDER_MTIME:
+				for SUBFOLDER_NAME in RECORD['subfolder']:
+					FOLDER_STACK.append(FOLDER_NAME / SUBFOLDER_NAME)
+				continue
+		# 3.1.4 LIST FOLDER WITH SCANDIR
+		NAME_LIST, SUBFOLDER_LIST, FILE_LIST = [], [], []
+		LISTING_START = time.perf_counter()
+		try:
+			with os.scandir(FOLDER_NAME) as ENTRY_LIST:
+				for ENTRY in ENTRY_LIST:
+					NAME_LIST.append(ENTRY.name)
+					# 3.1.5 INSERT SUBFOLDER TO STACK WITH CACHED ENTRY TYPE
+					try:
+						if ENTRY.is_dir(follow_symlinks=False):
+							if not ENTRY.name.startswith('TEMP_SEGMENT_'):
+								SUBFOLDER_LIST.append(ENTRY.name)
+							continue
+						# 3.1.6 FILTER NO FILE IN PATH
+						if not ENTRY.is_file():
+							continue
+					# 3.1.7 ERROR ENTRY DISAPPEARED OR PERMISSION DENIED HANDLING
+					except OSError:
+						print("[!] File %s Permission Denied Error" % ENTRY.path[-64:])
+						continue
+					# 3.1.8 FILTER NOT IN CONTEXT FILE AND UNCOMMITTED OUTPUT, ORPHAN ONE REMOVED ON FOLDER COMMIT
+					if not os.path.splitext(ENTRY.name)[1].lower() in SCAN_ALL_FORMAT or ENTRY.name.startswith('TEMP_OUTPUT_'):
+						continue
+					# 3.1.9 INSERT FILE INTO FOLDER FILE LIST
+					FILE_LIST.append(FOLDER_NAME / ENTRY.name)
+		# 3.1.10 ERROR FOLDER PERMISSION DENIED HANDLING, CONTINUE OTHER FOLDER
+		except PermissionError:
+			print("[!] Folder %s Permission Denied Error" % str(FOLDER_NAME)[-64:])
+			continue
+		# 3.1.11 ERROR FOLDER DISAPPEARED HANDLING
+		except (FileNotFoundError, NotADirectoryError):
+			continue
+		RecordStageTime('scan', time.perf_counter() - LISTING_START)
+		for SUBFOLDER_NAME in reversed(SUBFOLDER_LIST):
+			FOLDER_STACK.append(FOLDER_NAME / SUBFOLDER_NAME)
+		# 3.1.12 SKIP TOUCHED FOLDER WITH SAME NORMALIZED LISTING
+		if STATE is not None:
+			LISTING_HASH = HashFolderListing(NAME_LIST)
+			NORMALIZED   = not FILE_LIST or (RECORD is not None and RECORD['normalized'] and RECORD['listing'] == LISTING_HASH)
+			FOLDER_STATE[FOLDER_KEY] = {'mtime': FOLDER_MTIME, 'listing': LISTING_HASH, 'subfolder': SUBFOLDER_LIST, 'normalized': NORMALIZED}
+			if NORMALIZED:
+				continue
+		# 3.1.13 YIELD FOLDER AS SOON AS LISTING FINISH
+		if FILE_LIST:
+			yield FOLDER_NAME, FILE_LIST
+	# 3.1.14 FORGET DISAPPEARED FOLDER AFTER FULL WALK
+	for FOLDER_KEY in list(FOLDER_STATE):
+		if FOLDER_KEY not in VISITED_SET:
+			del FOLDER_STATE[FOLDER_KEY]
 # 3.2 CONVERT PHOTO WITH PILLOW
-def ConvertPhotoWithPillow(INPUT_PATH, OUTPUT_PATH):
-	# 3.2.1 OPEN IMAGE FILE WITH PILLOW IMAGE
+def ConvertPhotoWithPillow(INPUT_PATH, OUTPUT_PATH, PROBE_INFO=None, CATEGORY=None):
+	# 3.2.1 PROBE IMAGE FILE IF NO PROBE INFORMATION
+	if PROBE_INFO is None:
+		PROBE_INFO = ProbePhotoWithPillow(INPUT_PATH)
+	# 3.2.2 RETURN ERROR PROBE
+	if PROBE_INFO is None:
+		return 3
+	# 3.2.3 GET IMAGE RESOLUTION
+	ORIGINAL_WIDTH, ORIGINAL_HEIGHT = PROBE_INFO['width'], PROBE_INFO['height']
+	# 3.2.4 MAKE RESIZE SCALE
+	IMAGE_SHORT_SIDE_RESOLUTION = min(ORIGINAL_WIDTH, ORIGINAL_HEIGHT)
+	RESIZE_SCALE                = DEFAULT_SHORT_SIDE_RESOLUTION / IMAGE_SHORT_SIDE_RESOLUTION
+	NEW_WIDTH                   = int(ORIGINAL_WIDTH * RESIZE_SCALE)
+	NEW_HEIGHT                  = int(ORIGINAL_HEIGHT * RESIZE_SCALE)
+	# 3.2.5 FILTER STANDARD FILE
+	if IMAGE_SHORT_SIDE_RESOLUTION <= DEFAULT_SHORT_SIDE_RESOLUTION:
+		# 3.2.6 RETURN SKIP FILE STANDARD, RE-ENCODE WITHOUT RESIZE IF COMPACT OUTPUT FORMAT CHOSEN, CATEGORY FROM EXTENSION IF NOT GIVEN
+		if IsRenameOnly(pathlib.Path(INPUT_PATH), CATEGORY or GetFileCategory(pathlib.Path(INPUT_PATH)), PROBE_INFO):
+			return 2
+		NEW_WIDTH, NEW_HEIGHT = ORIGINAL_WIDTH, ORIGINAL_HEIGHT
+	# 3.2.7 OPEN IMAGE FILE WITH PILLOW IMAGE
 	try:
 		INPUT_IMAGE_FILE = Image.open(INPUT_PATH)
-	# 3.2.2 ERROR FILE NOT FOUND HANDLING
+	# 3.2.8 ERROR FILE NOT FOUND HANDLING
 	except FileNotFoundError:
-		print("[!] File %s Not Found Error" % INPUT_PATH[-64:])
-		# 3.2.3 RETURN ERROR FILE NOT FOUND
+		print("[!] File %s Not Found Error" % str(INPUT_PATH)[-64:])
+		# 3.2.9 RETURN ERROR FILE NOT FOUND
 		return 3
-	# 3.2.4 ERROR PERMISSION DENIED HANDLING
+	# 3.2.10 ERROR PERMISSION DENIED HANDLING
 	except PermissionError:
-		print("[!] File %s Permission Denied Error" % INPUT_PATH[-64:])
-		# 3.2.5 RETURN ERROR PERMISSION DENIED
+		print("[!] File %s Permission Denied Error" % str(INPUT_PATH)[-64:])
+		# 3.2.11 RETURN ERROR PERMISSION DENIED
 		return 3
-	# 3.2.6 GET IMAGE RESOLUTION
-	try:
-		ORIGINAL_WIDTH, ORIGINAL_HEIGHT = INPUT_IMAGE_FILE.size
-	except AttributeError:
-		# 3.2.7 RETURN ERROR ATRIBUTE
+	# 3.2.12 ERROR UNREADABLE IMAGE HANDLING
+	except OSError:
+		print("[!] File %s Unidentified Image Error" % str(INPUT_PATH)[-64:])
 		return 3
-	# 3.2.8 MAKE RESIZE SCALE
-	IMAGE_SHORT_SIDE_RESOLUTION = min(ORIGINAL_WIDTH, ORIGINAL_HEIGHT)
-	RESIZE_SCALE                = DEFAULT_SHORT_SIDE_RESOLUTION / IMAGE_SHORT_SIDE_RESOLUTION
-	NEW_WIDTH                   = int(ORIGINAL_WIDTH * RESIZE_SCALE)
-	NEW_HEIGHT                  = int(ORIGINAL_HEIGHT * RESIZE_SCALE)
-	# 3.2.9 FILTER STANDARD FILE
-	if IMAGE_SHORT_SIDE_RESOLUTION <= DEFAULT_SHORT_SIDE_RESOLUTION:
-		# 3.2.10 RETURN SKIP FILE STANDARD
-		return 2
-	# 3.2.11 CHECK IF FILE IS GIF
+	# 3.2.13 CHECK IF FILE IS GIF
 	if getattr(INPUT_IMAGE_FILE, "is_animated", False):
-		FRAME_LIST    = []
-		DURATION_LIST = []
-		# 3.2.12 FRAME LOOPING
-		for FRAME_INDEX in range(INPUT_IMAGE_FILE.n_frames):
-			INPUT_IMAGE_FILE.seek(FRAME_INDEX)
-			# 3.2.13 RESIZE FRAME
-			RESIZED_FRAME = INPUT_IMAGE_FILE.copy().resize((NEW_WIDTH, NEW_HEIGHT), Image.LANCZOS)
-			# 3.2.14 INSERT RESIZED FRAME TO FRAME LIST
-			FRAME_LIST.append(RESIZED_FRAME)
-			# 3.2.15 ADD FRAME DURATION TO DURATION LIST
+		# 3.2.14 HOLD ALL FRAME IN MEMORY FOR ANIMATED PNG AND WEBP
+		if pathlib.Path(OUTPUT_PATH).suffix.lower() != '.gif':
+			GIF_BACKEND = 'memory'
+		else:
+			GIF_BACKEND = SelectGifBackend(INPUT_IMAGE_FILE.n_frames, ORIGINAL_WIDTH, ORIGINAL_HEIGHT)
+		ENCODE_START = time.perf_counter()
+		# 3.2.15 RESIZE GIF WITH FFMPEG, FALLBACK TO STREAM ON FFMPEG ERROR
+		if GIF_BACKEND == 'ffmpeg':
 			try:
-				DURATION_LIST.append(INPUT_IMAGE_FILE.info.get('duration', 100))
-			# 3.2.16 ERROR NO HURATION HANDLING
-			except AttributeError:
-				DURATION_LIST.append(100)
-		# 3.2.17 SAVE ERSIZED GIF TO TOUPUT PATH
-		FRAME_LIST[0].save(OUTPUT_PATH, save_all=True, append_images=FRAME_LIST[1:], duration=DURATION_LIST, loop=INPUT_IMAGE_FILE.info.get('loop', 0), optimize=False)
-		# 3.2.18 RETURN GIF SUCCESS
+				ResizeAnimatedGifWithFFMPEG(INPUT_PATH, OUTPUT_PATH, NEW_WIDTH, NEW_HEIGHT, INPUT_IMAGE_FILE.info.get('loop'))
+			except (ffmpeg.Error, FileNotFoundError):
+				print("[!] File %s FFMPEG Error, Retry With Pillow" % str(INPUT_PATH)[-64:])
+				GIF_BACKEND = 'stream'
+		# 3.2.16 STREAM GIF FRAME BY FRAME WITH BOUNDED MEMORY
+		if GIF_BACKEND == 'stream':
+			ResizeAnimatedGifStreaming(INPUT_IMAGE_FILE, OUTPUT_PATH, NEW_WIDTH, NEW_HEIGHT)
+		# 3.2.17 HOLD ALL FRAME IN MEMORY
+		elif GIF_BACKEND == 'memory':
+			ResizeAnimatedImageInMemory(INPUT_IMAGE_FILE, OUTPUT_PATH, NEW_WIDTH, NEW_HEIGHT)
+		# 3.2.18 RETURN GIF SUCCESS, FRAME DECODE AND RESIZE INTERLEAVE SO WHOLE PIPELINE COUNT AS ENCODE
+		RecordStageTime('encode', time.perf_counter() - ENCODE_START)
 		return 1
-	# 3.2.18 NON GIF PHOTO RESIZE
+	# 3.2.19 NON GIF PHOTO RESIZE
 	else:
-		INPUT_IMAGE_FILE.resize((NEW_WIDTH, NEW_HEIGHT), Image.LANCZOS).save(OUTPUT_PATH)
-		# 3.2.19 RETURN PHOTO SUCCESS
+		# 3.2.20 FAST MODE DECODE JPEG AT 1/2, 1/4, OR 1/8 SCALE, QUALITY MODE FULL DECODE
+		with MeasureStage('decode'):
+			if DEFAULT_PHOTO_DECODE_MODE == 'fast' and INPUT_IMAGE_FILE.format == 'JPEG':
+				INPUT_IMAGE_FILE.draft(INPUT_IMAGE_FILE.mode, (NEW_WIDTH, NEW_HEIGHT))
+			INPUT_IMAGE_FILE.load()
+		# 3.2.21 FAST MODE RESIZE WITH REDUCE, QUALITY MODE SINGLE LANCZOS RESIZE
+		with MeasureStage('resize'):
+			if (NEW_WIDTH, NEW_HEIGHT) == INPUT_IMAGE_FILE.size:
+				RESIZED_IMAGE = INPUT_IMAGE_FILE
+			elif DEFAULT_PHOTO_DECODE_MODE == 'fast':
+				RESIZED_IMAGE = INPUT_IMAGE_FILE.resize((NEW_WIDTH, NEW_HEIGHT), Image.LANCZOS, reducing_gap=DEFAULT_PHOTO_REDUCING_GAP)
+			else:
+				RESIZED_IMAGE = INPUT_IMAGE_FILE.resize((NEW_WIDTH, NEW_HEIGHT), Image.LANCZOS)
+		# 3.2.22 ENCODE IN MEMORY THEN SAVE, SO ENCODE AND DISK WRITE TIME SEPARATE
+		with MeasureStage('encode'):
+			OUTPUT_BUFFER              = io.BytesIO()
+			IMAGE_FORMAT, ENCODE_OPTION = GetPhotoEncodeOption(OUTPUT_PATH)
+			RESIZED_IMAGE.save(OUTPUT_BUFFER, format=IMAGE_FORMAT, **ENCODE_OPTION)
+		with MeasureStage('save'):
+			with open(OUTPUT_PATH, 'wb') as OUTPUT_FILE:
+				OUTPUT_FILE.write(OUTPUT_BUFFER.getbuffer())
+		# 3.2.23 RETURN PHOTO SUCCESS
 		return 1
 # 3.3 CONVERT VIDEO WITH FFMPEG
-def ConvertVideoWithFFMPEG(INPUT_PATH, OUTPUT_PATH):
-	# 3.3.1 OPEN VIDEO FILE WITH FFPROBE
-	try:
-		PROBE_VIDEO = ffmpeg.probe(str(INPUT_PATH))
-	# 3.3.2 ERROR FILE NOT FOUND HANDLING
-	except FileNotFoundError:
-		print("[!] File %s Not Found Error" % INPUT_PATH[-64:])
-		# 3.3.3 RETURN ERROR FILE NOT FOUND
-		return 3
-	# 3.2.4 ERROR PERMISSION DENIED HANDLING
-	except PermissionError:
-		print("[!] File %s Permission Denied Error" % INPUT_PATH[-64:])
-		# 3.3.5 RETURN ERROR PERMISSION DENIED
-		return 3
-	# 3.3.6 ERROR FFMPEG HANDLING
-	except ffmpeg.Error:
-		print("[!] File %s FFMPEG Error" % INPUT_PATH[-64:])
-		# 3.3.7 RETURN ERROR FROM FFMPEG
+def ConvertVideoWithFFMPEG(INPUT_PATH, OUTPUT_PATH, PROBE_INFO=None):
+	# 3.3.1 PROBE VIDEO FILE IF NO PROBE INFORMATION
+	if PROBE_INFO is None:
+		PROBE_INFO = ProbeVideoWithFFMPEG(INPUT_PATH)
+	# 3.3.2 RETURN ERROR PROBE
+	if PROBE_INFO is None:
 		return 3
-	# 3.3.8 GET VIDEO INFORMATION
+	# 3.3.3 GET VIDEO INFORMATION
 	try:
-		VIDEO_STREAM = None
-		# 3.3.9 GET VIDEO STREAM INFORMATION
-		for STREAM in PROBE_VIDEO['streams']:
-			if STREAM['codec_type'] == 'video':
-				VIDEO_STREAM = STREAM
-				break
-		# 3.3.10 FILTER STREAM FILE
-		if VIDEO_STREAM is None:
-			# 3.3.11 RETURN NO VIDEO STREAM
-			return 3
-		# 3.3.12 GET VIDEO RESOLUTION
-		VIDEO_SHORT_SIDE = min(int(VIDEO_STREAM['width']), int(VIDEO_STREAM['height']))
-		# 3.3.13 FILTER STANDARD FILE
+		# 3.3.4 GET VIDEO RESOLUTION
+		VIDEO_SHORT_SIDE = min(PROBE_INFO['width'], PROBE_INFO['height'])
+		# 3.3.5 FILTER STANDARD FILE
 		if VIDEO_SHORT_SIDE <= DEFAULT_SHORT_SIDE_RESOLUTION:
-			# 3.3.14 RETURN SKIP STANDARD FILE
+			# 3.3.6 REMUX STANDARD H.264 OR H.265 FILE IN OTHER CONTAINER TO MP4
+			if not IsRenameOnly(pathlib.Path(INPUT_PATH), 'video', PROBE_INFO) and RemuxVideoWithFFMPEG(INPUT_PATH, OUTPUT_PATH, PROBE_INFO):
+				return 1
+			# 3.3.7 RETURN SKIP STANDARD FILE
 			return 2
-		# 3.3.15 MAKE RESIZE SCALE
+		# 3.3.8 MAKE RESIZE SCALE
 		RESIZE_SCALE = DEFAULT_SHORT_SIDE_RESOLUTION / VIDEO_SHORT_SIDE
-		NEW_WIDTH    = int(VIDEO_STREAM['width'] * RESIZE_SCALE)
-		NEW_HEIGHT   = int(VIDEO_STREAM['height'] * RESIZE_SCALE)
-		# 3.3.16 ROUNDING RESIZE SCALE
+		NEW_WIDTH    = int(PROBE_INFO['width'] * RESIZE_SCALE)
+		NEW_HEIGHT   = int(PROBE_INFO['height'] * RESIZE_SCALE)
+		# 3.3.9 ROUNDING RESIZE SCALE
 		NEW_WIDTH    = NEW_WIDTH // 2 * 2
 		NEW_HEIGHT   = NEW_HEIGHT // 2 * 2
-		# 3.3.17 FFMPEG COMMAND
-		(
+		# 3.3.10 ENCODE LONG SOURCE AS PARALLEL SEGMENT, WHOLE FILE AS FALLBACK
+		if DEFAULT_SEGMENT_MIN_SECOND and (PROBE_INFO['duration'] or 0) >= DEFAULT_SEGMENT_MIN_SECOND:
+			if EncodeVideoInSegment(INPUT_PATH, OUTPUT_PATH, PROBE_INFO, NEW_WIDTH, NEW_HEIGHT):
+				return 1
+			print("[!] File %s Segment Encode Error, Encode Whole File" % str(INPUT_PATH)[-64:])
+		# 3.3.11 PLAN THREAD COUNT FOR THIS SOURCE
+		THREAD_COUNT = PlanFFMPEGThread(PROBE_INFO)
+		# 3.3.12 FFMPEG COMMAND ON ASYNCIO RUNNER, HOLD ONE CORE PER THREAD
+		INPUT_STREAM = ffmpeg.input(str(INPUT_PATH))
+		RunFFMPEGCommand(
 			ffmpeg
-			.input(str(INPUT_PATH))
-			.filter("scale", NEW_WIDTH, NEW_HEIGHT)
-			.output(str(OUTPUT_PATH), vcodec="libx264", acodec="copy", crf=18, preset="slow")
-			.run(overwrite_output=True, quiet=True)
+			.output(INPUT_STREAM.video.filter("scale", NEW_WIDTH, NEW_HEIGHT), INPUT_STREAM['a?'], str(OUTPUT_PATH), vcodec="libx264", acodec="copy", threads=THREAD_COUNT, **VIDEO_ENCODE_PROFILE[DEFAULT_VIDEO_PROFILE]),
+			PROBE_INFO['duration'], INPUT_PATH, THREAD_COUNT
 		)
-		# 3.3.18 RETURN VIDEO SUCCESS
+		# 3.3.13 RETURN VIDEO SUCCESS
 		return 1
-	# 3.3.19 ERROR FFMEPG HANDLING
+	# 3.3.14 ERROR FFMEPG HANDLING
 	except ffmpeg.Error:
-		print("[!] File %s FFMPEG Error" % INPUT_PATH[-64:])
-		# 3.3.20 RETURN FFMPEG ERROR
+		print("[!] File %s FFMPEG Error" % str(INPUT_PATH)[-64:])
+		# 3.3.15 RETURN FFMPEG ERROR
 		return 3
-	# 3.3.21 ERROR PERMISSION DENIED HANDLING
+	# 3.3.16 ERROR PERMISSION DENIED HANDLING
 	except PermissionError as e:
 		print(f" ! Tidak ada izin menulis: {OUTPUT_PATH}")
-		# 3.3.22 RETURN PERMISSION DENIED ERROR
+		# 3.3.17 RETURN PERMISSION DENIED ERROR
 		return 3
 # 3.4 CONVERTION AND RENAME LOGIC
-def SortAndConvertAndRenameLogic(SCAN_FILE_LIST):
-	SORT_RESULT = {}
-	# 3.4.1 LOOPING SORT
-	for FOLDER_NAME, FILE_LIST in SCAN_FILE_LIST.items():
-		TEMPORARY_SORT = []
-		# 3.4.2 LOOPING PER PATH
-		for FILE in FILE_LIST:
-			# 3.4.3 SPLIT FILE NAME WITH REGULAR EXPRESSION
-			PART_NAME = re.split(r'(\d+)', FILE.name)
-			SORT_KEY  = []
-			# 3.4.4 LOOPING PER FILE NAME PART
-			for PART in PART_NAME:
-				# 3.4.5 INSERT FILE PART NAME TO SORT KEY
-				if PART.isdigit():
-					SORT_KEY.append(int(PART))
+def SortAndConvertAndRenameLogic(SCAN_FILE_LIST, INCREMENTAL_STATE=None, PLAN_WRITER=None, LEASE_QUEUE=None):
+	# 3.4.1 OPEN PHOTO PROCESS POOL, VIDEO POOL, PROBE POOL, PROBE CACHE, AND JOURNAL IF EXECUTE
+	PHOTO_POOL   = concurrent.futures.ProcessPoolExecutor(max_workers=DEFAULT_PHOTO_WORKER_COUNT, initializer=ApplyProgramSetting, initargs=(GetProgramSetting(),))
+	VIDEO_POOL   = concurrent.futures.ThreadPoolExecutor(max_workers=DEFAULT_VIDEO_WORKER_COUNT)
+	PROBE_POOL   = concurrent.futures.ThreadPoolExecutor(max_workers=DEFAULT_PROBE_WORKER_COUNT)
+	PROBE_CACHE  = OpenProbeCache(DEFAULT_PROBE_CACHE_PATH)
+	JOURNAL      = OpenJournal(DEFAULT_JOURNAL_PATH) if PLAN_WRITER is None else None
+	FOLDER_QUEUE = collections.deque()
+	FOLDER_SET   = set()
+	PENDING_JOB  = DEFAULT_MAX_PENDING_JOB if LEASE_QUEUE is None else DEFAULT_LEASE_MAX_PENDING_JOB # WORKER CLAIM ONLY WHAT IT CAN RUN
+	try:
+		# 3.4.2 LOOPING PLAN PER FOLDER WHILE SCAN STILL RUNNING, PLAN FROM PLAN FILE AS IS
+		for SCAN_RESULT in SCAN_FILE_LIST:
+			with ProfileScope('plan'):
+				PLAN    = SCAN_RESULT if isinstance(SCAN_RESULT, dict) else PlanFolderConvertion(*SCAN_RESULT, PROBE_CACHE, PROBE_POOL, JOURNAL)
+			FOLDER_NAME = pathlib.Path(PLAN['folder'])
+			FOLDER_SET.add(FOLDER_NAME)
+			# 3.4.3 HAND PLAN TO WRITER INSTEAD OF EXECUTE
+			if PLAN_WRITER is not None:
+				PLAN_WRITER(PLAN)
+				continue
+			# 3.4.4 EXECUTE FOLDER PLAN ON WORKER POOL
+			FOLDER_QUEUE.append((FOLDER_NAME, SubmitFolderConvertion(PLAN, PHOTO_POOL, VIDEO_POOL, JOURNAL)))
+			# 3.4.5 COMMIT FINISHED FOLDER, WAIT IF TOO MANY PENDING JOB, UNSTARTED CLAIMED FOLDER WOULD STARVE IDLE WORKER
+			while FOLDER_QUEUE and (IsFolderJobDone(FOLDER_QUEUE[0][1]) or CountPendingJob(FOLDER_QUEUE) > PENDING_JOB):
+				CommitQueuedFolder(FOLDER_QUEUE, PROBE_CACHE, INCREMENTAL_STATE, JOURNAL, LEASE_QUEUE)
+		# 3.4.6 COMMIT REMAINING FOLDER IN SUBMIT ORDER
+		while FOLDER_QUEUE:
+			CommitQueuedFolder(FOLDER_QUEUE, PROBE_CACHE, INCREMENTAL_STATE, JOURNAL, LEASE_QUEUE)
+		# 3.4.7 EVICT CACHE OF DISAPPEARED FOLDER, KEEP CACHE ON PLAN ONLY RUN AND ON WORKER THAT ONLY SEE ITS LEASE
+		if PLAN_WRITER is None and LEASE_QUEUE is None and INCREMENTAL_STATE is not None:
+			EvictProbeCacheFolder(PROBE_CACHE, INCREMENTAL_STATE['folder'].keys())
+		elif PLAN_WRITER is None and LEASE_QUEUE is None:
+			EvictProbeCacheFolder(PROBE_CACHE, FOLDER_SET)
+	# 3.4.8 CANCEL PENDING JOB AND KILL RUNNING FFMPEG ON INTERRUPT OR ERROR
+	except BaseException:
+		PHOTO_POOL.shutdown(wait=False, cancel_futures=True)
+		VIDEO_POOL.shutdown(wait=False, cancel_futures=True)
+		PROBE_POOL.shutdown(wait=False, cancel_futures=True)
+		StopFFMPEGRunner()
+		StopPngOptimizer(CANCEL=True)
+		raise
+	# 3.4.9 CLOSE PROBE CACHE AND JOURNAL
+	finally:
+		if PROBE_CACHE is not None:
+			PROBE_CACHE.close()
+		if JOURNAL is not None and JOURNAL['file'] is not None:
+			with JOURNAL['lock']:
+				JOURNAL['file'].close()
+				JOURNAL['file'] = None
+	# 3.4.10 CLOSE POOL AFTER ALL JOB FINISH
+	PHOTO_POOL.shutdown(wait=True)
+	VIDEO_POOL.shutdown(wait=True)
+	PROBE_POOL.shutdown(wait=True)
+	StopFFMPEGRunner()
+	StopPngOptimizer()
+	# 3.4.11 RETURN PROCESSED FOLDER COUNT
+	return len(FOLDER_SET)
+# 3.5 GET FILE CATEGORY
+def GetFileCategory(FILE):
+	# 3.5.1 FILTER GIF FILE
+	if FILE.suffix.lower() == '.gif':
+		return 'gif'
+	# 3.5.2 FILTER PHOTO FILE
+	if FILE.suffix.lower() in SCAN_PHOTO_FORMAT:
+		return 'photo'
+	# 3.5.3 FILTER VIDEO FILE
+	if FILE.suffix.lower() in SCAN_VIDEO_FORMAT:
+		return 'video'
+	# 3.5.4 RETURN NOT IN CONTEXT FILE
+	return None
+# 3.6 SORT FILE LIST NATURALLY
+def SortFileListNaturally(FILE_LIST):
+	# 3.6.1 SORT WITH CACHED TUPLE KEY PER FILE NAME
+	return sorted(FILE_LIST, key=lambda FILE: GetNaturalSortKey(FILE.name))
+# 3.7 SUBMIT FOLDER PLAN TO WORKER POOL
+def SubmitFolderConvertion(PLAN, PHOTO_POOL, VIDEO_POOL, JOURNAL=None):
+	JOB_LIST    = []
+	FOLDER_NAME = pathlib.Path(PLAN['folder'])
+	# 3.7.1 LOOPING PER PLANNED JOB IN SORTED ORDER
+	for JOB in PLAN['job']:
+		FILE     = FOLDER_NAME / JOB['name']
+		CATEGORY = JOB['category']
+		# 3.7.2 TEMPORARY OUTPUT NAME OUTSIDE NUMBERED NAME
+		TEMP_OUTPUT = FOLDER_NAME / ('TEMP_OUTPUT_%s%s' % (JOB['name'], GetOutputFormat(CATEGORY)))
+		# 3.7.3 GET FILE STAT IDENTITY
+		try:
+			FILE_STAT = FILE.stat()
+		# 3.7.4 ERROR FILE DISAPPEARED HANDLING
+		except OSError:
+			FILE_STAT = None
+		# 3.7.5 RESOLVE PLANNED RESULT WITHOUT WORKER
+		if JOB['action'] in PLAN_RESULT:
+			FUTURE = concurrent.futures.Future()
+			FUTURE.set_result((PLAN_RESULT[JOB['action']], JOB['probe'], None))
+			JOB_LIST.append((FILE, FILE_STAT, CATEGORY, TEMP_OUTPUT, FUTURE))
+			continue
+		# 3.7.6 SEND CONVERT JOB TO WORKER POOL
+		JOB_LIST.append(SubmitFileConvertion(FILE, FILE_STAT, CATEGORY, TEMP_OUTPUT, JOB['probe'], PHOTO_POOL, VIDEO_POOL, JOURNAL))
+	# 3.7.7 RETURN FOLDER JOB LIST
+	return JOB_LIST
+# 3.8 COMMIT FOLDER CONVERTION RESULT IN SORTED ORDER
+def CommitFolderConvertion(FOLDER_NAME, JOB_LIST, PROBE_CACHE=None, JOURNAL=None):
+	RESULT_LIST    = []
+	KEEP_PATH_SET  = set()
+	COMMIT_SUCCESS = True
+	FOLDER_SIZE    = [0, 0] # BYTE READ AND WRITTEN BY CONVERTED FILE
+	# 3.8.1 PRINT CURRENT FOLDER
+	print("[+] %s" % FOLDER_NAME)
+	# 3.8.2 WAIT ALL WORKER IN FOLDER
+	for FILE, FILE_STAT, CATEGORY, TEMP_OUTPUT, FUTURE in JOB_LIST:
+		try:
+			CONVERTION_RESULT, PROBE_INFO, METRIC = FUTURE.result()
+		# 3.8.3 ERROR WORKER HANDLING
+		except Exception:
+			print("[!] File %s Worker Error" % FILE.name[-64:])
+			CONVERTION_RESULT, PROBE_INFO, METRIC = 3, None, None
+		MergeMetric(METRIC)
+		RESULT_LIST.append((FILE, CATEGORY, TEMP_OUTPUT, CONVERTION_RESULT, FILE_STAT, PROBE_INFO))
+	# 3.8.4 REMOVE ORPHAN TEMPORARY OUTPUT WITHOUT JOB IN FOLDER, SCAN HIDE IT FROM EVERY LATER RUN
+	RemoveOrphanTempOutput(FOLDER_NAME, {TEMP_OUTPUT.name for FILE, FILE_STAT, CATEGORY, TEMP_OUTPUT, FUTURE in JOB_LIST})
+	# 3.8.5 NAME OUTPUT IN SORTED ORDER, ERROR FILE KEEP ITS NAME AND NUMBER SKIP IT
+	OUTPUT_LIST = NameFolderOutput(
+		[None if RESULT[3] == 3 else RESULT[1] for RESULT in RESULT_LIST],
+		{RESULT[0].name for RESULT in RESULT_LIST if RESULT[3] == 3}
+	)
+	OUTPUT_NAME_SET = set(OUTPUT_LIST)
+	# 3.8.6 BUILD WHOLE FOLDER PERMUTATION, CONVERTED SOURCE ONLY MOVED ASIDE IF ITS NAME IS AN OUTPUT
+	MOVE_LIST, DELETE_LIST = [], []
+	for (FILE, CATEGORY, TEMP_OUTPUT, CONVERTION_RESULT, FILE_STAT, PROBE_INFO), OUTPUT_NAME in zip(RESULT_LIST, OUTPUT_LIST):
+		if CONVERTION_RESULT == 1:
+			MOVE_LIST.append((TEMP_OUTPUT, FOLDER_NAME / OUTPUT_NAME))
+			DELETE_FILE = FILE
+			if FILE.name in OUTPUT_NAME_SET:
+				DELETE_FILE = FOLDER_NAME / ('TEMP_RENAME_%s%s' % (uuid.uuid4().hex, FILE.suffix))
+				MOVE_LIST.append((FILE, DELETE_FILE))
+			DELETE_LIST.append(DELETE_FILE)
+		elif CONVERTION_RESULT == 2:
+			MOVE_LIST.append((FILE, FOLDER_NAME / OUTPUT_NAME))
+		# 3.8.7 REMOVE TEMPORARY OUTPUT OF SKIPPED AND FAILED FILE
+		if CONVERTION_RESULT != 1:
+			RemoveFileSafely(TEMP_OUTPUT, QUIET=True)
+	# 3.8.8 JOURNAL THEN APPLY PERMUTATION, ROLL BACK EVERY RENAME ON FAILURE
+	RENAME_ORDER = OrderFolderRename(MOVE_LIST)
+	WriteJournal(JOURNAL, {'op': 'rename', 'folder': os.path.abspath(FOLDER_NAME), 'move': [[SOURCE.name, TARGET.name] for SOURCE, TARGET in RENAME_ORDER]})
+	with MeasureStage('rename'):
+		RENAME_SUCCESS = ApplyFolderRename(RENAME_ORDER)
+	if not RENAME_SUCCESS:
+		print("[!] Folder %s Rename Error, Rolled Back" % str(FOLDER_NAME)[-64:])
+		for FILE, CATEGORY, TEMP_OUTPUT, CONVERTION_RESULT, FILE_STAT, PROBE_INFO in RESULT_LIST:
+			KEEP_PATH_SET.add(FILE)
+			CountExtensionFile(FILE, 'error')
+		EvictProbeCache(PROBE_CACHE, FOLDER_NAME, KEEP_PATH_SET)
+		WriteJournal(JOURNAL, {'op': 'folder-done', 'folder': os.path.abspath(FOLDER_NAME)})
+		return False
+	# 3.8.9 JOURNAL RENAME DONE, FROM HERE RECOVERY FINISH DELETE INSTEAD OF ROLL BACK
+	WriteJournal(JOURNAL, {'op': 'renamed', 'folder': os.path.abspath(FOLDER_NAME), 'delete': [DELETE_FILE.name for DELETE_FILE in DELETE_LIST]})
+	with MeasureStage('delete'):
+		for DELETE_FILE in DELETE_LIST:
+			if not RemoveFileSafely(DELETE_FILE):
+				COMMIT_SUCCESS = False
+	# 3.8.10 LOOPING PRINT AND CACHE PER FILE
+	for (FILE, CATEGORY, TEMP_OUTPUT, CONVERTION_RESULT, FILE_STAT, PROBE_INFO), OUTPUT_NAME in zip(RESULT_LIST, OUTPUT_LIST):
+		# 3.8.11 CONVERTION RESULT SUCCESS
+		if CONVERTION_RESULT == 1:
+			print(" + [+] %s --- %s" % (FILE.name[-64:], OUTPUT_NAME[-64:]))
+			KEEP_PATH_SET.add(FOLDER_NAME / OUTPUT_NAME)
+			CountExtensionFile(FILE, 'convert')
+			READ_SIZE = FILE_STAT.st_size if FILE_STAT is not None else 0
+			with contextlib.suppress(OSError):
+				WRITTEN_SIZE = os.path.getsize(FOLDER_NAME / OUTPUT_NAME)
+				CountExtensionFile(FILE, 'bytes_read', READ_SIZE)
+				CountExtensionFile(FILE, 'bytes_written', WRITTEN_SIZE)
+				FOLDER_SIZE[0] += READ_SIZE
+				FOLDER_SIZE[1] += WRITTEN_SIZE
+			if DEFAULT_PNG_OPTIMIZER and CATEGORY == 'photo' and OUTPUT_NAME.endswith('.png'):
+				SubmitPngOptimize(FILE, FOLDER_NAME / OUTPUT_NAME)
+		# 3.8.12 CONVERTION RESULT SKIP, MOVE CACHE ENTRY TO OUTPUT NAME, RENAME KEEP STAT IDENTITY
+		elif CONVERTION_RESULT == 2:
+			print(" + [+] %s >>> %s" % (FILE.name[-64:], OUTPUT_NAME[-64:]))
+			if FILE_STAT is not None:
+				WriteProbeCache(PROBE_CACHE, FOLDER_NAME / OUTPUT_NAME, FILE_STAT, PROBE_INFO)
+			KEEP_PATH_SET.add(FOLDER_NAME / OUTPUT_NAME)
+			CountExtensionFile(FILE, 'skip')
+		# 3.8.13 CONVERTION RESULT ERROR, CACHE PROBE OF FILE THAT FAILED AFTER PROBE
+		else:
+			print(" + [+] %s XXX %s" % (FILE.name[-64:], FILE.name[-64:]))
+			COMMIT_SUCCESS = False
+			if FILE_STAT is not None:
+				WriteProbeCache(PROBE_CACHE, FILE, FILE_STAT, PROBE_INFO)
+			KEEP_PATH_SET.add(FILE)
+			CountExtensionFile(FILE, 'error')
+	# 3.8.14 PRINT AND RECORD BYTE SAVED BY CONVERTED FILE IN FOLDER
+	if FOLDER_SIZE[0]:
+		print(" + [*] %.1f MiB >>> %.1f MiB, %s %.1f MiB (%.0f%%)" % (FOLDER_SIZE[0] / 1048576, FOLDER_SIZE[1] / 1048576, 'Saved' if FOLDER_SIZE[0] >= FOLDER_SIZE[1] else 'Grew By', abs(FOLDER_SIZE[0] - FOLDER_SIZE[1]) / 1048576, abs(FOLDER_SIZE[0] - FOLDER_SIZE[1]) * 100 / FOLDER_SIZE[0]))
+		CountFolderByte(FOLDER_NAME, 'bytes_read', FOLDER_SIZE[0])
+		CountFolderByte(FOLDER_NAME, 'bytes_written', FOLDER_SIZE[1])
+	# 3.8.15 EVICT CACHE OF DISAPPEARED FILE IN FOLDER
+	EvictProbeCache(PROBE_CACHE, FOLDER_NAME, KEEP_PATH_SET)
+	# 3.8.16 MARK FOLDER COMMIT FINISHED IN JOURNAL
+	WriteJournal(JOURNAL, {'op': 'folder-done', 'folder': os.path.abspath(FOLDER_NAME)})
+	# 3.8.17 RETURN TRUE IF EVERY FILE GET NORMALIZED NAME
+	return COMMIT_SUCCESS
+# 3.9 RENAME FILE WITH ERROR HANDLING
+def RenameFileSafely(SOURCE_PATH, TARGET_PATH):
+	try:
+		os.rename(SOURCE_PATH, TARGET_PATH)
+	# 3.9.1 ERROR PERMISSION DENIED HANDLING
+	except PermissionError:
+		print("[!] File %s Permission Denied Error" % SOURCE_PATH.name[-64:])
+		return False
+	# 3.9.2 ERROR FILE NOT FOUND HANDLING
+	except FileNotFoundError:
+		print("[!] File %s File Not Found Error" % SOURCE_PATH.name[-64:])
+		return False
+	# 3.9.3 RETURN RENAME SUCCESS
+	return True
+# 3.10 REMOVE FILE WITH ERROR HANDLING
+def RemoveFileSafely(PATH, QUIET=False):
+	try:
+		os.remove(PATH)
+	# 3.10.1 ERROR PERMISSION DENIED HANDLING
+	except PermissionError:
+		if not QUIET:
+			print("[!] File %s Permission Denied Error" % PATH.name[-64:])
+		return False
+	# 3.10.2 ERROR FILE NOT FOUND HANDLING
+	except FileNotFoundError:
+		if not QUIET:
+			print("[!] File %s File Not Found Error" % PATH.name[-64:])
+		return False
+	# 3.10.3 RETURN REMOVE SUCCESS
+	return True
+# 3.11 PROBE PHOTO WITH PILLOW
+def ProbePhotoWithPillow(INPUT_PATH):
+	# 3.11.1 OPEN IMAGE FILE WITH PILLOW IMAGE
+	try:
+		INPUT_IMAGE_FILE = Image.open(INPUT_PATH)
+	# 3.11.2 ERROR FILE NOT FOUND HANDLING
+	except FileNotFoundError:
+		print("[!] File %s Not Found Error" % str(INPUT_PATH)[-64:])
+		return None
+	# 3.11.3 ERROR PERMISSION DENIED HANDLING
+	except PermissionError:
+		print("[!] File %s Permission Denied Error" % str(INPUT_PATH)[-64:])
+		return None
+	# 3.11.4 ERROR UNREADABLE IMAGE HANDLING
+	except OSError:
+		print("[!] File %s Unidentified Image Error" % str(INPUT_PATH)[-64:])
+		return None
+	# 3.11.5 GET IMAGE INFORMATION
+	with INPUT_IMAGE_FILE:
+		ORIGINAL_WIDTH, ORIGINAL_HEIGHT = INPUT_IMAGE_FILE.size
+		FRAME_COUNT = 1
+		# 3.11.6 COUNT FRAME ONLY FOR ANIMATED IMAGE
+		if getattr(INPUT_IMAGE_FILE, "is_animated", False):
+			FRAME_COUNT = INPUT_IMAGE_FILE.n_frames
+		# 3.11.7 RETURN PROBE INFORMATION
+		return {'width': ORIGINAL_WIDTH, 'height': ORIGINAL_HEIGHT, 'codec': INPUT_IMAGE_FILE.format, 'frame_count': FRAME_COUNT, 'duration': None, 'audio_codec': None}
+# 3.12 PROBE VIDEO WITH FFPROBE
+def ProbeVideoWithFFMPEG(INPUT_PATH):
+	# 3.12.1 RETURN PARSED PROBE FROM THIS RUN IF FILE NOT CHANGED
+	try:
+		FILE_STAT = os.stat(str(INPUT_PATH))
+		MEMO_KEY  = (os.path.abspath(str(INPUT_PATH)), FILE_STAT.st_size, FILE_STAT.st_mtime_ns)
+	except OSError:
+		MEMO_KEY  = None
+	if MEMO_KEY in PROBE_MEMO:
+		return PROBE_MEMO[MEMO_KEY]
+	# 3.12.2 PROBE INSIDE PROCESS WITH PYAV IF INSTALLED, OTHERWISE SPAWN FFPROBE
+	with MeasureStage('probe'):
+		if av is not None and DEFAULT_PROBE_WITH_PYAV:
+			PROBE_INFO = ProbeVideoWithPyAV(INPUT_PATH)
+		else:
+			PROBE_INFO = ProbeVideoWithFFProbe(INPUT_PATH)
+	# 3.12.3 SAVE PARSED PROBE FOR NEXT CONSUMER
+	if MEMO_KEY is not None and PROBE_INFO is not None:
+		PROBE_MEMO[MEMO_KEY] = PROBE_INFO
+	# 3.12.4 RETURN PROBE INFORMATION
+	return PROBE_INFO
+# 3.13 PROBE AND CONVERT FILE INSIDE WORKER
+def ProbeAndConvertFile(CATEGORY, INPUT_PATH, OUTPUT_PATH, PROBE_INFO=None):
+	# 3.13.1 COLLECT STAGE TIME OF THIS CALL, PHOTO PROCESS CANNOT WRITE RUN METRIC OF MAIN PROCESS
+	METRIC_LOCAL.metric = METRIC = {'stage': {}, 'profile': collections.Counter()}
+	try:
+		# 3.13.2 LABEL PROFILE SAMPLE WITH CATEGORY AND FORMAT
+		with ProfileScope('%s %s' % (CATEGORY, pathlib.Path(INPUT_PATH).suffix.lower()), METRIC['profile']):
+			# 3.13.3 PROBE FILE IF NOT FOUND IN CACHE
+			if PROBE_INFO is None:
+				if CATEGORY == 'video':
+					PROBE_INFO = ProbeVideoWithFFMPEG(INPUT_PATH)
 				else:
-					SORT_KEY.append(PART.lower())
-			# 3.4.6 INSERT FILE SORT KEY TO TEMPORARY SORT
-			TEMPORARY_SORT.append((SORT_KEY, FILE))
-			# 3.4.7 SORT TEMPORARY SORT
-		TEMPORARY_SORT.sort()
-		# 3.4.8 LOOPING TEMPORARY SORT
-		for FILE in TEMPORARY_SORT:
-			# 3.4.9 INSERT FILE TO SORT RESULT
-			SORT_RESULT.setdefault(FOLDER_NAME, []).append(FILE[1])
-	# 3.4.10 LOOPING CONVERT AND RENAME
-	for FOLDER_NAME, FILE_LIST in SORT_RESULT.items():
-		PHOTO_COUNT = GIF_COUNT = VIDEO_COUNT = 0
-		# 3.4.11 PRINT CURRENT FOLDER
-		print("[+] %s" % FOLDER_NAME)
-		# 3.4.12 LOOPING PER FILE
-		for FILE in FILE_LIST:
-			# 3.4.13 FILTER GIF FILE
-			if FILE.suffix.lower() == '.gif':
-				# 3.4.14 GIF FILE OUTPUT NAME
-				OUTPUT_PATH = FILE.parent / ('%s.gif' % GIF_COUNT)
-				# 3.4.15 FILTER DIGIT NAME GIF FILE
-				if FILE.stem.isdigit():
-					# 3.4.16 TEMPORARY GIF FILE NAME
-					TEMP_FILE = FILE.parent / ('TEMP_%s' % FILE.name)
-					# 3.4.17 RENAME DIGIT FILE TO TEMPORARY FILE
-					try:
-						os.rename(FILE, TEMP_FILE)
-					# 3.4.18 ERROR PERMISSION DENIED HANDLING
-					except PermissionError:
-						print("[!] File %s Permission Denied Error" % FILE.name[-64:])
-						continue
-					# 3.4.19 ERROR FILE NOT FOUND ERROR
-					except FileNotFoundError:
-						print("[!] File %s File Not Found Error" % FILE.name[-64:])
-						continue
-					# 3.4.20 CONVERT GIF
-					CONVERTION_RESULT = ConvertPhotoWithPillow(TEMP_FILE, OUTPUT_PATH)
-					# 3.4.21 CONVERTION RESULT SUCCESS
-					if CONVERTION_RESULT == 1:
-						# 3.4.22 REMOVE TEMP FILE
-						try:
-							os.remove(TEMP_FILE)
-						# 3.4.23 ERROR PERMISSION DENIED HANDLING
-						except PermissionError:
-							print("[!] File %s Permission Denied Error" % TEMP_FILE.name[-64:])
-							continue
-						# 3.4.24 ERROR FILE NOT FOUND HANDLING
-						except FileNotFoundError:
-							print("[!] File %s File Not Found Error" % TEMP_FILE.name[-64:])
-							continue
-						# 3.4.25 PRINT SUCCESS GIF FILE
-						print(" + [+] %s --- %s --- %s" % (FILE.name[-64:], TEMP_FILE.name[-64:], OUTPUT_PATH.name[-64:]))
-						# 3.4.26 ADD GIF COUNT
-						GIF_COUNT += 1
-					# 3.4.27 CONVERTION RESULT SKIP
-					elif CONVERTION_RESULT == 2:
-						# 3.4.28 RENAME TEMP FILE BACK
-						try:
-							os.rename(TEMP_FILE, OUTPUT_PATH)
-						# 3.4.29 ERROR PERMISSION DENIED HANDLING
-						except PermissionError:
-							print("[!] File %s Permission Denied Error" % TEMP_FILE.name[-64:])
-							continue
-						# 3.4.30 ERROR FILE NOT FOUND ERROR HANDLING
-						except FileNotFoundError:
-							print("[!] File %s File Not Found Error" % TEMP_FILE.name[-64:])
-							continue
-						# 3.4.31 PRINT SKIP GIF FILE
-						print(" + [+] %s >>> %s >>> %s" % (FILE.name[-64:], TEMP_FILE.name[-64:], OUTPUT_PATH.name[-64:]))
-						# 3.4.32 ADD GIF COUNT
-						GIF_COUNT += 1
-					# 3.4.33 CONVERTION RESULT ERROR
-					else:
-						# 3.4.34 RENAME TEMP FILE BACK
-						try:
-							os.rename(TEMP_FILE, FILE)
-						# 3.4.35 ERROR PERMISSION DENIED HANDLING
-						except PermissionError:
-							print("[!] File %s Permission Denied Error" % TEMP_FILE.name[-64:])
-							continue
-						# 3.4.36 ERROR FILE NOT FOUND ERROR HANDLING
-						except FileNotFoundError:
-							print("[!] File %s File Not Found Error" % TEMP_FILE.name[-64:])
-							continue
-				# 3.4.37 FILTER NON DIGIT NAME GIF FILE
+					with MeasureStage('probe'):
+						PROBE_INFO = ProbePhotoWithPillow(INPUT_PATH)
+			# 3.13.4 RETURN ERROR PROBE
+			if PROBE_INFO is None:
+				return 3, None, METRIC
+			# 3.13.5 CONVERT VIDEO FILE, SEGMENT AND REMUX INCLUDED IN ENCODE
+			if CATEGORY == 'video':
+				ENCODE_START      = time.perf_counter()
+				CONVERTION_RESULT = ConvertVideoWithFFMPEG(INPUT_PATH, OUTPUT_PATH, PROBE_INFO)
+				if CONVERTION_RESULT == 1:
+					RecordStageTime('encode', time.perf_counter() - ENCODE_START)
+				return CONVERTION_RESULT, PROBE_INFO, METRIC
+			# 3.13.6 CONVERT PHOTO AND GIF FILE
+			return ConvertPhotoWithPillow(INPUT_PATH, OUTPUT_PATH, PROBE_INFO, CATEGORY), PROBE_INFO, METRIC
+	# 3.13.7 DETACH COLLECTOR FROM REUSED WORKER THREAD
+	finally:
+		METRIC_LOCAL.metric = None
+# 3.14 OPEN PROBE CACHE WITH SQLITE
+def OpenProbeCache(CACHE_PATH):
+	# 3.14.1 CONNECT SQLITE DATABASE
+	try:
+		CONNECTION = sqlite3.connect(str(CACHE_PATH), timeout=DEFAULT_QUEUE_TIMEOUT)
+		# 3.14.2 DROP PROBE TABLE FROM OLDER CACHE VERSION
+		if CONNECTION.execute("PRAGMA user_version").fetchone()[0] != PROBE_CACHE_VERSION:
+			CONNECTION.execute("DROP TABLE IF EXISTS probe")
+			CONNECTION.execute("PRAGMA user_version = %d" % PROBE_CACHE_VERSION)
+		# 3.14.3 CREATE PROBE TABLE
+		CONNECTION.execute(
+			"CREATE TABLE IF NOT EXISTS probe ("
+			"path TEXT PRIMARY KEY, folder TEXT NOT NULL, size INTEGER NOT NULL, mtime INTEGER NOT NULL, inode INTEGER NOT NULL, "
+			"width INTEGER, height INTEGER, codec TEXT, frame_count INTEGER, duration REAL, audio_codec TEXT)"
+		)
+		CONNECTION.execute("CREATE INDEX IF NOT EXISTS probe_folder ON probe (folder)")
+		CONNECTION.commit()
+	# 3.14.4 ERROR CACHE DATABASE HANDLING
+	except sqlite3.Error:
+		print("[!] Probe Cache %s Error, Run Without Cache" % str(CACHE_PATH)[-64:])
+		return None
+	# 3.14.5 RETURN CACHE CONNECTION
+	return CONNECTION
+# 3.15 READ PROBE CACHE
+def ReadProbeCache(CONNECTION, FILE, FILE_STAT):
+	# 3.15.1 FILTER NO CACHE
+	if CONNECTION is None:
+		return None
+	# 3.15.2 SELECT ENTRY WITH SAME STAT IDENTITY
+	ROW = CONNECTION.execute(
+		"SELECT width, height, codec, frame_count, duration, audio_codec FROM probe WHERE path = ? AND size = ? AND mtime = ? AND inode = ?",
+		(os.path.abspath(FILE), FILE_STAT.st_size, FILE_STAT.st_mtime_ns, FILE_STAT.st_ino)
+	).fetchone()
+	# 3.15.3 RETURN CACHE MISS
+	if ROW is None:
+		return None
+	# 3.15.4 RETURN CACHE HIT
+	return {'width': ROW[0], 'height': ROW[1], 'codec': ROW[2], 'frame_count': ROW[3], 'duration': ROW[4], 'audio_codec': ROW[5]}
+# 3.16 WRITE PROBE CACHE
+def WriteProbeCache(CONNECTION, FILE, FILE_STAT, PROBE_INFO):
+	# 3.16.1 FILTER NO CACHE OR NO PROBE INFORMATION
+	if CONNECTION is None or PROBE_INFO is None:
+		return
+	# 3.16.2 INSERT OR REPLACE ENTRY
+	CONNECTION.execute(
+		"INSERT OR REPLACE INTO probe VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+		(
+			os.path.abspath(FILE), os.path.abspath(FILE.parent), FILE_STAT.st_size, FILE_STAT.st_mtime_ns, FILE_STAT.st_ino,
+			PROBE_INFO['width'], PROBE_INFO['height'], PROBE_INFO['codec'], PROBE_INFO['frame_count'], PROBE_INFO['duration'], PROBE_INFO['audio_codec']
+		)
+	)
+# 3.17 EVICT STALE PROBE CACHE IN FOLDER
+def EvictProbeCache(CONNECTION, FOLDER_NAME, KEEP_PATH_SET):
+	# 3.17.1 FILTER NO CACHE
+	if CONNECTION is None:
+		return
+	# 3.17.2 LOOPING CACHE ENTRY IN FOLDER
+	KEEP_PATH_SET = {os.path.abspath(PATH) for PATH in KEEP_PATH_SET}
+	for (PATH,) in CONNECTION.execute("SELECT path FROM probe WHERE folder = ?", (os.path.abspath(FOLDER_NAME),)).fetchall():
+		# 3.17.3 DELETE ENTRY OF DISAPPEARED FILE
+		if PATH not in KEEP_PATH_SET:
+			CONNECTION.execute("DELETE FROM probe WHERE path = ?", (PATH,))
+	# 3.17.4 COMMIT CACHE CHANGE PER FOLDER
+	CONNECTION.commit()
+# 3.18 EVICT PROBE CACHE OF DISAPPEARED FOLDER
+def EvictProbeCacheFolder(CONNECTION, FOLDER_SET):
+	# 3.18.1 FILTER NO CACHE
+	if CONNECTION is None:
+		return
+	# 3.18.2 LOOPING CACHED FOLDER
+	FOLDER_SET = {os.path.abspath(FOLDER_NAME) for FOLDER_NAME in FOLDER_SET}
+	for (FOLDER_NAME,) in CONNECTION.execute("SELECT DISTINCT folder FROM probe").fetchall():
+		# 3.18.3 DELETE ENTRY OF FOLDER NOT FOUND IN SCAN
+		if FOLDER_NAME not in FOLDER_SET:
+			CONNECTION.execute("DELETE FROM probe WHERE folder = ?", (FOLDER_NAME,))
+	# 3.18.4 COMMIT CACHE CHANGE
+	CONNECTION.commit()
+# 3.19 LOAD INCREMENTAL STATE FILE
+def LoadIncrementalState(STATE_PATH):
+	# 3.19.1 READ STATE FILE WITH JSON
+	try:
+		with open(STATE_PATH, 'r', encoding='utf-8') as STATE_FILE:
+			STATE = json.load(STATE_FILE)
+	# 3.19.2 NO STATE FILE ON FIRST RUN
+	except FileNotFoundError:
+		return {'version': 1, 'photo_format': GetOutputFormat('photo'), 'folder': {}}
+	# 3.19.3 ERROR BROKEN STATE FILE HANDLING
+	except (OSError, ValueError):
+		print("[!] State File %s Unreadable, Full Scan" % str(STATE_PATH)[-64:])
+		return {'version': 1, 'photo_format': GetOutputFormat('photo'), 'folder': {}}
+	# 3.19.4 FILTER UNKNOWN STATE VERSION
+	if not isinstance(STATE, dict) or STATE.get('version') != 1:
+		return {'version': 1, 'photo_format': GetOutputFormat('photo'), 'folder': {}}
+	# 3.19.5 FOLDER NORMALIZED TO OTHER PHOTO EXTENSION NEED FULL SCAN, STATE BEFORE PHOTO OUTPUT OPTION IS PNG
+	if STATE.get('photo_format', '.png') != GetOutputFormat('photo'):
+		print("[*] Photo Output Changed To %s, Full Scan" % GetOutputFormat('photo'))
+		return {'version': 1, 'photo_format': GetOutputFormat('photo'), 'folder': {}}
+	# 3.19.6 RETURN STATE
+	return STATE
+# 3.20 SAVE INCREMENTAL STATE FILE
+def SaveIncrementalState(STATE_PATH, STATE):
+	TEMP_STATE_PATH = '%s.tmp' % STATE_PATH
+	# 3.20.1 WRITE TEMPORARY STATE FILE AND REPLACE ATOMICALLY
+	try:
+		with open(TEMP_STATE_PATH, 'w', encoding='utf-8') as STATE_FILE:
+			json.dump(STATE, STATE_FILE, separators=(',', ':'))
+		os.replace(TEMP_STATE_PATH, STATE_PATH)
+	# 3.20.2 ERROR WRITE STATE FILE HANDLING
+	except OSError:
+		print("[!] State File %s Write Error" % str(STATE_PATH)[-64:])
+# 3.21 HASH FOLDER CHILD LISTING
+def HashFolderListing(NAME_LIST):
+	# 3.21.1 IGNORE PROGRAM STATE AND CACHE FILE
+	NAME_LIST = [NAME for NAME in NAME_LIST if not NAME.startswith('.usvpfp-')]
+	# 3.21.2 HASH SORTED CHILD NAME
+	return hashlib.sha1('\0'.join(sorted(NAME_LIST)).encode('utf-8', 'surrogateescape')).hexdigest()
+# 3.22 CHECK FOLDER ONLY HAVE NORMALIZED NAME
+def IsFolderNormalized(FILE_LIST):
+	NUMBER_DICT = {}
+	# 3.22.1 LOOPING PER MEDIA FILE
+	for FILE in FILE_LIST:
+		CATEGORY = GetFileCategory(FILE)
+		# 3.22.2 FILTER NON NORMALIZED NAME
+		if FILE.suffix != GetOutputFormat(CATEGORY) or not FILE.stem.isdigit() or str(int(FILE.stem)) != FILE.stem:
+			return False
+		NUMBER_DICT.setdefault(CATEGORY, set()).add(int(FILE.stem))
+	# 3.22.3 CHECK NUMBER START FROM ZERO WITHOUT GAP
+	for NUMBER_SET in NUMBER_DICT.values():
+		if NUMBER_SET != set(range(len(NUMBER_SET))):
+			return False
+	# 3.22.4 RETURN NORMALIZED FOLDER
+	return True
+# 3.23 RECORD FOLDER STATE AFTER COMMIT
+def RecordFolderState(STATE, FOLDER_NAME, COMMIT_SUCCESS):
+	NAME_LIST, SUBFOLDER_LIST, FILE_LIST = [], [], []
+	# 3.23.1 LIST FOLDER AFTER COMMIT
+	try:
+		FOLDER_MTIME = os.stat(FOLDER_NAME).st_mtime_ns
+		with os.scandir(FOLDER_NAME) as ENTRY_LIST:
+			for ENTRY in ENTRY_LIST:
+				NAME_LIST.append(ENTRY.name)
+				if ENTRY.is_dir(follow_symlinks=False):
+					if not ENTRY.name.startswith('TEMP_SEGMENT_'):
+						SUBFOLDER_LIST.append(ENTRY.name)
+				elif ENTRY.is_file() and os.path.splitext(ENTRY.name)[1].lower() in SCAN_ALL_FORMAT:
+					FILE_LIST.append(FOLDER_NAME / ENTRY.name)
+	# 3.23.2 ERROR FOLDER HANDLING, FORGET FOLDER STATE
+	except OSError:
+		STATE['folder'].pop(os.path.abspath(FOLDER_NAME), None)
+		return
+	# 3.23.3 UPDATE FOLDER STATE
+	STATE['folder'][os.path.abspath(FOLDER_NAME)] = {
+		'mtime'     : FOLDER_MTIME,
+		'listing'   : HashFolderListing(NAME_LIST),
+		'subfolder' : SUBFOLDER_LIST,
+		'normalized': COMMIT_SUCCESS and IsFolderNormalized(FILE_LIST),
+	}
+# 3.24 CHECK ALL JOB IN FOLDER DONE
+def IsFolderJobDone(JOB_LIST):
+	# 3.24.1 LOOPING PER JOB FUTURE
+	for JOB in JOB_LIST:
+		if not JOB[-1].done():
+			return False
+	# 3.24.2 RETURN ALL JOB DONE
+	return True
+# 3.25 COUNT PENDING JOB IN FOLDER QUEUE
+def CountPendingJob(FOLDER_QUEUE):
+	# 3.25.1 SUM JOB OF ALL QUEUED FOLDER
+	return sum(len(JOB_LIST) for FOLDER_NAME, JOB_LIST in FOLDER_QUEUE)
+# 3.26 COMMIT OLDEST QUEUED FOLDER
+def CommitQueuedFolder(FOLDER_QUEUE, PROBE_CACHE, INCREMENTAL_STATE, JOURNAL=None, LEASE_QUEUE=None):
+	FOLDER_NAME, JOB_LIST = FOLDER_QUEUE.popleft()
+	# 3.26.1 SKIP FOLDER WHOSE LEASE WAS RECLAIMED BY OTHER WORKER
+	if LEASE_QUEUE is not None and not IsLeaseHeld(LEASE_QUEUE, FOLDER_NAME):
+		print("[!] Folder %s Lease Lost, Skip Commit" % str(FOLDER_NAME)[-64:])
+		return
+	# 3.26.2 COMMIT FOLDER RESULT
+	COMMIT_SUCCESS = CommitFolderConvertion(FOLDER_NAME, JOB_LIST, PROBE_CACHE, JOURNAL)
+	# 3.26.3 RECORD FOLDER STATE FOR NEXT INCREMENTAL RUN
+	if INCREMENTAL_STATE is not None:
+		RecordFolderState(INCREMENTAL_STATE, FOLDER_NAME, COMMIT_SUCCESS)
+	# 3.26.4 FINISH LEASE SO COORDINATOR SEE FOLDER DONE
+	if LEASE_QUEUE is not None:
+		FinishFolderLease(LEASE_QUEUE, FOLDER_NAME, COMMIT_SUCCESS)
+# 3.27 GET PROGRAM SETTING
+def GetProgramSetting():
+	# 3.27.1 COLLECT ALL DEFAULT VARIABLE
+	return {NAME: VALUE for NAME, VALUE in globals().items() if NAME.startswith('DEFAULT_')}
+# 3.28 APPLY PROGRAM SETTING
+def ApplyProgramSetting(SETTING):
+	# 3.28.1 UPDATE DEFAULT VARIABLE, ALSO USED AS WORKER PROCESS INITIALIZER
+	globals().update(SETTING)
+# 3.29 PROBE IMAGE RESOLUTION FROM FILE HEADER
+def ProbeImageHeader(INPUT_PATH):
+	# 3.29.1 READ FIRST BYTE OF FILE
+	try:
+		with open(INPUT_PATH, 'rb') as INPUT_FILE:
+			HEAD = INPUT_FILE.read(32)
+			# 3.29.2 PNG IHDR CHUNK
+			if HEAD[:8] == b'\x89PNG\r\n\x1a\n' and HEAD[12:16] == b'IHDR':
+				WIDTH, HEIGHT = struct.unpack('>II', HEAD[16:24])
+				CODEC = 'PNG'
+			# 3.29.3 GIF LOGICAL SCREEN DESCRIPTOR
+			elif HEAD[:6] in (b'GIF87a', b'GIF89a'):
+				WIDTH, HEIGHT = struct.unpack('<HH', HEAD[6:10])
+				CODEC = 'GIF'
+			# 3.29.4 BMP INFO HEADER
+			elif HEAD[:2] == b'BM' and len(HEAD) >= 26:
+				if struct.unpack('<I', HEAD[14:18])[0] == 12:
+					WIDTH, HEIGHT = struct.unpack('<HH', HEAD[18:22])
 				else:
-					# 3.4.38 CONVERT GIF FILE
-					CONVERTION_RESULT = ConvertPhotoWithPillow(FILE, OUTPUT_PATH)
-					# 3.4.39 CONVERTION RESULT SUCCESS
-					if CONVERTION_RESULT == 1:
-						# 3.4.40 REMOVE ORIGINAL FILE
-						try:
-							os.remove(FILE)
-						# 3.4.41 ERROR PERMISSION DENIED HANDLING
-						except PermissionError:
-							print("[!] File %s Permission Denied Error" % FILE.name[-64:])
-							continue
-						# 3.4.42 ERROR FILE NOT FOUND HANDLING
-						except FileNotFoundError:
-							print("[!] File %s File Not Found Error" % FILE.name[-64:])
-							continue
-						# 3.4.43 PRINT SUCCESS GIF FILE
-						print(" + [+] %s --- %s" % (FILE.name[-64:], OUTPUT_PATH.name[-64:]))
-						# 3.4.44 ADD GIF COUNT	
-						GIF_COUNT += 1
-					# 3.4.45 CONVERTION RESULT SKIP
-					elif CONVERTION_RESULT == 2:
-						# 3.4.46 RENAME FILE SKIP
-						try:
-							os.rename(FILE, OUTPUT_PATH)
-						# 3.4.47 ERROR PERMISSION DENIED HANDLING
-						except PermissionError:
-							print("[!] File %s Permission Denied Error" % FILE.name[-64:])
-							continue
-						# 3.4.48 ERROR FILE NOT FOUND HANDLING
-						except FileNotFoundError:
-							print("[!] File %s File Not Found Error" % FILE.name[-64:])
-							continue
-						# 3.4.49 PRINT SKIP GIF FILE
-						print(" + [+] %s >>> %s" % (FILE.name[-64:], OUTPUT_PATH.name[-64:]))
-						# 3.4.50 ADD GIF COUNT
-						GIF_COUNT += 1
-					# 3.4.51 CONVERTION RESULT ERROR
-					else:
-						# 3.4.52 PRINT ERROR GIF FILE
-						print(" + [+] %s XXX %s" % (FILE.name[-64:], FILE.name[-64:]))
-			# 3.4.53 FILETER PHOTO FILE
-			elif FILE.suffix.lower() in SCAN_PHOTO_FORMAT:
-				# 3.4.54 PHOTO FILE OUTPUT NAME
-				OUTPUT_PATH = FILE.parent / ('%s.png' % PHOTO_COUNT)
-				# 3.4.55 FILTER DIGIT NAME PHOTO FILE
-				if FILE.stem.isdigit():
-					# 3.4.56 TEMPORARY PHOTO FILE NAME
-					TEMP_FILE = FILE.parent / ('TEMP_%s' % FILE.name)
-					# 3.4.57 RENAME DIGIT FILE TO TEMPORARY FILE
-					try:
-						os.rename(FILE, TEMP_FILE)
-					# 3.4.58 ERROR PERMISSION DENIED HANDLING
-					except PermissionError:
-						print("[!] File %s Permission Denied Error" % FILE.name[-64:])
-						continue
-					# 3.4.59 ERROR FILE NOT FOUND ERROR
-					except FileNotFoundError:
-						print("[!] File %s File Not Found Error" % FILE.name[-64:])
-						continue
-					# 3.4.60 CONVERT PHOTO
-					CONVERTION_RESULT = ConvertPhotoWithPillow(TEMP_FILE, OUTPUT_PATH)
-					# 3.4.61 CONVERTION RESULT SUCCESS
-					if CONVERTION_RESULT == 1:
-						# 3.4.62 REMOVE TEMP FILE
-						try:
-							os.remove(TEMP_FILE)
-						# 3.4.63 ERROR PERMISSION DENIED HANDLING
-						except PermissionError:
-							print("[!] File %s Permission Denied Error" % TEMP_FILE.name[-64:])
-							continue
-						# 3.4.64 ERROR FILE NOT FOUND HANDLING
-						except FileNotFoundError:
-							print("[!] File %s File Not Found Error" % TEMP_FILE.name[-64:])
-							continue
-						# 3.4.65 PRINT SUCCESS PHOTO FILE
-						print(" + [+] %s --- %s --- %s" % (FILE.name[-64:], TEMP_FILE.name[-64:], OUTPUT_PATH.name[-64:]))
-						# 3.4.66 ADD PHOTO COUNT
-						PHOTO_COUNT += 1
-					# 3.4.67 CONVERTION RESULT SKIP
-					elif CONVERTION_RESULT == 2:
-						# 3.4.68 RENAME TEMP FILE BACK
-						try:
-							os.rename(TEMP_FILE, OUTPUT_PATH)
-						# 3.4.69 ERROR PERMISSION DENIED HANDLING
-						except PermissionError:
-							print("[!] File %s Permission Denied Error" % TEMP_FILE.name[-64:])
-							continue
-						# 3.4.70 ERROR FILE NOT FOUND ERROR HANDLING
-						except FileNotFoundError:
-							print("[!] File %s File Not Found Error" % TEMP_FILE.name[-64:])
-							continue
-						# 3.4.71 PRINT SKIP PHOTO FILE
-						print(" + [+] %s >>> %s >>> %s" % (FILE.name[-64:], TEMP_FILE.name[-64:], OUTPUT_PATH.name[-64:]))
-						# 3.4.72 ADD GIF COUNT
-						PHOTO_COUNT += 1
-					# 3.4.73 CONVERTION RESULT ERROR
-					else:
-						# 3.4.74 RENAME TEMP FILE BACK
-						try:
-							os.rename(TEMP_FILE, FILE)
-						# 3.4.75 ERROR PERMISSION DENIED HANDLING
-						except PermissionError:
-							print("[!] File %s Permission Denied Error" % TEMP_FILE.name[-64:])
-							continue
-						# 3.4.76 ERROR FILE NOT FOUND ERROR HANDLING
-						except FileNotFoundError:
-							print("[!] File %s File Not Found Error" % TEMP_FILE.name[-64:])
-							continue
-				# 3.4.77 FILTER NON DIGIT NAME PHOTO FILE
+					WIDTH, HEIGHT = struct.unpack('<ii', HEAD[18:26])
+				WIDTH, HEIGHT = abs(WIDTH), abs(HEIGHT)
+				CODEC = 'BMP'
+			# 3.29.5 WEBP LOSSY, LOSSLESS, AND EXTENDED CHUNK
+			elif HEAD[:4] == b'RIFF' and HEAD[8:12] == b'WEBP':
+				if HEAD[12:16] == b'VP8 ' and HEAD[23:26] == b'\x9d\x01\x2a':
+					WIDTH, HEIGHT = struct.unpack('<HH', HEAD[26:30])
+					WIDTH, HEIGHT = WIDTH & 0x3fff, HEIGHT & 0x3fff
+				elif HEAD[12:16] == b'VP8L' and HEAD[20:21] == b'\x2f':
+					BIT = struct.unpack('<I', HEAD[21:25])[0]
+					WIDTH, HEIGHT = (BIT & 0x3fff) + 1, ((BIT >> 14) & 0x3fff) + 1
+				elif HEAD[12:16] == b'VP8X':
+					WIDTH  = int.from_bytes(HEAD[24:27], 'little') + 1
+					HEIGHT = int.from_bytes(HEAD[27:30], 'little') + 1
 				else:
-					# 3.4.78 CONVERT PHOTO FILE
-					CONVERTION_RESULT = ConvertPhotoWithPillow(FILE, OUTPUT_PATH)
-					# 3.4.79 CONVERTION RESULT SUCCESS
-					if CONVERTION_RESULT == 1:
-						# 3.4.80 REMOVE ORIGINAL FILE
-						try:
-							os.remove(FILE)
-						# 3.4.81 ERROR PERMISSION DENIED HANDLING
-						except PermissionError:
-							print("[!] File %s Permission Denied Error" % FILE.name[-64:])
-							continue
-						# 3.4.82 ERROR FILE NOT FOUND HANDLING
-						except FileNotFoundError:
-							print("[!] File %s File Not Found Error" % FILE.name[-64:])
-							continue
-						# 3.4.83 PRINT SUCCESS PHOTO FILE
-						print(" + [+] %s --- %s" % (FILE.name[-64:], OUTPUT_PATH.name[-64:]))
-						# 3.4.84 ADD PHOTO COUNT	
-						PHOTO_COUNT += 1
-					# 3.4.85 CONVERTION RESULT SKIP
-					elif CONVERTION_RESULT == 2:
-						# 3.4.86 RENAME FILE SKIP
-						try:
-							os.rename(FILE, OUTPUT_PATH)
-						# 3.4.87 ERROR PERMISSION DENIED ERROR
-						except PermissionError:
-							print("[!] File %s Permission Denied Error" % FILE.name[-64:])
-							continue
-						# 3.4.88 ERROR FILE NOT FOUND HANDLING
-						except FileNotFoundError:
-							print("[!] File %s File Not Found Error" % FILE.name[-64:])
-							continue
-						# 3.4.89 PRINT SKIP PHOTO FILE
-						print(" + [+] %s >>> %s" % (FILE.name[-64:], OUTPUT_PATH.name[-64:]))
-						# 3.4.90 ADD PHOTO COUNT
-						PHOTO_COUNT += 1
-					# 3.4.91 CONVERTION RESULT ERROR
-					else:
-						# 3.4.92 PRINT ERROR GIF FILE
-						print(" + [+] %s XXX %s" % (FILE.name[-64:], FILE.name[-64:]))
-			# 3.4.93 FILETER VIDEO FILE
-			elif FILE.suffix.lower() in SCAN_VIDEO_FORMAT:
-				# 3.4.94 VIDEO FILE OUTPUT NAME
-				OUTPUT_PATH = FILE.parent / ('%s.mp4' % VIDEO_COUNT)
-				# 3.4.95 FILTER DIGIT NAME VIDEO FILE
-				if FILE.stem.isdigit():
-					# 3.4.96 TEMPORARY VIDEO FILE NAME
-					TEMP_FILE = FILE.parent / ('TEMP_%s' % FILE.name)
-					# 3.4.97 RENAME DIGIT FILE TO TEMPORARY FILE
-					try:
-						os.rename(FILE, TEMP_FILE)
-					# 3.4.98 ERROR PERMISSION DENIED HANDLING
-					except PermissionError:
-						print("[!] File %s Permission Denied Error" % FILE.name[-64:])
-						continue
-					# 3.4.99 ERROR FILE NOT FOUND ERROR
-					except FileNotFoundError:
-						print("[!] File %s File Not Found Error" % FILE.name[-64:])
-						continue
-					# 3.4.100 CONVERT VIDEO
-					CONVERTION_RESULT = ConvertVideoWithFFMPEG(TEMP_FILE, OUTPUT_PATH)
-					# 3.4.101 CONVERTION RESULT SUCCESS
-					if CONVERTION_RESULT == 1:
-						# 3.4.102 REMOVE TEMP FILE
-						try:
-							os.remove(TEMP_FILE)
-						# 3.4.103 ERROR PERMISSION DENIED HANDLING
-						except PermissionError:
-							print("[!] File %s Permission Denied Error" % TEMP_FILE.name[-64:])
-							continue
-						# 3.4.104 ERROR FILE NOT FOUND HANDLING
-						except FileNotFoundError:
-							print("[!] File %s File Not Found Error" % TEMP_FILE.name[-64:])
-							continue
-						# 3.4.105 PRINT SUCCESS VIDEO FILE
-						print(" + [+] %s --- %s --- %s" % (FILE.name[-64:], TEMP_FILE.name[-64:], OUTPUT_PATH.name[-64:]))
-						# 3.4.106 ADD VIDEO COUNT
-						VIDEO_COUNT += 1
-					# 3.4.107 CONVERTION RESULT SKIP
-					elif CONVERTION_RESULT == 2:
-						# 3.4.108 RENAME TEMP FILE BACK
-						try:
-							os.rename(TEMP_FILE, OUTPUT_PATH)
-						# 3.4.109 ERROR PERMISSION DENIED HANDLING
-						except PermissionError:
-							print("[!] File %s Permission Denied Error" % TEMP_FILE.name[-64:])
-							continue
-						# 3.4.110 ERROR FILE NOT FOUND ERROR HANDLING
-						except FileNotFoundError:
-							print("[!] File %s File Not Found Error" % TEMP_FILE.name[-64:])
-							continue
-						# 3.4.111 PRINT SKIP VIDEO FILE
-						print(" + [+] %s >>> %s >>> %s" % (FILE.name[-64:], TEMP_FILE.name[-64:], OUTPUT_PATH.name[-64:]))
-						# 3.4.112 ADD GIF COUNT
-						VIDEO_COUNT += 1
-					# 3.4.113 CONVERTION RESULT ERROR
-					else:
-						# 3.4.114 RENAME TEMP FILE BACK
-						try:
-							os.rename(TEMP_FILE, FILE)
-						# 3.4.115 ERROR PERMISSION DENIED HANDLING
-						except PermissionError:
-							print("[!] File %s Permission Denied Error" % TEMP_FILE.name[-64:])
-							continue
-						# 3.4.116 ERROR FILE NOT FOUND ERROR HANDLING
-						except FileNotFoundError:
-							print("[!] File %s File Not Found Error" % TEMP_FILE.name[-64:])
-							continue
-				# 3.4.117 FILTER NON DIGIT NAME VIDEO FILE
+					return None
+				CODEC = 'WEBP'
+			# 3.29.6 JPEG START OF FRAME SEGMENT
+			elif HEAD[:2] == b'\xff\xd8':
+				INPUT_FILE.seek(2)
+				RESOLUTION = ReadJpegHeader(INPUT_FILE)
+				if RESOLUTION is None:
+					return None
+				WIDTH, HEIGHT = RESOLUTION
+				CODEC = 'JPEG'
+			# 3.29.7 TIFF FIRST IMAGE FILE DIRECTORY
+			elif HEAD[:4] in (b'II*\x00', b'MM\x00*'):
+				RESOLUTION = ReadTiffHeader(INPUT_FILE, '<' if HEAD[:2] == b'II' else '>', HEAD)
+				if RESOLUTION is None:
+					return None
+				WIDTH, HEIGHT = RESOLUTION
+				CODEC = 'TIFF'
+			# 3.29.8 UNKNOWN HEADER, FALLBACK TO PILLOW
+			else:
+				return None
+	# 3.29.9 ERROR READ FILE OR BROKEN HEADER HANDLING, FALLBACK TO PILLOW
+	except (OSError, struct.error):
+		return None
+	# 3.29.10 FILTER EMPTY RESOLUTION
+	if WIDTH <= 0 or HEIGHT <= 0:
+		return None
+	# 3.29.11 RETURN PROBE INFORMATION WITHOUT DECODE
+	return {'width': WIDTH, 'height': HEIGHT, 'codec': CODEC, 'frame_count': None, 'duration': None, 'audio_codec': None}
+# 3.30 READ JPEG RESOLUTION FROM SEGMENT HEADER
+def ReadJpegHeader(INPUT_FILE):
+	# 3.30.1 LOOPING PER MARKER SEGMENT
+	while True:
+		MARKER = INPUT_FILE.read(1)
+		# 3.30.2 FILTER BROKEN MARKER
+		if MARKER != b'\xff':
+			return None
+		# 3.30.3 SKIP FILL BYTE
+		while MARKER == b'\xff':
+			MARKER = INPUT_FILE.read(1)
+		if not MARKER:
+			return None
+		MARKER = MARKER[0]
+		# 3.30.4 SKIP STANDALONE MARKER
+		if MARKER == 0x01 or 0xd0 <= MARKER <= 0xd7:
+			continue
+		# 3.30.5 STOP AT START OF SCAN
+		if MARKER in (0xd9, 0xda):
+			return None
+		LENGTH = struct.unpack('>H', INPUT_FILE.read(2))[0]
+		# 3.30.6 START OF FRAME, EXCEPT HUFFMAN, JPG, AND ARITHMETIC TABLE
+		if 0xc0 <= MARKER <= 0xcf and MARKER not in (0xc4, 0xc8, 0xcc):
+			HEIGHT, WIDTH = struct.unpack('>xHH', INPUT_FILE.read(5))
+			return WIDTH, HEIGHT
+		# 3.30.7 SKIP OTHER SEGMENT LIKE EXIF WITHOUT READING
+		INPUT_FILE.seek(LENGTH - 2, os.SEEK_CUR)
+# 3.31 READ TIFF RESOLUTION FROM FIRST IMAGE FILE DIRECTORY
+def ReadTiffHeader(INPUT_FILE, BYTE_ORDER, HEAD):
+	WIDTH = HEIGHT = None
+	# 3.31.1 SEEK FIRST IMAGE FILE DIRECTORY
+	INPUT_FILE.seek(struct.unpack(BYTE_ORDER + 'I', HEAD[4:8])[0])
+	ENTRY_COUNT = struct.unpack(BYTE_ORDER + 'H', INPUT_FILE.read(2))[0]
+	ENTRY_DATA  = INPUT_FILE.read(ENTRY_COUNT * 12)
+	# 3.31.2 LOOPING PER DIRECTORY ENTRY
+	for INDEX in range(0, len(ENTRY_DATA) - 11, 12):
+		TAG, TYPE = struct.unpack(BYTE_ORDER + 'HH', ENTRY_DATA[INDEX:INDEX + 4])
+		# 3.31.3 SHORT OR LONG VALUE
+		if TYPE == 3:
+			VALUE = struct.unpack(BYTE_ORDER + 'H', ENTRY_DATA[INDEX + 8:INDEX + 10])[0]
+		elif TYPE == 4:
+			VALUE = struct.unpack(BYTE_ORDER + 'I', ENTRY_DATA[INDEX + 8:INDEX + 12])[0]
+		else:
+			continue
+		# 3.31.4 IMAGE WIDTH AND IMAGE LENGTH TAG
+		if TAG == 256:
+			WIDTH = VALUE
+		elif TAG == 257:
+			HEIGHT = VALUE
+	# 3.31.5 RETURN RESOLUTION IF BOTH TAG FOUND
+	if WIDTH is None or HEIGHT is None:
+		return None
+	return WIDTH, HEIGHT
+# 3.32 RESIZE ANIMATED IMAGE WITH ALL FRAME IN MEMORY
+def ResizeAnimatedImageInMemory(INPUT_IMAGE_FILE, OUTPUT_PATH, NEW_WIDTH, NEW_HEIGHT):
+	FRAME_LIST    = []
+	DURATION_LIST = []
+	# 3.32.1 FRAME LOOPING
+	for FRAME_INDEX in range(INPUT_IMAGE_FILE.n_frames):
+		INPUT_IMAGE_FILE.seek(FRAME_INDEX)
+		# 3.32.2 RESIZE FRAME
+		RESIZED_FRAME = INPUT_IMAGE_FILE.copy().resize((NEW_WIDTH, NEW_HEIGHT), Image.LANCZOS)
+		# 3.32.3 INSERT RESIZED FRAME TO FRAME LIST
+		FRAME_LIST.append(RESIZED_FRAME)
+		# 3.32.4 ADD FRAME DURATION TO DURATION LIST, WHOLE MILLISECOND FOR AVIF ENCODER
+		try:
+			DURATION_LIST.append(round(INPUT_IMAGE_FILE.info.get('duration', 100)))
+		# 3.32.5 ERROR NO HURATION HANDLING
+		except AttributeError:
+			DURATION_LIST.append(100)
+	# 3.32.6 GET GIF OPTION OR CHOSEN PHOTO OUTPUT FORMAT AND QUALITY FOR ANIMATED PNG AND WEBP
+	if pathlib.Path(OUTPUT_PATH).suffix.lower() == '.gif':
+		IMAGE_FORMAT, ENCODE_OPTION = 'GIF', {'optimize': False}
+	else:
+		IMAGE_FORMAT, ENCODE_OPTION = GetPhotoEncodeOption(OUTPUT_PATH)
+	# 3.32.7 SAVE ERSIZED GIF TO TOUPUT PATH
+	FRAME_LIST[0].save(OUTPUT_PATH, format=IMAGE_FORMAT, save_all=True, append_images=FRAME_LIST[1:], duration=DURATION_LIST, loop=INPUT_IMAGE_FILE.info.get('loop', 0), **ENCODE_OPTION)
+# 3.33 RESIZE ANIMATED GIF FRAME BY FRAME
+def ResizeAnimatedGifStreaming(INPUT_IMAGE_FILE, OUTPUT_PATH, NEW_WIDTH, NEW_HEIGHT):
+	FRAME_INDEX = 0
+	LOOP_COUNT  = INPUT_IMAGE_FILE.info.get('loop')
+	# 3.33.1 WRITE OUTPUT FILE, ONLY ONE DECODED AND ONE RESIZED FRAME ALIVE
+	with open(OUTPUT_PATH, 'wb') as OUTPUT_FILE:
+		while True:
+			# 3.33.2 SEEK NEXT FRAME UNTIL END OF FILE
+			try:
+				INPUT_IMAGE_FILE.seek(FRAME_INDEX)
+			except EOFError:
+				break
+			# 3.33.3 RESIZE COMPOSITED FRAME
+			RESIZED_FRAME = INPUT_IMAGE_FILE.convert('RGBA').resize((NEW_WIDTH, NEW_HEIGHT), Image.LANCZOS)
+			# 3.33.4 WRITE GIF HEADER WITH FIRST FRAME
+			if FRAME_INDEX == 0:
+				WriteGifHeader(OUTPUT_FILE, RESIZED_FRAME, LOOP_COUNT)
+			# 3.33.5 WRITE FRAME WITH SOURCE DURATION AND DISPOSAL
+			WriteGifFrame(OUTPUT_FILE, RESIZED_FRAME, INPUT_IMAGE_FILE.info.get('duration', 100), getattr(INPUT_IMAGE_FILE, 'disposal_method', 0))
+			FRAME_INDEX += 1
+		# 3.33.6 WRITE GIF TRAILER
+		OUTPUT_FILE.write(b';')
+# 3.34 QUANTIZE RGBA FRAME TO GIF PALETTE FRAME
+def QuantizeGifFrame(FRAME):
+	# 3.34.1 ADAPTIVE PALETTE PER FRAME
+	PALETTE_FRAME = FRAME.convert('RGB').convert('P', palette=Image.Palette.ADAPTIVE, colors=255)
+	ALPHA_MASK    = FRAME.getchannel('A').point([255] * 128 + [0] * 128)
+	# 3.34.2 FILTER OPAQUE FRAME
+	if not ALPHA_MASK.getbbox():
+		return PALETTE_FRAME, None
+	# 3.34.3 RESERVE FIRST UNUSED PALETTE INDEX FOR TRANSPARENCY
+	PALETTE           = PALETTE_FRAME.getpalette()
+	TRANSPARENT_INDEX = min(len(PALETTE) // 3, 255)
+	PALETTE_FRAME.putpalette(PALETTE[:TRANSPARENT_INDEX * 3] + [0, 0, 0])
+	PALETTE_FRAME.paste(TRANSPARENT_INDEX, mask=ALPHA_MASK)
+	# 3.34.4 RETURN PALETTE FRAME AND TRANSPARENT INDEX
+	return PALETTE_FRAME, TRANSPARENT_INDEX
+# 3.35 WRITE GIF HEADER
+def WriteGifHeader(OUTPUT_FILE, FIRST_FRAME, LOOP_COUNT=None):
+	# 3.35.1 GLOBAL PALETTE AND LOGICAL SCREEN FROM FIRST FRAME
+	PALETTE_FRAME, TRANSPARENT_INDEX = QuantizeGifFrame(FIRST_FRAME)
+	HEADER_INFO = {'optimize': False, 'duration': 1}
+	# 3.35.2 NETSCAPE LOOP EXTENSION ONLY IF SOURCE HAVE LOOP
+	if LOOP_COUNT is not None:
+		HEADER_INFO['loop'] = LOOP_COUNT
+	HEADER, USED_PALETTE = GifImagePlugin.getheader(PALETTE_FRAME, None, HEADER_INFO)
+	# 3.35.3 WRITE HEADER BLOCK
+	for HEADER_BLOCK in HEADER:
+		OUTPUT_FILE.write(HEADER_BLOCK)
+# 3.36 WRITE GIF FRAME WITH LOCAL PALETTE
+def WriteGifFrame(OUTPUT_FILE, FRAME, DURATION, DISPOSAL):
+	PALETTE_FRAME, TRANSPARENT_INDEX = QuantizeGifFrame(FRAME)
+	FRAME_INFO = {'duration': DURATION, 'include_color_table': True}
+	# 3.36.1 FRAME ARE FULL COMPOSITED CANVAS, TRANSPARENT FRAME MUST CLEAR PREVIOUS FRAME
+	if TRANSPARENT_INDEX is not None:
+		FRAME_INFO['transparency'] = TRANSPARENT_INDEX
+		FRAME_INFO['disposal']     = 2
+	elif DISPOSAL in (1, 2, 3):
+		FRAME_INFO['disposal']     = DISPOSAL
+	# 3.36.2 WRITE GRAPHIC CONTROL, IMAGE DESCRIPTOR, LOCAL PALETTE, AND LZW DATA
+	for FRAME_BLOCK in GifImagePlugin.getdata(PALETTE_FRAME, **FRAME_INFO):
+		OUTPUT_FILE.write(FRAME_BLOCK)
+# 3.37 RESIZE ANIMATED GIF WITH FFMPEG PALETTEGEN AND PALETTEUSE
+def ResizeAnimatedGifWithFFMPEG(INPUT_PATH, OUTPUT_PATH, NEW_WIDTH, NEW_HEIGHT, LOOP_COUNT=None):
+	# 3.37.1 SCALE THEN SPLIT FOR PALETTE GENERATION
+	SPLIT_STREAM = ffmpeg.input(str(INPUT_PATH)).filter("scale", NEW_WIDTH, NEW_HEIGHT, flags="lanczos").split()
+	# 3.37.2 NEW PALETTE PER FRAME LIKE LOCAL COLOR TABLE
+	PALETTE_STREAM = SPLIT_STREAM[1].filter("palettegen", stats_mode="single", reserve_transparent=1)
+	# 3.37.3 ONE THREAD UNLESS FIXED BY SETTING, PHOTO POOL ALREADY RUN ONE PROCESS PER CORE AND 0 MEAN EVERY CORE TO FFMPEG
+	THREAD_COUNT = DEFAULT_FFMPEG_THREAD_COUNT or 1
+	# 3.37.4 KEEP LAST FRAME DELAY, GIF MUXER OTHERWISE REPEAT DELAY OF FRAME BEFORE IT
+	FINAL_DELAY  = ReadGifLastDelay(INPUT_PATH)
+	MUXER_OPTION = {} if FINAL_DELAY is None else {'final_delay': FINAL_DELAY}
+	# 3.37.5 FFMPEG COMMAND, GIF MUXER LOOP -1 MEAN PLAY ONCE
+	(
+		ffmpeg
+		.filter([SPLIT_STREAM[0], PALETTE_STREAM], "paletteuse", new=1, dither="sierra2_4a")
+		.output(str(OUTPUT_PATH), loop=-1 if LOOP_COUNT is None else LOOP_COUNT, threads=THREAD_COUNT, **MUXER_OPTION)
+		.global_args('-filter_complex_threads', str(THREAD_COUNT))
+		.run(overwrite_output=True, quiet=True)
+	)
+# 3.38 SELECT ANIMATED GIF BACKEND
+def SelectGifBackend(FRAME_COUNT, WIDTH, HEIGHT):
+	# 3.38.1 FIXED BACKEND FROM SETTING
+	if DEFAULT_GIF_BACKEND != 'auto':
+		return DEFAULT_GIF_BACKEND
+	# 3.38.2 LARGE GIF TO FFMPEG IF FFMPEG INSTALLED
+	if FRAME_COUNT * WIDTH * HEIGHT >= DEFAULT_GIF_FFMPEG_THRESHOLD and shutil.which('ffmpeg'):
+		return 'ffmpeg'
+	# 3.38.3 SMALL GIF STAY IN PILLOW, NO PROCESS SPAWN COST
+	return 'stream'
+# 3.39 CHECK FILE ONLY NEED RENAME
+def IsRenameOnly(FILE, CATEGORY, PROBE_INFO):
+	# 3.39.1 FILTER FILE ABOVE STANDARD RESOLUTION
+	if min(PROBE_INFO['width'], PROBE_INFO['height']) > DEFAULT_SHORT_SIDE_RESOLUTION:
+		return False
+	# 3.39.2 FILTER VIDEO THAT NEED CONTAINER NORMALIZATION
+	if CATEGORY == 'video' and FILE.suffix.lower() != '.mp4' and PROBE_INFO['codec'] in REMUX_VIDEO_CODEC:
+		return False
+	# 3.39.3 FILTER PHOTO THAT NEED RE-ENCODE TO COMPACT OUTPUT FORMAT, PNG OUTPUT KEEP RENAME ONLY
+	if CATEGORY == 'photo' and DEFAULT_PHOTO_OUTPUT != 'png' and FILE.suffix.lower() != GetOutputFormat('photo'):
+		return False
+	# 3.39.4 RETURN RENAME ONLY
+	return True
+# 3.40 REMUX VIDEO TO MP4 WITHOUT VIDEO ENCODE
+def RemuxVideoWithFFMPEG(INPUT_PATH, OUTPUT_PATH, PROBE_INFO):
+	VIDEO_OPTION = {'vcodec': 'copy', 'movflags': '+faststart', 'threads': 1}
+	# 3.40.1 HEVC NEED HVC1 TAG FOR MP4 PLAYER
+	if PROBE_INFO['codec'] == 'hevc':
+		VIDEO_OPTION['tag:v'] = 'hvc1'
+	# 3.40.2 COPY MP4 COMPATIBLE AUDIO FIRST, TRANSCODE AUDIO TO AAC AS FALLBACK
+	AUDIO_OPTION_LIST = [{'acodec': 'aac'}]
+	if PROBE_INFO.get('audio_codec') in REMUX_AUDIO_CODEC or PROBE_INFO.get('audio_codec') is None:
+		AUDIO_OPTION_LIST.insert(0, {'acodec': 'copy'})
+	# 3.40.3 LOOPING PER AUDIO OPTION, MAP ONLY VIDEO AND AUDIO SO BITMAP SUBTITLE NOT BREAK MP4 MUX
+	INPUT_STREAM = ffmpeg.input(str(INPUT_PATH))
+	for AUDIO_OPTION in AUDIO_OPTION_LIST:
+		try:
+			RunFFMPEGCommand(
+				ffmpeg
+				.output(INPUT_STREAM['v:0'], INPUT_STREAM['a?'], str(OUTPUT_PATH), **VIDEO_OPTION, **AUDIO_OPTION),
+				PROBE_INFO['duration'], INPUT_PATH
+			)
+			# 3.40.4 RETURN REMUX SUCCESS
+			return True
+		# 3.40.5 ERROR FFMPEG HANDLING, TRY NEXT AUDIO OPTION
+		except ffmpeg.Error:
+			continue
+	# 3.40.6 REMOVE PARTIAL OUTPUT AND RETURN REMUX FAILED
+	RemoveFileSafely(pathlib.Path(OUTPUT_PATH), QUIET=True)
+	return False
+# 3.41 PARSE FFPROBE JSON TO PROBE INFORMATION
+def ParseVideoProbe(PROBE_VIDEO):
+	# 3.41.1 GET FIRST AUDIO CODEC
+	AUDIO_CODEC = None
+	for STREAM in PROBE_VIDEO.get('streams', []):
+		if STREAM.get('codec_type') == 'audio':
+			AUDIO_CODEC = STREAM.get('codec_name')
+			break
+	# 3.41.2 GET VIDEO STREAM INFORMATION
+	for STREAM in PROBE_VIDEO.get('streams', []):
+		if STREAM.get('codec_type') == 'video':
+			DURATION    = PROBE_VIDEO.get('format', {}).get('duration', STREAM.get('duration'))
+			FRAME_COUNT = STREAM.get('nb_frames')
+			# 3.41.3 RETURN PROBE INFORMATION
+			return {
+				'width'       : int(STREAM['width']),
+				'height'      : int(STREAM['height']),
+				'codec'       : STREAM.get('codec_name'),
+				'frame_count' : int(FRAME_COUNT) if FRAME_COUNT and FRAME_COUNT.isdigit() else None,
+				'duration'    : float(DURATION) if DURATION not in (None, 'N/A') else None,
+				'audio_codec' : AUDIO_CODEC,
+			}
+	# 3.41.4 RETURN NO VIDEO STREAM
+	return None
+# 3.42 SUBMIT ONE FILE CONVERTION TO WORKER POOL
+def SubmitFileConvertion(FILE, FILE_STAT, CATEGORY, TEMP_OUTPUT, PROBE_INFO, PHOTO_POOL, VIDEO_POOL, JOURNAL=None):
+	# 3.42.1 SEND VIDEO JOB TO VIDEO POOL
+	if CATEGORY == 'video':
+		FUTURE = VIDEO_POOL.submit(ProbeAndConvertFile, CATEGORY, FILE, TEMP_OUTPUT, PROBE_INFO)
+	# 3.42.2 SEND PHOTO AND GIF JOB TO PHOTO POOL
+	else:
+		FUTURE = PHOTO_POOL.submit(ProbeAndConvertFile, CATEGORY, FILE, TEMP_OUTPUT, PROBE_INFO)
+	# 3.42.3 JOURNAL ENCODE AS SOON AS WORKER FINISH
+	if JOURNAL is not None:
+		FUTURE.add_done_callback(lambda FUTURE: JournalEncodedFile(JOURNAL, FILE, FILE_STAT, TEMP_OUTPUT, FUTURE))
+	# 3.42.4 RETURN JOB
+	return (FILE, FILE_STAT, CATEGORY, TEMP_OUTPUT, FUTURE)
+# 3.43 PROBE VIDEO WITH PYAV WITHOUT SPAWN PROCESS
+def ProbeVideoWithPyAV(INPUT_PATH):
+	# 3.43.1 OPEN VIDEO CONTAINER
+	try:
+		with av.open(str(INPUT_PATH)) as CONTAINER:
+			AUDIO_STREAM_LIST = CONTAINER.streams.audio
+			VIDEO_STREAM_LIST = CONTAINER.streams.video
+			# 3.43.2 RETURN NO VIDEO STREAM
+			if not VIDEO_STREAM_LIST:
+				return None
+			STREAM = VIDEO_STREAM_LIST[0]
+			# 3.43.3 CONTAINER DURATION IN AV_TIME_BASE, STREAM DURATION AS FALLBACK
+			if CONTAINER.duration is not None:
+				DURATION = CONTAINER.duration / av.time_base
+			elif STREAM.duration is not None and STREAM.time_base is not None:
+				DURATION = float(STREAM.duration * STREAM.time_base)
+			else:
+				DURATION = None
+			# 3.43.4 RETURN PROBE INFORMATION
+			return {
+				'width'       : STREAM.codec_context.width,
+				'height'      : STREAM.codec_context.height,
+				'codec'       : STREAM.codec_context.name,
+				'frame_count' : STREAM.frames or None,
+				'duration'    : DURATION,
+				'audio_codec' : AUDIO_STREAM_LIST[0].codec_context.name if AUDIO_STREAM_LIST else None,
+			}
+	# 3.43.5 ERROR FILE NOT FOUND HANDLING
+	except FileNotFoundError:
+		print("[!] File %s Not Found Error" % str(INPUT_PATH)[-64:])
+		return None
+	# 3.43.6 ERROR PERMISSION DENIED HANDLING
+	except PermissionError:
+		print("[!] File %s Permission Denied Error" % str(INPUT_PATH)[-64:])
+		return None
+	# 3.43.7 ERROR LIBAV HANDLING
+	except (av.error.FFmpegError, ValueError):
+		print("[!] File %s FFMPEG Error" % str(INPUT_PATH)[-64:])
+		return None
+# 3.44 PROBE VIDEO WITH FFPROBE PROCESS
+def ProbeVideoWithFFProbe(INPUT_PATH):
+	# 3.44.1 OPEN VIDEO FILE WITH FFPROBE, ASK ONLY USED FIELDS
+	try:
+		PROBE_PROCESS = subprocess.run(
+			['ffprobe', '-v', 'error', '-show_entries', PROBE_VIDEO_ENTRIES, '-of', 'json', str(INPUT_PATH)],
+			stdout=subprocess.PIPE, stderr=subprocess.PIPE
+		)
+	# 3.44.2 ERROR FFPROBE NOT FOUND HANDLING
+	except FileNotFoundError:
+		print("[!] File %s Not Found Error" % str(INPUT_PATH)[-64:])
+		return None
+	# 3.44.3 ERROR PERMISSION DENIED HANDLING
+	except PermissionError:
+		print("[!] File %s Permission Denied Error" % str(INPUT_PATH)[-64:])
+		return None
+	# 3.44.4 ERROR FFPROBE HANDLING
+	if PROBE_PROCESS.returncode != 0:
+		print("[!] File %s FFMPEG Error" % str(INPUT_PATH)[-64:])
+		return None
+	# 3.44.5 PARSE PROBE JSON ONCE AND RETURN PROBE INFORMATION
+	return ParseVideoProbe(json.loads(PROBE_PROCESS.stdout or b'{}'))
+# 3.45 START ASYNCIO FFMPEG RUNNER THREAD
+def StartFFMPEGRunner():
+	with FFMPEG_RUNNER_LOCK:
+		# 3.45.1 RETURN RUNNING EVENT LOOP
+		if FFMPEG_RUNNER['loop'] is not None:
+			return FFMPEG_RUNNER['loop']
+		# 3.45.2 MAKE EVENT LOOP AND CORE BUDGET INSIDE RUNNER THREAD
+		LOOP  = asyncio.new_event_loop()
+		READY = threading.Event()
+		def RunEventLoop():
+			asyncio.set_event_loop(LOOP)
+			FFMPEG_RUNNER.update({'condition': asyncio.Condition(), 'used': 0, 'waiting': collections.deque()})
+			READY.set()
+			LOOP.run_forever()
+		THREAD = threading.Thread(target=RunEventLoop, name='usvpfp-ffmpeg-runner', daemon=True)
+		THREAD.start()
+		READY.wait()
+		FFMPEG_RUNNER.update({'loop': LOOP, 'thread': THREAD})
+		# 3.45.3 RETURN NEW EVENT LOOP
+		return LOOP
+# 3.46 STOP ASYNCIO FFMPEG RUNNER AND KILL RUNNING FFMPEG
+def StopFFMPEGRunner():
+	with FFMPEG_RUNNER_LOCK:
+		LOOP, THREAD = FFMPEG_RUNNER['loop'], FFMPEG_RUNNER['thread']
+		# 3.46.1 FILTER RUNNER NOT STARTED
+		if LOOP is None:
+			return
+		# 3.46.2 CANCEL ALL JOB, EACH JOB KILL ITS OWN FFMPEG PROCESS
+		async def CancelAllJob():
+			TASK_LIST = [TASK for TASK in asyncio.all_tasks() if TASK is not asyncio.current_task()]
+			for TASK in TASK_LIST:
+				TASK.cancel()
+			await asyncio.gather(*TASK_LIST, return_exceptions=True)
+		asyncio.run_coroutine_threadsafe(CancelAllJob(), LOOP).result()
+		# 3.46.3 STOP AND CLOSE EVENT LOOP
+		LOOP.call_soon_threadsafe(LOOP.stop)
+		THREAD.join()
+		LOOP.close()
+		FFMPEG_RUNNER.update({'loop': None, 'thread': None, 'condition': None, 'used': 0, 'waiting': None})
+# 3.47 RUN FFMPEG PROCESS AND PARSE PROGRESS WITHOUT BLOCKING
+async def RunFFMPEGAsync(ARGUMENT_LIST, DURATION=None, INPUT_PATH='', CORE_COUNT=1):
+	LOOP = asyncio.get_running_loop()
+	# 3.47.1 WAIT CORE FROM SHARED BUDGET
+	await AcquireCoreBudget(CORE_COUNT)
+	try:
+		# 3.47.2 START FFMPEG PROCESS
+		try:
+			PROCESS = await asyncio.create_subprocess_exec(*ARGUMENT_LIST, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+		# 3.47.3 ERROR FFMPEG NOT FOUND HANDLING
+		except FileNotFoundError:
+			return None, b'ffmpeg not found'
+		STDERR_TASK = asyncio.ensure_future(PROCESS.stderr.read())
+		DEADLINE    = LOOP.time() + DEFAULT_FFMPEG_TIMEOUT if DEFAULT_FFMPEG_TIMEOUT else None
+		REPORT_TIME = LOOP.time()
+		PROGRESS    = {}
+		try:
+			# 3.47.4 LOOPING PER PROGRESS LINE, TIMEOUT ON STALL OR DEADLINE
+			while True:
+				WAIT_TIME = DEFAULT_FFMPEG_STALL_TIMEOUT or None
+				if DEADLINE is not None:
+					WAIT_TIME = min(WAIT_TIME or float('inf'), max(0, DEADLINE - LOOP.time()))
+				LINE = await asyncio.wait_for(PROCESS.stdout.readline(), WAIT_TIME)
+				if not LINE:
+					break
+				KEY, _, VALUE = LINE.decode('utf-8', 'replace').strip().partition('=')
+				PROGRESS[KEY] = VALUE
+				# 3.47.5 PRINT PROGRESS EVERY INTERVAL AT END OF PROGRESS BLOCK
+				if KEY == 'progress' and VALUE == 'continue' and DEFAULT_PROGRESS_INTERVAL and LOOP.time() - REPORT_TIME >= DEFAULT_PROGRESS_INTERVAL:
+					REPORT_TIME = LOOP.time()
+					OUT_TIME    = int(PROGRESS['out_time_us']) / 1000000 if PROGRESS.get('out_time_us', '').isdigit() else None
+					if OUT_TIME is not None and DURATION:
+						print("[*] File %s Encode %.1f%%, Speed %s" % (str(INPUT_PATH)[-64:], min(100, OUT_TIME * 100 / DURATION), PROGRESS.get('speed', 'N/A').strip()))
+			# 3.47.6 WAIT FFMPEG EXIT AND RETURN EXIT CODE AND ERROR OUTPUT
+			await PROCESS.wait()
+			return PROCESS.returncode, await STDERR_TASK
+		# 3.47.7 ERROR TIMEOUT HANDLING
+		except asyncio.TimeoutError:
+			print("[!] File %s FFMPEG Timeout Error" % str(INPUT_PATH)[-64:])
+			return None, b'ffmpeg timeout'
+		# 3.47.8 KILL FFMPEG ON TIMEOUT, CANCEL, OR INTERRUPT
+		finally:
+			if PROCESS.returncode is None:
+				PROCESS.kill()
+				await PROCESS.wait()
+			STDERR_TASK.cancel()
+	# 3.47.9 RETURN CORE TO SHARED BUDGET
+	finally:
+		await ReleaseCoreBudget(CORE_COUNT)
+# 3.48 RUN FFMPEG COMMAND ON RUNNER FROM WORKER THREAD
+def RunFFMPEGCommand(FFMPEG_STREAM, DURATION=None, INPUT_PATH='', CORE_COUNT=1):
+	# 3.48.1 COMPILE COMMAND WITH MACHINE READABLE PROGRESS ON STDOUT
+	ARGUMENT_LIST = FFMPEG_STREAM.compile(overwrite_output=True)
+	ARGUMENT_LIST[1:1] = ['-nostdin', '-nostats', '-progress', 'pipe:1']
+	# 3.48.2 WAIT JOB FINISH ON RUNNER EVENT LOOP
+	LOOP = StartFFMPEGRunner()
+	RETURN_CODE, STANDARD_ERROR = asyncio.run_coroutine_threadsafe(RunFFMPEGAsync(ARGUMENT_LIST, DURATION, INPUT_PATH, CORE_COUNT), LOOP).result()
+	# 3.48.3 RAISE SAME ERROR AS FFMPEG PYTHON RUN
+	if RETURN_CODE != 0:
+		raise ffmpeg.Error('ffmpeg', b'', STANDARD_ERROR)
+# 3.49 PLAN FFMPEG THREAD COUNT FROM SOURCE RESOLUTION AND DURATION
+def PlanFFMPEGThread(PROBE_INFO):
+	# 3.49.1 RETURN FIXED THREAD COUNT FROM SETTING
+	if DEFAULT_FFMPEG_THREAD_COUNT:
+		return DEFAULT_FFMPEG_THREAD_COUNT
+	# 3.49.2 BASE THREAD COUNT FROM SOURCE PIXEL COUNT
+	PIXEL_COUNT = PROBE_INFO['width'] * PROBE_INFO['height']
+	for MAX_PIXEL_COUNT, THREAD_COUNT in VIDEO_THREAD_PLAN:
+		if PIXEL_COUNT <= MAX_PIXEL_COUNT:
+			break
+	# 3.49.3 SHORT CLIP PACKED DENSELY, LONG SOURCE GET MORE THREAD
+	DURATION = PROBE_INFO.get('duration')
+	if DURATION is not None and DURATION < DEFAULT_SHORT_VIDEO_SECOND:
+		THREAD_COUNT = THREAD_COUNT // 2
+	elif DURATION is not None and DURATION >= DEFAULT_LONG_VIDEO_SECOND:
+		THREAD_COUNT = THREAD_COUNT * 2
+	# 3.49.4 RETURN THREAD COUNT INSIDE CORE BUDGET
+	return max(1, min(THREAD_COUNT, DEFAULT_VIDEO_CORE_BUDGET))
+# 3.50 ACQUIRE CORE FROM SHARED BUDGET IN SUBMIT ORDER
+async def AcquireCoreBudget(CORE_COUNT):
+	CONDITION = FFMPEG_RUNNER['condition']
+	TICKET    = object()
+	async with CONDITION:
+		FFMPEG_RUNNER['waiting'].append(TICKET)
+		try:
+			# 3.50.1 WAIT UNTIL FIRST IN LINE AND CORE FREE, JOB WIDER THAN BUDGET RUN ALONE
+			await CONDITION.wait_for(lambda: FFMPEG_RUNNER['waiting'][0] is TICKET and (FFMPEG_RUNNER['used'] + CORE_COUNT <= DEFAULT_VIDEO_CORE_BUDGET or FFMPEG_RUNNER['used'] == 0))
+			FFMPEG_RUNNER['used'] += CORE_COUNT
+		# 3.50.2 LEAVE LINE AND WAKE NEXT JOB, ALSO ON CANCEL
+		finally:
+			FFMPEG_RUNNER['waiting'].remove(TICKET)
+			CONDITION.notify_all()
+# 3.51 RELEASE CORE TO SHARED BUDGET
+async def ReleaseCoreBudget(CORE_COUNT):
+	async with FFMPEG_RUNNER['condition']:
+		FFMPEG_RUNNER['used'] -= CORE_COUNT
+		FFMPEG_RUNNER['condition'].notify_all()
+# 3.52 PROBE STREAM START AND DURATION FOR SYNC CHECK
+def ProbeStreamTiming(INPUT_PATH):
+	TIMING = {}
+	# 3.52.1 ASK FFPROBE ONLY TIMING FIELD
+	PROBE_PROCESS = subprocess.run(
+		['ffprobe', '-v', 'error', '-show_entries', 'stream=codec_type,start_time,duration:format=start_time,duration', '-of', 'json', str(INPUT_PATH)],
+		stdout=subprocess.PIPE, stderr=subprocess.PIPE
+	)
+	PROBE_TIMING = json.loads(PROBE_PROCESS.stdout or b'{}') if PROBE_PROCESS.returncode == 0 else {}
+	# 3.52.2 LOOPING FORMAT AND FIRST STREAM PER TYPE
+	for KEY, ENTRY in [('format', PROBE_TIMING.get('format', {}))] + [(STREAM.get('codec_type'), STREAM) for STREAM in reversed(PROBE_TIMING.get('streams', []))]:
+		TIMING[KEY] = {
+			'start'    : float(ENTRY['start_time']) if ENTRY.get('start_time') not in (None, 'N/A') else 0.0,
+			'duration' : float(ENTRY['duration']) if ENTRY.get('duration') not in (None, 'N/A') else None,
+		}
+	# 3.52.3 RETURN TIMING PER FORMAT, VIDEO, AND AUDIO
+	return TIMING
+# 3.53 ENCODE LONG VIDEO AS PARALLEL SEGMENT AND CONCAT
+def EncodeVideoInSegment(INPUT_PATH, OUTPUT_PATH, PROBE_INFO, NEW_WIDTH, NEW_HEIGHT):
+	OUTPUT_PATH    = pathlib.Path(OUTPUT_PATH)
+	SEGMENT_FOLDER = pathlib.Path(tempfile.mkdtemp(prefix='TEMP_SEGMENT_', dir=str(OUTPUT_PATH.parent)))
+	try:
+		# 3.53.1 SPLIT VIDEO STREAM AT KEYFRAME WITHOUT ENCODE
+		RunFFMPEGCommand(
+			ffmpeg
+			.input(str(INPUT_PATH))
+			.output(str(SEGMENT_FOLDER / 'source_%05d.mkv'), map='0:v:0', c='copy', f='segment', segment_time=DEFAULT_SEGMENT_SECOND, reset_timestamps=1),
+			PROBE_INFO['duration'], INPUT_PATH
+		)
+		SOURCE_LIST = sorted(SEGMENT_FOLDER.glob('source_*.mkv'))
+		# 3.53.2 THREAD PER SEGMENT PLANNED FOR SEGMENT LENGTH, NOT SOURCE LENGTH
+		THREAD_COUNT = PlanFFMPEGThread(dict(PROBE_INFO, duration=DEFAULT_SEGMENT_SECOND))
+		def EncodeSegment(INDEX):
+			RunFFMPEGCommand(
+				ffmpeg
+				.input(str(SOURCE_LIST[INDEX]))
+				.filter("scale", NEW_WIDTH, NEW_HEIGHT)
+				.output(str(SEGMENT_FOLDER / ('encode_%05d.mkv' % INDEX)), vcodec="libx264", threads=THREAD_COUNT, **VIDEO_ENCODE_PROFILE[DEFAULT_VIDEO_PROFILE]),
+				None, '%s segment %d/%d' % (pathlib.Path(INPUT_PATH).name, INDEX + 1, len(SOURCE_LIST)), THREAD_COUNT
+			)
+		# 3.53.3 ENCODE ALL SEGMENT, CORE BUDGET DECIDE HOW MANY RUN TOGETHER
+		with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, DEFAULT_VIDEO_CORE_BUDGET // THREAD_COUNT)) as SEGMENT_POOL:
+			list(SEGMENT_POOL.map(EncodeSegment, range(len(SOURCE_LIST))))
+		# 3.53.4 WRITE CONCAT DEMUXER LIST
+		CONCAT_PATH = SEGMENT_FOLDER / 'concat.txt'
+		with open(CONCAT_PATH, 'w', encoding='utf-8') as CONCAT_FILE:
+			for INDEX in range(len(SOURCE_LIST)):
+				CONCAT_FILE.write("file '%s'\n" % ('encode_%05d.mkv' % INDEX))
+		# 3.53.5 KEEP ORIGINAL VIDEO OFFSET AGAINST AUDIO
+		SOURCE_TIMING = ProbeStreamTiming(INPUT_PATH)
+		VIDEO_OFFSET  = SOURCE_TIMING.get('video', {}).get('start', 0.0) - SOURCE_TIMING.get('format', {}).get('start', 0.0)
+		# 3.53.6 CONCAT ENCODED VIDEO AND MUX ORIGINAL AUDIO WITHOUT ENCODE
+		RunFFMPEGCommand(
+			ffmpeg
+			.output(
+				ffmpeg.input(str(CONCAT_PATH), f='concat', safe=0, itsoffset=VIDEO_OFFSET)['v'],
+				ffmpeg.input(str(INPUT_PATH))['a?'],
+				str(OUTPUT_PATH), vcodec='copy', acodec='copy', movflags='+faststart'
+			),
+			PROBE_INFO['duration'], INPUT_PATH
+		)
+		# 3.53.7 VERIFY EACH ENCODED SEGMENT AGAINST ITS SPLIT SOURCE AND TOTAL LENGTH AGAINST SOURCE
+		OUTPUT_TIMING = ProbeStreamTiming(OUTPUT_PATH)
+		LENGTH_LIST   = [(GetSegmentLength(SOURCE_LIST[INDEX]), GetSegmentLength(SEGMENT_FOLDER / ('encode_%05d.mkv' % INDEX))) for INDEX in range(len(SOURCE_LIST))]
+		LENGTH_LIST.append((SOURCE_TIMING.get('format', {}).get('duration'), OUTPUT_TIMING.get('format', {}).get('duration')))
+		for EXPECTED_LENGTH, OUTPUT_LENGTH in LENGTH_LIST:
+			if EXPECTED_LENGTH is None or OUTPUT_LENGTH is None or abs(OUTPUT_LENGTH - EXPECTED_LENGTH) > DEFAULT_SEGMENT_TOLERANCE:
+				print("[!] File %s Segment Duration Error" % str(INPUT_PATH)[-64:])
+				return False
+		if 'audio' in SOURCE_TIMING and 'audio' in OUTPUT_TIMING:
+			SOURCE_DRIFT = SOURCE_TIMING['video']['start'] - SOURCE_TIMING['audio']['start']
+			OUTPUT_DRIFT = OUTPUT_TIMING['video']['start'] - OUTPUT_TIMING['audio']['start']
+			if abs(OUTPUT_DRIFT - SOURCE_DRIFT) > DEFAULT_SEGMENT_TOLERANCE:
+				print("[!] File %s Segment Sync Error" % str(INPUT_PATH)[-64:])
+				return False
+		# 3.53.8 RETURN SEGMENT ENCODE SUCCESS
+		return True
+	# 3.53.9 ERROR FFMPEG HANDLING
+	except ffmpeg.Error:
+		return False
+	# 3.53.10 REMOVE SEGMENT FOLDER
+	finally:
+		shutil.rmtree(SEGMENT_FOLDER, ignore_errors=True)
+# 3.54 GET MATROSKA SEGMENT LENGTH
+def GetSegmentLength(SEGMENT_PATH):
+	# 3.54.1 MATROSKA DURATION COUNT FROM ZERO, NOT FROM FIRST TIMESTAMP
+	FORMAT_TIMING = ProbeStreamTiming(SEGMENT_PATH).get('format', {})
+	return FORMAT_TIMING['duration'] - FORMAT_TIMING['start'] if FORMAT_TIMING.get('duration') is not None else None
+# 3.55 OPEN JOB JOURNAL AND RECOVER INTERRUPTED RUN
+def OpenJournal(JOURNAL_PATH):
+	RECORD_LIST = []
+	# 3.55.1 READ JOURNAL RECORD, IGNORE BROKEN LAST LINE
+	try:
+		with open(JOURNAL_PATH, 'r', encoding='utf-8') as JOURNAL_FILE:
+			for LINE in JOURNAL_FILE:
+				try:
+					RECORD_LIST.append(json.loads(LINE))
+				except ValueError:
+					continue
+	# 3.55.2 NO JOURNAL FILE ON FIRST RUN
+	except FileNotFoundError:
+		pass
+	# 3.55.3 ERROR READ JOURNAL HANDLING
+	except OSError:
+		print("[!] Journal File %s Unreadable" % str(JOURNAL_PATH)[-64:])
+	# 3.55.4 FINISH STEP OF FOLDER COMMIT THAT NEVER REACH FOLDER DONE
+	RecoverJournal(RECORD_LIST)
+	# 3.55.5 KEEP FINISHED ENCODE THAT STILL MATCH SOURCE AND TEMPORARY OUTPUT
+	ENCODED_DICT = {}
+	for RECORD in RECORD_LIST:
+		if RECORD.get('op') == 'encoded' and IsEncodedRecordValid(RECORD):
+			ENCODED_DICT[RECORD['source']] = RECORD
+	# 3.55.6 COMPACT JOURNAL TO VALID ENCODE AND OPEN FOR APPEND
+	try:
+		with open('%s.tmp' % JOURNAL_PATH, 'w', encoding='utf-8') as JOURNAL_FILE:
+			for RECORD in ENCODED_DICT.values():
+				JOURNAL_FILE.write(json.dumps(RECORD, separators=(',', ':')) + '\n')
+		os.replace('%s.tmp' % JOURNAL_PATH, JOURNAL_PATH)
+		JOURNAL_FILE = open(JOURNAL_PATH, 'a', encoding='utf-8')
+	# 3.55.7 ERROR WRITE JOURNAL HANDLING, RUN WITHOUT JOURNAL
+	except OSError:
+		print("[!] Journal File %s Write Error" % str(JOURNAL_PATH)[-64:])
+		JOURNAL_FILE = None
+	# 3.55.8 RETURN JOURNAL
+	return {'file': JOURNAL_FILE, 'lock': threading.Lock(), 'encoded': ENCODED_DICT}
+# 3.56 WRITE JOURNAL RECORD BEFORE THE STEP IT DESCRIBE
+def WriteJournal(JOURNAL, RECORD):
+	# 3.56.1 FILTER JOURNAL NOT OPEN
+	if JOURNAL is None or JOURNAL['file'] is None:
+		return
+	# 3.56.2 APPEND ONE LINE, FLUSH SO IT SURVIVE PROCESS CRASH
+	with JOURNAL['lock']:
+		try:
+			JOURNAL['file'].write(json.dumps(RECORD, separators=(',', ':')) + '\n')
+			JOURNAL['file'].flush()
+		# 3.56.3 ERROR WRITE JOURNAL HANDLING
+		except (OSError, ValueError):
+			print("[!] Journal File Write Error")
+# 3.57 FINISH OR ROLL BACK UNFINISHED FOLDER COMMIT
+def RecoverJournal(RECORD_LIST):
+	DONE_SET    = {RECORD['folder'] for RECORD in RECORD_LIST if RECORD.get('op') == 'folder-done'}
+	RENAMED_SET = {RECORD['folder'] for RECORD in RECORD_LIST if RECORD.get('op') == 'renamed'}
+	# 3.57.1 FINISH DELETE OF CONVERTED SOURCE IN FOLDER THAT PASSED ITS RENAME
+	for RECORD in RECORD_LIST:
+		if RECORD.get('op') != 'renamed' or RECORD['folder'] in DONE_SET:
+			continue
+		for NAME in RECORD['delete']:
+			if RemoveFileSafely(pathlib.Path(RECORD['folder'], NAME), QUIET=True):
+				print("[*] Recover XXX %s" % NAME[-64:])
+	# 3.57.2 ROLL BACK RENAME OF FOLDER THAT NEVER PASSED IT, IN REVERSE ORDER AND ONLY IF NAME STILL FREE
+	for RECORD in RECORD_LIST:
+		if RECORD.get('op') != 'rename' or RECORD['folder'] in DONE_SET or RECORD['folder'] in RENAMED_SET:
+			continue
+		for SOURCE_NAME, TARGET_NAME in reversed(RECORD['move']):
+			SOURCE, TARGET = pathlib.Path(RECORD['folder'], SOURCE_NAME), pathlib.Path(RECORD['folder'], TARGET_NAME)
+			if os.path.exists(TARGET) and not os.path.exists(SOURCE):
+				if RenameFileSafely(TARGET, SOURCE):
+					print("[*] Recover %s >>> %s" % (TARGET_NAME[-64:], SOURCE_NAME[-64:]))
+# 3.58 CHECK FINISHED ENCODE STILL MATCH SOURCE AND TEMPORARY OUTPUT
+def IsEncodedRecordValid(RECORD, FILE_STAT=None):
+	# 3.58.1 GET SOURCE AND TEMPORARY OUTPUT STAT
+	try:
+		FILE_STAT = FILE_STAT or os.stat(RECORD['source'])
+		TEMP_SIZE = os.path.getsize(RECORD['temp'])
+	# 3.58.2 ERROR SOURCE OR OUTPUT DISAPPEARED HANDLING
+	except OSError:
+		return False
+	# 3.58.3 RETURN TRUE IF NOTHING CHANGED SINCE ENCODE
+	return FILE_STAT.st_size == RECORD['size'] and FILE_STAT.st_mtime_ns == RECORD['mtime'] and TEMP_SIZE == RECORD['temp_size']
+# 3.59 JOURNAL FINISHED ENCODE FROM WORKER FUTURE
+def JournalEncodedFile(JOURNAL, FILE, FILE_STAT, TEMP_OUTPUT, FUTURE):
+	# 3.59.1 FILTER FAILED, SKIPPED, OR CANCELLED JOB
+	if FILE_STAT is None or FUTURE.cancelled() or FUTURE.exception() is not None or FUTURE.result()[0] != 1:
+		return
+	# 3.59.2 WRITE ENCODE RECORD WITH SOURCE AND OUTPUT IDENTITY
+	try:
+		TEMP_SIZE = os.path.getsize(TEMP_OUTPUT)
+	except OSError:
+		return
+	WriteJournal(JOURNAL, {
+		'op'        : 'encoded',
+		'source'    : os.path.abspath(FILE),
+		'size'      : FILE_STAT.st_size,
+		'mtime'     : FILE_STAT.st_mtime_ns,
+		'temp'      : os.path.abspath(TEMP_OUTPUT),
+		'temp_size' : TEMP_SIZE,
+		'probe'     : FUTURE.result()[1],
+	})
+# 3.60 PLAN FOLDER CONVERTION WITHOUT TOUCHING MEDIA
+def PlanFolderConvertion(FOLDER_NAME, FILE_LIST, PROBE_CACHE=None, PROBE_POOL=None, JOURNAL=None):
+	JOB_LIST     = []
+	PROBE_FUTURE = {}
+	# 3.60.1 LOOPING PER FILE IN SORTED ORDER
+	for FILE in SortFileListNaturally(FILE_LIST):
+		JOB = {'name': FILE.name, 'category': GetFileCategory(FILE), 'action': 'convert', 'size': None, 'mtime': None, 'probe': None}
+		JOB_LIST.append(JOB)
+		CountExtensionFile(FILE, 'found')
+		# 3.60.2 GET FILE STAT IDENTITY
+		try:
+			FILE_STAT = FILE.stat()
+			JOB.update({'size': FILE_STAT.st_size, 'mtime': FILE_STAT.st_mtime_ns})
+		# 3.60.3 ERROR FILE DISAPPEARED HANDLING, WORKER REPORT IT
+		except OSError:
+			continue
+		# 3.60.4 REUSE FINISHED ENCODE FROM INTERRUPTED RUN
+		TEMP_OUTPUT = FILE.parent / ('TEMP_OUTPUT_%s%s' % (FILE.name, GetOutputFormat(JOB['category'])))
+		ENCODED     = JOURNAL['encoded'].pop(os.path.abspath(FILE), None) if JOURNAL is not None else None
+		if ENCODED is not None and ENCODED['temp'] == os.path.abspath(TEMP_OUTPUT) and IsEncodedRecordValid(ENCODED, FILE_STAT):
+			JOB.update({'action': 'reuse', 'probe': ENCODED['probe']})
+			continue
+		# 3.60.5 READ PROBE INFORMATION FROM CACHE
+		JOB['probe'] = ReadProbeCache(PROBE_CACHE, FILE, FILE_STAT)
+		# 3.60.6 READ PHOTO RESOLUTION FROM HEADER WITHOUT DECODE
+		if JOB['probe'] is None and JOB['category'] != 'video':
+			with MeasureStage('probe'):
+				JOB['probe'] = ProbeImageHeader(FILE)
+		# 3.60.7 SEND UNCACHED VIDEO TO BATCH PROBE POOL
+		if JOB['probe'] is None and JOB['category'] == 'video' and PROBE_POOL is not None:
+			PROBE_FUTURE[PROBE_POOL.submit(ProbeVideoWithFFMPEG, FILE)] = JOB
+	# 3.60.8 COLLECT VIDEO PROBE, FAILED PROBE PLANNED AS ERROR
+	for FUTURE in concurrent.futures.as_completed(PROBE_FUTURE):
+		JOB = PROBE_FUTURE[FUTURE]
+		try:
+			JOB['probe'] = FUTURE.result()
+		except Exception:
+			JOB['probe'] = None
+		if JOB['probe'] is None:
+			JOB['action'] = 'error'
+	# 3.60.9 CLASSIFY RENAME ONLY FILE
+	for JOB in JOB_LIST:
+		if JOB['action'] == 'convert' and JOB['probe'] is not None and IsRenameOnly(pathlib.Path(JOB['name']), JOB['category'], JOB['probe']):
+			JOB['action'] = 'rename'
+	# 3.60.10 NAME OUTPUT IN SORTED ORDER, ERROR FILE KEEP ITS NAME
+	OUTPUT_LIST = NameFolderOutput(
+		[None if JOB['action'] == 'error' else JOB['category'] for JOB in JOB_LIST],
+		{JOB['name'] for JOB in JOB_LIST if JOB['action'] == 'error'}
+	)
+	for JOB, OUTPUT_NAME in zip(JOB_LIST, OUTPUT_LIST):
+		JOB['output'] = OUTPUT_NAME or JOB['name']
+	# 3.60.11 RETURN SERIALISABLE FOLDER PLAN
+	return {'version': PLAN_VERSION, 'folder': str(FOLDER_NAME), 'job': JOB_LIST}
+# 3.61 PRINT FOLDER PLAN FOR DRY RUN
+def PrintFolderPlan(PLAN):
+	# 3.61.1 PRINT CURRENT FOLDER
+	print("[+] %s" % PLAN['folder'])
+	# 3.61.2 LOOPING PER PLANNED JOB, SAME MARK AS COMMIT
+	for JOB in PLAN['job']:
+		print(" + [+] %s %s %s" % (JOB['name'][-64:], PLAN_MARK[JOB['action']], JOB['output'][-64:]))
+# 3.62 READ PLAN FILE ONE FOLDER PER LINE
+def ReadPlanFile(PLAN_PATH):
+	# 3.62.1 OPEN PLAN FILE
+	try:
+		PLAN_FILE = open(PLAN_PATH, 'r', encoding='utf-8')
+	# 3.62.2 ERROR PLAN FILE HANDLING
+	except OSError:
+		print("[!] Plan File %s Not Found Error" % str(PLAN_PATH)[-64:])
+		return
+	# 3.62.3 LOOPING PER FOLDER PLAN
+	with PLAN_FILE:
+		for LINE in PLAN_FILE:
+			try:
+				PLAN = json.loads(LINE)
+			except ValueError:
+				print("[!] Plan File %s Broken Line" % str(PLAN_PATH)[-64:])
+				continue
+			# 3.62.4 FILTER UNKNOWN PLAN VERSION
+			if not isinstance(PLAN, dict) or PLAN.get('version') != PLAN_VERSION:
+				print("[!] Plan File %s Unknown Version" % str(PLAN_PATH)[-64:])
+				continue
+			# 3.62.5 SKIP FOLDER CHANGED SINCE PLAN
+			if not IsPlanCurrent(PLAN):
+				print("[!] Folder %s Changed Since Plan, Skip" % PLAN['folder'][-64:])
+				continue
+			yield PLAN
+# 3.63 CHECK PLANNED FILE NOT CHANGED
+def IsPlanCurrent(PLAN):
+	# 3.63.1 LOOPING PER PLANNED JOB
+	for JOB in PLAN['job']:
+		try:
+			FILE_STAT = os.stat(os.path.join(PLAN['folder'], JOB['name']))
+		# 3.63.2 ERROR FILE DISAPPEARED HANDLING
+		except OSError:
+			return False
+		# 3.63.3 FILTER CHANGED FILE
+		if FILE_STAT.st_size != JOB['size'] or FILE_STAT.st_mtime_ns != JOB['mtime']:
+			return False
+	# 3.63.4 RETURN PLAN STILL VALID
+	return True
+# 3.64 OPEN SHARED LEASE QUEUE WITH SQLITE
+def OpenLeaseQueue(QUEUE_PATH):
+	# 3.64.1 CONNECT SQLITE DATABASE, TRANSACTION STARTED BY HAND WITH BEGIN IMMEDIATE
+	try:
+		CONNECTION = sqlite3.connect(str(QUEUE_PATH), timeout=DEFAULT_QUEUE_TIMEOUT, isolation_level=None)
+		# 3.64.2 ROLLBACK JOURNAL, WAL NEED SHARED MEMORY THAT NETWORK FILE SYSTEM DO NOT HAVE
+		CONNECTION.execute("PRAGMA journal_mode = DELETE")
+		# 3.64.3 DROP QUEUE TABLE FROM OLDER QUEUE VERSION
+		if CONNECTION.execute("PRAGMA user_version").fetchone()[0] != QUEUE_VERSION:
+			CONNECTION.execute("DROP TABLE IF EXISTS lease")
+			CONNECTION.execute("DROP TABLE IF EXISTS meta")
+			CONNECTION.execute("PRAGMA user_version = %d" % QUEUE_VERSION)
+		# 3.64.4 CREATE LEASE AND META TABLE
+		CONNECTION.execute(
+			"CREATE TABLE IF NOT EXISTS lease ("
+			"folder TEXT PRIMARY KEY, file_list TEXT NOT NULL, listing TEXT, state TEXT NOT NULL, "
+			"owner TEXT, heartbeat REAL NOT NULL DEFAULT 0, attempt INTEGER NOT NULL DEFAULT 0, seq INTEGER NOT NULL)"
+		)
+		CONNECTION.execute("CREATE INDEX IF NOT EXISTS lease_state ON lease (state, seq)")
+		CONNECTION.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+	# 3.64.5 ERROR QUEUE DATABASE HANDLING
+	except sqlite3.Error:
+		print("[!] Queue %s Error" % str(QUEUE_PATH)[-64:])
+		return None
+	# 3.64.6 RETURN QUEUE CONNECTION
+	return CONNECTION
+# 3.65 ENQUEUE SCANNED FOLDER AS LEASE
+def EnqueueFolderLease(CONNECTION, SCAN_FILE_LIST):
+	FOLDER_SET    = set()
+	ENQUEUE_COUNT = 0
+	# 3.65.1 UNSEAL QUEUE SO WORKER WAIT FOR SCAN TO FINISH
+	with CONNECTION:
+		CONNECTION.execute("BEGIN IMMEDIATE")
+		CONNECTION.execute("INSERT OR REPLACE INTO meta VALUES ('sealed', '0')")
+	# 3.65.2 LOOPING PER FOLDER WHILE SCAN STILL RUNNING
+	for FOLDER_NAME, FILE_LIST in SCAN_FILE_LIST:
+		FOLDER_KEY = os.path.relpath(FOLDER_NAME, DEFAULT_WORKING_DIRECTORY)
+		FOLDER_SET.add(FOLDER_NAME)
+		try:
+			LISTING_HASH = HashFolderListing(os.listdir(FOLDER_NAME))
+		# 3.65.3 ERROR FOLDER DISAPPEARED HANDLING
+		except OSError:
+			continue
+		# 3.65.4 ONE SHORT TRANSACTION PER FOLDER, WORKER CLAIM WHILE SCAN RUNNING
+		with CONNECTION:
+			CONNECTION.execute("BEGIN IMMEDIATE")
+			ROW = CONNECTION.execute("SELECT state, listing, heartbeat FROM lease WHERE folder = ?", (FOLDER_KEY,)).fetchone()
+			# 3.65.5 SKIP FOLDER DONE WITH SAME LISTING OR HELD BY LIVE WORKER
+			if ROW is not None and ROW[0] == 'done' and ROW[1] == LISTING_HASH:
+				continue
+			if ROW is not None and ROW[0] == 'running' and ROW[2] >= time.time() - DEFAULT_LEASE_SECOND:
+				continue
+			# 3.65.6 INSERT PENDING LEASE AT END OF QUEUE
+			CONNECTION.execute(
+				"INSERT OR REPLACE INTO lease (folder, file_list, listing, state, seq) VALUES (?, ?, ?, 'pending', (SELECT COALESCE(MAX(seq), 0) + 1 FROM lease))",
+				(FOLDER_KEY, json.dumps([FILE.name for FILE in FILE_LIST]), LISTING_HASH)
+			)
+			ENQUEUE_COUNT += 1
+	# 3.65.7 FORGET FOLDER NOT FOUND IN SCAN AND SEAL QUEUE
+	FOLDER_KEY_SET = {os.path.relpath(FOLDER_NAME, DEFAULT_WORKING_DIRECTORY) for FOLDER_NAME in FOLDER_SET}
+	with CONNECTION:
+		CONNECTION.execute("BEGIN IMMEDIATE")
+		for FOLDER_KEY, STATE in CONNECTION.execute("SELECT folder, state FROM lease").fetchall():
+			if FOLDER_KEY not in FOLDER_KEY_SET and STATE != 'running':
+				CONNECTION.execute("DELETE FROM lease WHERE folder = ?", (FOLDER_KEY,))
+		CONNECTION.execute("INSERT OR REPLACE INTO meta VALUES ('sealed', '1')")
+	# 3.65.8 RETURN ENQUEUED COUNT AND SCANNED FOLDER
+	return ENQUEUE_COUNT, FOLDER_SET
+# 3.66 CLAIM PENDING FOLDER LEASE ONE BY ONE
+def ClaimFolderLease(LEASE_QUEUE):
+	CONNECTION = LEASE_QUEUE['connection']
+	# 3.66.1 LOOPING UNTIL NO PENDING LEASE
+	while True:
+		with CONNECTION:
+			CONNECTION.execute("BEGIN IMMEDIATE")
+			# 3.66.2 END ROUND EARLY SO EXPIRED LEASE GET RECLAIMED
+			if CONNECTION.execute("SELECT 1 FROM lease WHERE state = 'running' AND heartbeat < ? LIMIT 1", (time.time() - DEFAULT_LEASE_SECOND,)).fetchone():
+				return
+			# 3.66.3 SELECT OLDEST PENDING LEASE
+			ROW = CONNECTION.execute("SELECT folder, file_list, attempt FROM lease WHERE state = 'pending' ORDER BY seq LIMIT 1").fetchone()
+			if ROW is None:
+				return
+			FOLDER_KEY, FILE_LIST, ATTEMPT = ROW
+			# 3.66.4 FAIL FOLDER THAT KEEP KILLING WORKER
+			if ATTEMPT >= DEFAULT_LEASE_MAX_ATTEMPT:
+				CONNECTION.execute("UPDATE lease SET state = 'failed' WHERE folder = ?", (FOLDER_KEY,))
+				print("[!] Folder %s Failed After %d Attempt" % (FOLDER_KEY[-64:], ATTEMPT))
+				continue
+			# 3.66.5 TAKE LEASE
+			CONNECTION.execute(
+				"UPDATE lease SET state = 'running', owner = ?, heartbeat = ?, attempt = attempt + 1 WHERE folder = ?",
+				(LEASE_QUEUE['owner'], time.time(), FOLDER_KEY)
+			)
+		# 3.66.6 YIELD FOLDER LIKE SCANNER
+		FOLDER_NAME = DEFAULT_WORKING_DIRECTORY / FOLDER_KEY
+		yield FOLDER_NAME, [FOLDER_NAME / NAME for NAME in json.loads(FILE_LIST)]
+# 3.67 RECLAIM LEASE OF DEAD WORKER
+def ReclaimExpiredLease(LEASE_QUEUE):
+	CONNECTION = LEASE_QUEUE['connection']
+	with CONNECTION:
+		CONNECTION.execute("BEGIN IMMEDIATE")
+		ROW_LIST = CONNECTION.execute("SELECT folder, owner FROM lease WHERE state = 'running' AND heartbeat < ?", (time.time() - DEFAULT_LEASE_SECOND,)).fetchall()
+		# 3.67.1 FINISH OR ROLL BACK COMMIT OF DEAD WORKER WHILE HOLDING QUEUE LOCK
+		for OWNER in {OWNER for FOLDER_KEY, OWNER in ROW_LIST}:
+			RecoverWorkerJournal(OWNER, LEASE_QUEUE['journal'])
+		# 3.67.2 PUT LEASE BACK TO QUEUE
+		for FOLDER_KEY, OWNER in ROW_LIST:
+			print("[!] Folder %s Lease Of %s Expired, Reclaim" % (FOLDER_KEY[-64:], OWNER[-32:]))
+			CONNECTION.execute("UPDATE lease SET state = 'pending', owner = NULL WHERE folder = ?", (FOLDER_KEY,))
+# 3.68 RECOVER JOURNAL OF DEAD WORKER INTO OWN JOURNAL
+def RecoverWorkerJournal(OWNER, JOURNAL_PATH):
+	OWNER_JOURNAL_PATH = DEFAULT_JOURNAL_PATH.with_name('.usvpfp-journal-%s.jsonl' % OWNER)
+	# 3.68.1 FILTER WORKER WITHOUT JOURNAL
+	if not OWNER_JOURNAL_PATH.exists():
+		return
+	# 3.68.2 RECOVER AND COMPACT DEAD WORKER JOURNAL
+	JOURNAL = OpenJournal(OWNER_JOURNAL_PATH)
+	if JOURNAL['file'] is not None:
+		JOURNAL['file'].close()
+	# 3.68.3 HAND FINISHED ENCODE OVER SO IT GET REUSED
+	try:
+		with open(JOURNAL_PATH, 'a', encoding='utf-8') as JOURNAL_FILE:
+			for RECORD in JOURNAL['encoded'].values():
+				JOURNAL_FILE.write(json.dumps(RECORD, separators=(',', ':')) + '\n')
+		os.remove(OWNER_JOURNAL_PATH)
+	# 3.68.4 ERROR WRITE JOURNAL HANDLING
+	except OSError:
+		print("[!] Journal File %s Write Error" % str(JOURNAL_PATH)[-64:])
+# 3.69 RENEW LEASE WHILE WORKER ALIVE
+def HeartbeatFolderLease(QUEUE_PATH, OWNER, STOP_EVENT):
+	CONNECTION = OpenLeaseQueue(QUEUE_PATH)
+	# 3.69.1 LOOPING UNTIL WORKER STOP
+	while CONNECTION is not None and not STOP_EVENT.wait(DEFAULT_HEARTBEAT_SECOND):
+		try:
+			CONNECTION.execute("UPDATE lease SET heartbeat = ? WHERE owner = ? AND state = 'running'", (time.time(), OWNER))
+		# 3.69.2 ERROR QUEUE LOCKED HANDLING, TRY AGAIN NEXT BEAT
+		except sqlite3.Error:
+			print("[!] Queue Heartbeat Error")
+	# 3.69.3 CLOSE HEARTBEAT CONNECTION
+	if CONNECTION is not None:
+		CONNECTION.close()
+# 3.70 CHECK WORKER STILL HOLD FOLDER LEASE
+def IsLeaseHeld(LEASE_QUEUE, FOLDER_NAME):
+	ROW = LEASE_QUEUE['connection'].execute("SELECT state, owner FROM lease WHERE folder = ?", (os.path.relpath(FOLDER_NAME, DEFAULT_WORKING_DIRECTORY),)).fetchone()
+	# 3.70.1 RETURN TRUE IF LEASE NOT RECLAIMED BY OTHER WORKER
+	return ROW is not None and ROW[0] == 'running' and ROW[1] == LEASE_QUEUE['owner']
+# 3.71 FINISH FOLDER LEASE AFTER COMMIT
+def FinishFolderLease(LEASE_QUEUE, FOLDER_NAME, COMMIT_SUCCESS):
+	# 3.71.1 HASH LISTING AFTER COMMIT, COORDINATOR SKIP FOLDER WITH SAME LISTING NEXT RUN
+	try:
+		LISTING_HASH = HashFolderListing(os.listdir(FOLDER_NAME))
+	except OSError:
+		LISTING_HASH = None
+	# 3.71.2 MARK LEASE DONE, FAILED FOLDER GET ENQUEUED AGAIN NEXT RUN
+	with LEASE_QUEUE['connection'] as CONNECTION:
+		CONNECTION.execute("BEGIN IMMEDIATE")
+		CONNECTION.execute(
+			"UPDATE lease SET state = ?, listing = ?, heartbeat = ? WHERE folder = ? AND owner = ?",
+			('done' if COMMIT_SUCCESS else 'failed', LISTING_HASH, time.time(), os.path.relpath(FOLDER_NAME, DEFAULT_WORKING_DIRECTORY), LEASE_QUEUE['owner'])
+		)
+# 3.72 COUNT LEASE PER STATE
+def CountLeaseState(CONNECTION):
+	COUNT = {'pending': 0, 'running': 0, 'done': 0, 'failed': 0}
+	# 3.72.1 GROUP LEASE BY STATE
+	for STATE, STATE_COUNT in CONNECTION.execute("SELECT state, COUNT(*) FROM lease GROUP BY state"):
+		COUNT[STATE] = STATE_COUNT
+	# 3.72.2 READ SEAL FLAG, UNSEALED WHILE COORDINATOR STILL SCAN
+	ROW = CONNECTION.execute("SELECT value FROM meta WHERE key = 'sealed'").fetchone()
+	COUNT['sealed'] = ROW is not None and ROW[0] == '1'
+	# 3.72.3 RETURN STATE COUNT
+	return COUNT
+# 3.73 RUN WORKER AGAINST SHARED LEASE QUEUE
+def RunLeaseWorker(QUEUE_PATH):
+	CONNECTION = OpenLeaseQueue(QUEUE_PATH)
+	if CONNECTION is None:
+		return 0
+	# 3.73.1 WORKER JOURNAL PER HOST AND PROCESS, RECOVERED BY WHOEVER RECLAIM ITS LEASE
+	OWNER       = re.sub(r'[^\w.-]', '_', '%s-%d' % (socket.gethostname(), os.getpid()))
+	LEASE_QUEUE = {'connection': CONNECTION, 'owner': OWNER, 'journal': DEFAULT_JOURNAL_PATH.with_name('.usvpfp-journal-%s.jsonl' % OWNER)}
+	ApplyProgramSetting({'DEFAULT_JOURNAL_PATH': LEASE_QUEUE['journal']})
+	# 3.73.2 START HEARTBEAT THREAD WITH OWN CONNECTION
+	STOP_EVENT       = threading.Event()
+	HEARTBEAT_THREAD = threading.Thread(target=HeartbeatFolderLease, args=(QUEUE_PATH, OWNER, STOP_EVENT), daemon=True)
+	HEARTBEAT_THREAD.start()
+	FOLDER_COUNT     = 0
+	print("[*] Worker %s Start" % OWNER[-64:])
+	try:
+		# 3.73.3 LOOPING ROUND UNTIL QUEUE SEALED AND EMPTY
+		while True:
+			ReclaimExpiredLease(LEASE_QUEUE)
+			ROUND_COUNT   = SortAndConvertAndRenameLogic(ClaimFolderLease(LEASE_QUEUE), None, None, LEASE_QUEUE)
+			FOLDER_COUNT += ROUND_COUNT
+			# 3.73.4 WAIT FOR COORDINATOR SCAN OR OTHER WORKER LEASE
+			if ROUND_COUNT:
+				continue
+			COUNT = CountLeaseState(CONNECTION)
+			if COUNT['sealed'] and not COUNT['pending'] and not COUNT['running']:
+				break
+			time.sleep(DEFAULT_WORKER_IDLE_SECOND)
+		# 3.73.5 REMOVE OWN JOURNAL AFTER CLEAN FINISH
+		RemoveFileSafely(LEASE_QUEUE['journal'], QUIET=True)
+	# 3.73.6 ERROR QUEUE LOCKED TOO LONG HANDLING
+	except sqlite3.Error:
+		print("[!] Queue %s Error" % str(QUEUE_PATH)[-64:])
+	# 3.73.7 EXPIRE OWN LEASE ON INTERRUPT SO OTHER WORKER RECLAIM IT AT ONCE
+	except BaseException:
+		try:
+			CONNECTION.execute("UPDATE lease SET heartbeat = 0 WHERE owner = ? AND state = 'running'", (OWNER,))
+		except sqlite3.Error:
+			pass
+		raise
+	# 3.73.8 STOP HEARTBEAT AND CLOSE QUEUE
+	finally:
+		STOP_EVENT.set()
+		HEARTBEAT_THREAD.join()
+		CONNECTION.close()
+	# 3.73.9 RETURN PROCESSED FOLDER COUNT
+	return FOLDER_COUNT
+# 3.74 RUN COORDINATOR THAT ENQUEUE FOLDER AND WAIT FOR WORKER
+def RunLeaseCoordinator(QUEUE_PATH):
+	CONNECTION = OpenLeaseQueue(QUEUE_PATH)
+	if CONNECTION is None:
+		return None
+	try:
+		# 3.74.1 ENQUEUE FOLDER WHILE SCAN STILL RUNNING
+		ENQUEUE_COUNT, FOLDER_SET = EnqueueFolderLease(CONNECTION, ScanDirectoryWithScandir(DEFAULT_WORKING_DIRECTORY))
+		print("[*] Enqueue %d Of %d Folder" % (ENQUEUE_COUNT, len(FOLDER_SET)))
+		# 3.74.2 EVICT PROBE CACHE OF DISAPPEARED FOLDER, WORKER ONLY SEE OWN FOLDER
+		PROBE_CACHE = OpenProbeCache(DEFAULT_PROBE_CACHE_PATH)
+		if PROBE_CACHE is not None:
+			EvictProbeCacheFolder(PROBE_CACHE, FOLDER_SET)
+			PROBE_CACHE.close()
+		# 3.74.3 PRINT QUEUE PROGRESS UNTIL ALL LEASE FINISH
+		LAST_COUNT = None
+		while True:
+			COUNT = CountLeaseState(CONNECTION)
+			if COUNT != LAST_COUNT:
+				print("[*] Queue Pending %d Running %d Done %d Failed %d" % (COUNT['pending'], COUNT['running'], COUNT['done'], COUNT['failed']))
+				LAST_COUNT = COUNT
+			if not COUNT['pending'] and not COUNT['running']:
+				return COUNT
+			time.sleep(DEFAULT_WORKER_IDLE_SECOND)
+	# 3.74.4 ERROR QUEUE LOCKED TOO LONG HANDLING
+	except sqlite3.Error:
+		print("[!] Queue %s Error" % str(QUEUE_PATH)[-64:])
+		return None
+	# 3.74.5 CLOSE QUEUE
+	finally:
+		CONNECTION.close()
+# 3.75 NAME OUTPUT IN SORTED ORDER, SKIP NUMBER KEPT BY FAILED FILE
+def NameFolderOutput(CATEGORY_LIST, KEEP_NAME_SET):
+	COUNT         = {'photo': 0, 'gif': 0, 'video': 0}
+	OUTPUT_LIST   = []
+	KEEP_NAME_SET = {NAME.lower() for NAME in KEEP_NAME_SET}
+	# 3.75.1 LOOPING PER FILE CATEGORY, NONE FOR FILE THAT KEEP ITS NAME
+	for CATEGORY in CATEGORY_LIST:
+		if CATEGORY is None:
+			OUTPUT_LIST.append(None)
+			continue
+		# 3.75.2 SKIP NUMBER HELD BY FILE THAT STAY
+		while ('%s%s' % (COUNT[CATEGORY], GetOutputFormat(CATEGORY))).lower() in KEEP_NAME_SET:
+			COUNT[CATEGORY] += 1
+		OUTPUT_LIST.append('%s%s' % (COUNT[CATEGORY], GetOutputFormat(CATEGORY)))
+		COUNT[CATEGORY] += 1
+	# 3.75.3 RETURN OUTPUT NAME LIST
+	return OUTPUT_LIST
+# 3.76 ORDER FOLDER PERMUTATION INTO CHAIN AND BROKEN CYCLE
+def OrderFolderRename(MOVE_LIST):
+	# 3.76.1 DROP FILE ALREADY AT ITS NAME
+	PENDING_DICT = {SOURCE: TARGET for SOURCE, TARGET in MOVE_LIST if SOURCE != TARGET}
+	SOURCE_OF    = {TARGET: SOURCE for SOURCE, TARGET in PENDING_DICT.items()}
+	RENAME_ORDER = []
+	# 3.76.2 CHAIN START AT FREE TARGET, WALK BACK THROUGH SOURCE THAT WANT THE NAME JUST FREED
+	for SOURCE, TARGET in list(PENDING_DICT.items()):
+		if TARGET in PENDING_DICT or SOURCE not in PENDING_DICT:
+			continue
+		while SOURCE is not None:
+			RENAME_ORDER.append((SOURCE, PENDING_DICT.pop(SOURCE)))
+			SOURCE = SOURCE_OF.get(SOURCE)
+	# 3.76.3 EVERY LEFTOVER MOVE IS IN A CYCLE, BREAK IT WITH ONE TEMPORARY NAME
+	while PENDING_DICT:
+		FIRST_SOURCE, FIRST_TARGET = PENDING_DICT.popitem()
+		TEMP_FILE = FIRST_SOURCE.parent / ('TEMP_RENAME_%s%s' % (uuid.uuid4().hex, FIRST_SOURCE.suffix))
+		RENAME_ORDER.append((FIRST_SOURCE, TEMP_FILE))
+		SOURCE = SOURCE_OF[FIRST_SOURCE]
+		while SOURCE != FIRST_SOURCE:
+			RENAME_ORDER.append((SOURCE, PENDING_DICT.pop(SOURCE)))
+			SOURCE = SOURCE_OF[SOURCE]
+		RENAME_ORDER.append((TEMP_FILE, FIRST_TARGET))
+	# 3.76.4 RETURN RENAME IN SAFE ORDER, ONE RENAME PER MOVE PLUS ONE PER CYCLE
+	return RENAME_ORDER
+# 3.77 APPLY ORDERED RENAME WITH ROLL BACK
+def ApplyFolderRename(RENAME_ORDER):
+	# 3.77.1 REFUSE TO OVERWRITE FILE OUTSIDE PERMUTATION, ONLY CHAIN START CAN HIT ONE
+	MOVED_SET = {SOURCE for SOURCE, TARGET in RENAME_ORDER}
+	for SOURCE, TARGET in RENAME_ORDER:
+		if TARGET not in MOVED_SET and os.path.lexists(TARGET):
+			print("[!] File %s Name Taken Error" % TARGET.name[-64:])
+			return False
+	# 3.77.2 LOOPING RENAME IN ORDER
+	for INDEX, (SOURCE, TARGET) in enumerate(RENAME_ORDER):
+		if RenameFileSafely(SOURCE, TARGET):
+			continue
+		# 3.77.3 ROLL BACK DONE RENAME IN REVERSE ORDER
+		for SOURCE, TARGET in reversed(RENAME_ORDER[:INDEX]):
+			RenameFileSafely(TARGET, SOURCE)
+		return False
+	# 3.77.4 RETURN RENAME SUCCESS
+	return True
+# 3.78 BUILD NATURAL SORT KEY ONCE PER FILE NAME
+@functools.lru_cache(maxsize=SORT_KEY_CACHE_SIZE)
+def GetNaturalSortKey(NAME):
+	# 3.78.1 SPLIT LOWERCASE NAME, TEXT ALWAYS AT EVEN INDEX AND DIGIT ALWAYS AT ODD INDEX
+	PART_LIST = NATURAL_SORT_PATTERN.split(NAME.lower())
+	# 3.78.2 DIGIT PART TO INTEGER, SAME INDEX ALWAYS SAME TYPE SO COMPARE NEVER FAIL
+	PART_LIST[1::2] = map(int, PART_LIST[1::2])
+	# 3.78.3 RETURN HASHABLE TUPLE KEY, ORIGINAL NAME BREAK TIE LIKE 1.png AND 01.png
+	return tuple(PART_LIST), NAME
+# 3.79 RECORD STAGE TIME INTO CONVERT CALL COLLECTOR OR RUN METRIC
+def RecordStageTime(STAGE, SECOND):
+	METRIC = getattr(METRIC_LOCAL, 'metric', None)
+	# 3.79.1 OUTSIDE CONVERT CALL, WRITE RUN METRIC SHARED BY PROBE AND SEGMENT THREAD
+	if METRIC is None:
+		with RUN_METRIC_LOCK:
+			AddStageTime(RUN_METRIC, STAGE, SECOND)
+		return
+	# 3.79.2 INSIDE CONVERT CALL, COLLECTOR GO BACK TO MAIN PROCESS WITH RESULT
+	AddStageTime(METRIC, STAGE, SECOND)
+# 3.80 ADD ONE SAMPLE TO STAGE HISTOGRAM
+def AddStageTime(METRIC, STAGE, SECOND):
+	HISTOGRAM = METRIC['stage'].setdefault(STAGE, {'bucket': [0] * (len(METRIC_BUCKET) + 1), 'count': 0, 'sum': 0.0, 'max': 0.0})
+	# 3.80.1 FIRST BUCKET WITH UPPER BOUND NOT BELOW SAMPLE, LAST BUCKET IS +INF
+	HISTOGRAM['bucket'][bisect.bisect_left(METRIC_BUCKET, SECOND)] += 1
+	HISTOGRAM['count'] += 1
+	HISTOGRAM['sum']   += SECOND
+	HISTOGRAM['max']    = max(HISTOGRAM['max'], SECOND)
+# 3.81 MEASURE STAGE TIME OF WITH BLOCK
+@contextlib.contextmanager
+def MeasureStage(STAGE):
+	START_TIME = time.perf_counter()
+	# 3.81.1 RECORD EVEN IF BLOCK RAISE, FAILED ENCODE STILL COST TIME
+	try:
+		with ProfileScope(STAGE):
+			yield
+	finally:
+		RecordStageTime(STAGE, time.perf_counter() - START_TIME)
+# 3.82 COUNT FILE PER EXTENSION IN RUN METRIC
+def CountExtensionFile(FILE, NAME, VALUE=1):
+	EXTENSION = pathlib.Path(FILE).suffix.lower() or '(none)'
+	# 3.82.1 FOUND, CONVERT, SKIP, ERROR, BYTES READ, AND BYTES WRITTEN PER EXTENSION
+	with RUN_METRIC_LOCK:
+		COUNTER = RUN_METRIC['extension'].setdefault(EXTENSION, {'found': 0, 'convert': 0, 'skip': 0, 'error': 0, 'bytes_read': 0, 'bytes_written': 0})
+		COUNTER[NAME] += VALUE
+# 3.83 MERGE CONVERT CALL COLLECTOR INTO RUN METRIC
+def MergeMetric(METRIC):
+	# 3.83.1 FILTER RESULT WITHOUT COLLECTOR
+	if not METRIC:
+		return
+	# 3.83.2 ADD PROFILE SAMPLE
+	with PROFILE_LOCK:
+		RUN_METRIC['profile'].update(METRIC['profile'])
+	# 3.83.3 ADD BUCKET, COUNT, SUM, AND MAX PER STAGE
+	with RUN_METRIC_LOCK:
+		for STAGE, SOURCE in METRIC['stage'].items():
+			HISTOGRAM = RUN_METRIC['stage'].setdefault(STAGE, {'bucket': [0] * (len(METRIC_BUCKET) + 1), 'count': 0, 'sum': 0.0, 'max': 0.0})
+			HISTOGRAM['bucket'] = [TARGET_COUNT + SOURCE_COUNT for TARGET_COUNT, SOURCE_COUNT in zip(HISTOGRAM['bucket'], SOURCE['bucket'])]
+			HISTOGRAM['count'] += SOURCE['count']
+			HISTOGRAM['sum']   += SOURCE['sum']
+			HISTOGRAM['max']    = max(HISTOGRAM['max'], SOURCE['max'])
+# 3.84 WRITE RUN METRIC AS JSON REPORT AND PROMETHEUS TEXTFILE
+def WriteMetricReport(MODE, START_TIME, RUN_SECOND):
+	# 3.84.1 BUILD REPORT WITH STAGE IN PIPELINE ORDER AND CUMULATIVE BUCKET
+	with RUN_METRIC_LOCK:
+		REPORT = {'version': 1, 'mode': MODE, 'started': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(START_TIME)), 'run_second': round(RUN_SECOND, 3), 'stage': {}, 'extension': {}, 'folder': {}, 'total': {}}
+		for STAGE in sorted(RUN_METRIC['stage'], key=lambda STAGE: METRIC_STAGE.index(STAGE) if STAGE in METRIC_STAGE else len(METRIC_STAGE)):
+			HISTOGRAM = RUN_METRIC['stage'][STAGE]
+			REPORT['stage'][STAGE] = {
+				'count' : HISTOGRAM['count'],
+				'sum'   : round(HISTOGRAM['sum'], 6),
+				'mean'  : round(HISTOGRAM['sum'] / HISTOGRAM['count'], 6) if HISTOGRAM['count'] else 0.0,
+				'max'   : round(HISTOGRAM['max'], 6),
+				'bucket': dict(zip([str(BOUND) for BOUND in METRIC_BUCKET] + ['+Inf'], itertools.accumulate(HISTOGRAM['bucket']))),
+			}
+		for FOLDER_NAME in sorted(RUN_METRIC['folder']):
+			REPORT['folder'][FOLDER_NAME] = dict(RUN_METRIC['folder'][FOLDER_NAME], bytes_saved=RUN_METRIC['folder'][FOLDER_NAME]['bytes_read'] - RUN_METRIC['folder'][FOLDER_NAME]['bytes_written'])
+		for EXTENSION in sorted(RUN_METRIC['extension']):
+			REPORT['extension'][EXTENSION] = dict(RUN_METRIC['extension'][EXTENSION])
+			for NAME, VALUE in RUN_METRIC['extension'][EXTENSION].items():
+				REPORT['total'][NAME] = REPORT['total'].get(NAME, 0) + VALUE
+	# 3.84.2 PRINT FILE AND STAGE TABLE
+	PrintMetricTable(REPORT)
+	# 3.84.3 WRITE JSON REPORT AND PROMETHEUS TEXTFILE ATOMICALLY
+	for OUTPUT_PATH, OUTPUT_TEXT in ((DEFAULT_METRICS_PATH, json.dumps(REPORT, indent=1)), (DEFAULT_METRICS_TEXTFILE, FormatPrometheusMetric(REPORT, START_TIME))):
+		if not OUTPUT_PATH:
+			continue
+		try:
+			with open('%s.tmp' % OUTPUT_PATH, 'w', encoding='utf-8') as OUTPUT_FILE:
+				OUTPUT_FILE.write(OUTPUT_TEXT)
+			os.replace('%s.tmp' % OUTPUT_PATH, OUTPUT_PATH)
+		# 3.84.4 ERROR WRITE REPORT HANDLING
+		except OSError:
+			print("[!] Metric File %s Write Error" % str(OUTPUT_PATH)[-64:])
+	# 3.84.5 WRITE PROFILE IF PROFILE ON
+	if DEFAULT_PROFILE_PATH:
+		with PROFILE_LOCK:
+			PROFILE_SAMPLE = collections.Counter(RUN_METRIC['profile'])
+		WriteProfileReport(PROFILE_SAMPLE)
+# 3.85 FORMAT REPORT IN PROMETHEUS TEXT EXPOSITION FORMAT
+def FormatPrometheusMetric(REPORT, START_TIME):
+	LINE_LIST = [
+		'# HELP usvpfp_stage_seconds Time spent per pipeline stage.',
+		'# TYPE usvpfp_stage_seconds histogram',
+	]
+	# 3.85.1 STAGE HISTOGRAM WITH CUMULATIVE BUCKET
+	for STAGE, HISTOGRAM in REPORT['stage'].items():
+		for BOUND, COUNT in HISTOGRAM['bucket'].items():
+			LINE_LIST.append('usvpfp_stage_seconds_bucket{stage="%s",le="%s"} %d' % (STAGE, BOUND, COUNT))
+		LINE_LIST.append('usvpfp_stage_seconds_sum{stage="%s"} %s' % (STAGE, repr(HISTOGRAM['sum'])))
+		LINE_LIST.append('usvpfp_stage_seconds_count{stage="%s"} %d' % (STAGE, HISTOGRAM['count']))
+	# 3.85.2 FILE AND BYTE COUNTER PER EXTENSION
+	LINE_LIST += ['# HELP usvpfp_files_total Media file per extension and result.', '# TYPE usvpfp_files_total counter']
+	for EXTENSION, COUNTER in REPORT['extension'].items():
+		for NAME in ('found', 'convert', 'skip', 'error'):
+			LINE_LIST.append('usvpfp_files_total{extension="%s",result="%s"} %d' % (EXTENSION, NAME, COUNTER[NAME]))
+	for NAME in ('bytes_read', 'bytes_written'):
+		LINE_LIST += ['# HELP usvpfp_%s_total Media byte %s per extension.' % (NAME, NAME.split('_')[1]), '# TYPE usvpfp_%s_total counter' % NAME]
+		for EXTENSION, COUNTER in REPORT['extension'].items():
+			LINE_LIST.append('usvpfp_%s_total{extension="%s"} %d' % (NAME, EXTENSION, COUNTER[NAME]))
+	# 3.85.3 RUN DURATION AND START TIME
+	LINE_LIST += [
+		'# HELP usvpfp_run_seconds Wall time of last run.', '# TYPE usvpfp_run_seconds gauge', 'usvpfp_run_seconds{mode="%s"} %s' % (REPORT['mode'], repr(REPORT['run_second'])),
+		'# HELP usvpfp_run_start_timestamp_seconds Start time of last run.', '# TYPE usvpfp_run_start_timestamp_seconds gauge', 'usvpfp_run_start_timestamp_seconds{mode="%s"} %d' % (REPORT['mode'], START_TIME),
+	]
+	# 3.85.4 RETURN TEXT WITH TRAILING NEWLINE
+	return '\n'.join(LINE_LIST) + '\n'
+# 3.86 PRINT FILE AND STAGE TABLE
+def PrintMetricTable(REPORT):
+	# 3.86.1 PRINT FILE COUNT PER EXTENSION
+	print("+==========+=========+=========+=========+=========+")
+	print("| FILE     | FOUND   | CONVERT | SKIP    | ERROR   |")
+	print("+----------+---------+---------+---------+---------+")
+	for EXTENSION, COUNTER in list(REPORT['extension'].items()) + [('total', REPORT['total'])]:
+		if EXTENSION == 'total':
+			print("+----------+---------+---------+---------+---------+")
+		print("| %-8s | %-7d | %-7d | %-7d | %-7d |" % (EXTENSION.replace(".", "").upper()[:8], COUNTER.get('found', 0), COUNTER.get('convert', 0), COUNTER.get('skip', 0), COUNTER.get('error', 0)))
+	# 3.86.2 PRINT TIME PER STAGE
+	print("+==========+=========+=========+=========+=========+")
+	print("| STAGE    | COUNT   | TOTAL S | MEAN S  | MAX S   |")
+	print("+----------+---------+---------+---------+---------+")
+	for STAGE, HISTOGRAM in REPORT['stage'].items():
+		print("| %-8s | %-7d | %-7.1f | %-7.3f | %-7.2f |" % (STAGE.upper(), HISTOGRAM['count'], HISTOGRAM['sum'], HISTOGRAM['mean'], HISTOGRAM['max']))
+	print("+==========+=========+=========+=========+=========+")
+	# 3.86.3 PRINT BYTE READ AND WRITTEN
+	BYTE_SAVED = REPORT['total'].get('bytes_read', 0) - REPORT['total'].get('bytes_written', 0)
+	print("[*] Read %.1f MiB, Written %.1f MiB, %s %.1f MiB In %.1f s" % (REPORT['total'].get('bytes_read', 0) / 1048576, REPORT['total'].get('bytes_written', 0) / 1048576, 'Saved' if BYTE_SAVED >= 0 else 'Grew By', abs(BYTE_SAVED) / 1048576, REPORT['run_second']))
+# 3.87 LABEL THREAD STACK FOR PROFILE SAMPLER
+@contextlib.contextmanager
+def ProfileScope(LABEL, SAMPLE=None):
+	# 3.87.1 NOTHING TO DO IF PROFILE OFF
+	if not DEFAULT_PROFILE_PATH:
+		yield
+		return
+	StartProfileSampler()
+	THREAD_IDENT = threading.get_ident()
+	# 3.87.2 REGISTER THREAD ON FIRST SCOPE, SAMPLE GO TO CONVERT CALL COLLECTOR OR RUN METRIC
+	with PROFILE_LOCK:
+		ENTRY = PROFILE_THREAD.get(THREAD_IDENT)
+		if ENTRY is None:
+			ENTRY = PROFILE_THREAD[THREAD_IDENT] = {'label': [], 'sample': SAMPLE if SAMPLE is not None else RUN_METRIC['profile']}
+		ENTRY['label'].append(LABEL)
+	try:
+		yield
+	# 3.87.3 UNREGISTER THREAD WHEN OUTER SCOPE EXIT, NO SAMPLE AFTER COLLECTOR LEAVE WORKER
+	finally:
+		with PROFILE_LOCK:
+			ENTRY['label'].pop()
+			if not ENTRY['label']:
+				del PROFILE_THREAD[THREAD_IDENT]
+# 3.88 START PROFILE SAMPLER ONCE PER PROCESS
+def StartProfileSampler():
+	global PROFILE_SAMPLER_PID
+	# 3.88.1 PHOTO WORKER PROCESS START ITS OWN SAMPLER ON FIRST CONVERT CALL
+	with PROFILE_LOCK:
+		if PROFILE_SAMPLER_PID == os.getpid():
+			return
+		PROFILE_SAMPLER_PID = os.getpid()
+	threading.Thread(target=RunProfileSampler, name='usvpfp-profile', daemon=True).start()
+# 3.89 SAMPLE STACK OF LABELED THREAD
+def RunProfileSampler():
+	# 3.89.1 LOOPING UNTIL PROCESS EXIT
+	while True:
+		time.sleep(DEFAULT_PROFILE_INTERVAL)
+		FRAME_MAP = sys._current_frames()
+		# 3.89.2 COUNT ONE SAMPLE PER LABELED THREAD, PILLOW AND ZLIB C CODE SHOW AS CALLING PYTHON FRAME
+		with PROFILE_LOCK:
+			for THREAD_IDENT, ENTRY in PROFILE_THREAD.items():
+				FRAME = FRAME_MAP.get(THREAD_IDENT)
+				if FRAME is not None:
+					ENTRY['sample'][(tuple(ENTRY['label']), GetProfileStack(FRAME))] += 1
+# 3.90 BUILD STACK FROM PROFILE ROOT TO CURRENT FRAME
+def GetProfileStack(FRAME):
+	STACK = []
+	# 3.90.1 WALK TO CALLER, STOP AT CONVERT CALL OR MAIN TO DROP POOL AND THREAD BOOTSTRAP FRAME
+	while FRAME is not None:
+		STACK.append('%s (%s)' % (FRAME.f_code.co_name, os.path.basename(FRAME.f_code.co_filename)))
+		if FRAME.f_code.co_name in PROFILE_ROOT:
+			break
+		FRAME = FRAME.f_back
+	# 3.90.2 RETURN ROOT FIRST
+	return tuple(reversed(STACK))
+# 3.91 RESET PROFILE SAMPLER IN FORKED CHILD
+def ResetProfileSampler():
+	global PROFILE_LOCK, PROFILE_THREAD, PROFILE_SAMPLER_PID
+	# 3.91.1 LOCK MAY BE HELD BY PARENT SAMPLER AT FORK, THREAD NOT COPIED TO CHILD
+	PROFILE_LOCK, PROFILE_THREAD, PROFILE_SAMPLER_PID = threading.Lock(), {}, None
+# 3.92 WRITE COLLAPSED STACK FILE AND PRINT PROFILE TABLE
+def WriteProfileReport(SAMPLE):
+	# 3.92.1 WRITE ONE LINE PER STACK FOR FLAMEGRAPH.PL, SPEEDSCOPE, OR INFERNO
+	try:
+		with open('%s.tmp' % DEFAULT_PROFILE_PATH, 'w', encoding='utf-8') as PROFILE_FILE:
+			for (LABEL, STACK), COUNT in sorted(SAMPLE.items()):
+				PROFILE_FILE.write('%s %d\n' % (';'.join(LABEL + STACK), COUNT))
+		os.replace('%s.tmp' % DEFAULT_PROFILE_PATH, DEFAULT_PROFILE_PATH)
+	# 3.92.2 ERROR WRITE PROFILE HANDLING
+	except OSError:
+		print("[!] Profile File %s Write Error" % str(DEFAULT_PROFILE_PATH)[-64:])
+	# 3.92.3 SUM SAMPLE PER LABEL, PHOTO LABEL GIVE DECODE, RESIZE, AND ENCODE PER FORMAT
+	LABEL_COUNT, LEAF_COUNT = collections.Counter(), collections.Counter()
+	for (LABEL, STACK), COUNT in SAMPLE.items():
+		LABEL_COUNT[' / '.join(LABEL)] += COUNT
+		LEAF_COUNT[STACK[-1]] += COUNT
+	SAMPLE_COUNT = sum(LABEL_COUNT.values()) or 1
+	# 3.92.4 PRINT TIME PER LABEL AND HOTTEST FUNCTION
+	for TITLE, COUNTER, LIMIT in (('PROFILE LABEL', LABEL_COUNT, None), ('HOT FUNCTION', LEAF_COUNT, 10)):
+		print("+==================================+=========+=========+========+")
+		print("| %-32s | SAMPLE  | TIME S  | SHARE  |" % TITLE)
+		print("+----------------------------------+---------+---------+--------+")
+		for NAME, COUNT in COUNTER.most_common(LIMIT):
+			print("| %-32s | %-7d | %-7.2f | %5.1f%% |" % (NAME[:32], COUNT, COUNT * DEFAULT_PROFILE_INTERVAL, COUNT * 100 / SAMPLE_COUNT))
+	print("+==================================+=========+=========+========+")
+	print("[*] Profile Written To %s" % str(DEFAULT_PROFILE_PATH)[-64:])
+# 3.93 SEND COMMITTED PNG TO BACKGROUND OPTIMIZER POOL
+def SubmitPngOptimize(SOURCE_FILE, OUTPUT_PATH):
+	with PNG_OPTIMIZER_LOCK:
+		# 3.93.1 START POOL ON FIRST PNG, OPTIMIZER IS SUBPROCESS SO THREAD IS ENOUGH
+		if PNG_OPTIMIZER['pool'] is None:
+			PNG_OPTIMIZER.update({'pool': concurrent.futures.ThreadPoolExecutor(max_workers=DEFAULT_PNG_OPTIMIZER_WORKER), 'count': 0, 'saved': 0})
+		# 3.93.2 SUBMIT WITHOUT WAIT, NEXT FOLDER CONVERT WHILE OPTIMIZER RUN
+		PNG_OPTIMIZER['pool'].submit(OptimizePngFile, SOURCE_FILE, OUTPUT_PATH)
+# 3.94 RUN EXTERNAL PNG OPTIMIZER, KEEP RESULT ONLY IF SMALLER
+def OptimizePngFile(SOURCE_FILE, OUTPUT_PATH):
+	TEMP_PATH = OUTPUT_PATH.parent / ('TEMP_OUTPUT_OPTIMIZE_%s.png' % uuid.uuid4().hex)
+	COMMAND   = [PART.format(input=OUTPUT_PATH, output=TEMP_PATH) for PART in PNG_OPTIMIZER_COMMAND[DEFAULT_PNG_OPTIMIZER]]
+	try:
+		# 3.94.1 OPTIMIZE INTO TEMPORARY FILE, OUTPUT STAY VALID IF OPTIMIZER KILLED
+		FILE_STAT = os.stat(OUTPUT_PATH)
+		with MeasureStage('optimize'):
+			subprocess.run(COMMAND, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True, timeout=DEFAULT_PNG_OPTIMIZER_TIMEOUT or None)
+		# 3.94.2 FILTER NOT SMALLER RESULT AND OUTPUT CHANGED WHILE OPTIMIZE
+		SAVED_SIZE = FILE_STAT.st_size - os.path.getsize(TEMP_PATH)
+		CURRENT_STAT = os.stat(OUTPUT_PATH)
+		if SAVED_SIZE <= 0 or (CURRENT_STAT.st_size, CURRENT_STAT.st_mtime_ns) != (FILE_STAT.st_size, FILE_STAT.st_mtime_ns):
+			return
+		# 3.94.3 REPLACE OUTPUT ATOMICALLY AND COUNT SAVED BYTE
+		os.replace(TEMP_PATH, OUTPUT_PATH)
+		CountExtensionFile(SOURCE_FILE, 'bytes_written', -SAVED_SIZE)
+		CountFolderByte(OUTPUT_PATH.parent, 'bytes_written', -SAVED_SIZE)
+		with PNG_OPTIMIZER_LOCK:
+			PNG_OPTIMIZER['count'] += 1
+			PNG_OPTIMIZER['saved'] += SAVED_SIZE
+	# 3.94.4 ERROR OPTIMIZER MISSING, FAILED, OR TIMEOUT HANDLING, OUTPUT KEEP PILLOW ENCODE
+	except (OSError, subprocess.SubprocessError):
+		print("[!] File %s PNG Optimizer Error" % OUTPUT_PATH.name[-64:])
+	# 3.94.5 REMOVE TEMPORARY FILE LEFT BY FAILED OR NOT SMALLER OPTIMIZE
+	finally:
+		RemoveFileSafely(TEMP_PATH, QUIET=True)
+# 3.95 WAIT OR CANCEL BACKGROUND PNG OPTIMIZER
+def StopPngOptimizer(CANCEL=False):
+	with PNG_OPTIMIZER_LOCK:
+		POOL = PNG_OPTIMIZER['pool']
+		PNG_OPTIMIZER['pool'] = None
+	# 3.95.1 FILTER OPTIMIZER NOT STARTED
+	if POOL is None:
+		return
+	# 3.95.2 CANCEL PENDING FILE ON INTERRUPT, RUNNING OPTIMIZER GET SAME SIGNAL
+	if CANCEL:
+		POOL.shutdown(wait=False, cancel_futures=True)
+		return
+	# 3.95.3 WAIT ALL OPTIMIZE AND PRINT SAVED BYTE
+	print("[*] Wait PNG Optimizer")
+	POOL.shutdown(wait=True)
+	print("[*] PNG Optimizer Saved %.1f MiB On %d File" % (PNG_OPTIMIZER['saved'] / 1048576, PNG_OPTIMIZER['count']))
+# 3.96 GET OUTPUT EXTENSION OF CATEGORY, PHOTO FOLLOW CHOSEN OUTPUT FORMAT
+def GetOutputFormat(CATEGORY):
+	# 3.96.1 RETURN PHOTO OUTPUT EXTENSION FROM SETTING, OTHER CATEGORY FIXED
+	if CATEGORY == 'photo':
+		return PHOTO_OUTPUT_FORMAT[DEFAULT_PHOTO_OUTPUT]
+	return OUTPUT_FORMAT[CATEGORY]
+# 3.97 GET PILLOW FORMAT AND ENCODE OPTION OF OUTPUT PATH
+def GetPhotoEncodeOption(OUTPUT_PATH):
+	# 3.97.1 GET PILLOW FORMAT FROM STATIC TABLE, PLUGIN REGISTRY ONLY FOR UNKNOWN EXTENSION
+	OUTPUT_SUFFIX = pathlib.Path(OUTPUT_PATH).suffix.lower()
+	IMAGE_FORMAT  = PHOTO_OUTPUT_IMAGE_FORMAT.get(OUTPUT_SUFFIX) or Image.registered_extensions()[OUTPUT_SUFFIX]
+	# 3.97.2 PNG WITH CHOSEN ZLIB PROFILE
+	if IMAGE_FORMAT == 'PNG':
+		return IMAGE_FORMAT, PNG_ENCODE_PROFILE[DEFAULT_PNG_PROFILE]
+	# 3.97.3 WEBP LOSSLESS OR QUALITY N, QUALITY IS COMPRESSION EFFORT ON LOSSLESS
+	if IMAGE_FORMAT == 'WEBP' and DEFAULT_PHOTO_OUTPUT == 'webp-lossless':
+		return IMAGE_FORMAT, {'lossless': True, 'quality': 80, 'method': 4}
+	if IMAGE_FORMAT == 'WEBP':
+		return IMAGE_FORMAT, {'quality': DEFAULT_PHOTO_QUALITY, 'method': 4}
+	# 3.97.4 AVIF QUALITY N, ONE ENCODER THREAD PER PHOTO PROCESS, POOL ALREADY USE EVERY CORE
+	if IMAGE_FORMAT == 'AVIF':
+		return IMAGE_FORMAT, {'quality': DEFAULT_PHOTO_QUALITY, 'speed': 6, 'max_threads': 1}
+	# 3.97.5 RETURN OTHER FORMAT WITH PILLOW DEFAULT
+	return IMAGE_FORMAT, {}
+# 3.98 COUNT BYTE READ AND WRITTEN PER FOLDER IN RUN METRIC
+def CountFolderByte(FOLDER_NAME, NAME, VALUE):
+	with RUN_METRIC_LOCK:
+		COUNTER = RUN_METRIC['folder'].setdefault(os.path.abspath(FOLDER_NAME), {'bytes_read': 0, 'bytes_written': 0})
+		COUNTER[NAME] += VALUE
+# 3.99 READ DELAY OF LAST GIF FRAME FROM BLOCK STRUCTURE WITHOUT DECODE
+def ReadGifLastDelay(INPUT_PATH):
+	LAST_DELAY = None
+	try:
+		with open(INPUT_PATH, 'rb') as INPUT_FILE:
+			# 3.99.1 FILTER NON GIF AND SKIP GLOBAL COLOR TABLE
+			HEADER = INPUT_FILE.read(13)
+			if len(HEADER) < 13 or HEADER[:6] not in (b'GIF87a', b'GIF89a'):
+				return None
+			if HEADER[10] & 0x80:
+				INPUT_FILE.seek(3 << ((HEADER[10] & 0x07) + 1), os.SEEK_CUR)
+			# 3.99.2 LOOPING PER BLOCK UNTIL TRAILER
+			while True:
+				INTRODUCER = INPUT_FILE.read(1)
+				# 3.99.3 EXTENSION BLOCK, GRAPHIC CONTROL EXTENSION HOLD DELAY OF NEXT FRAME IN CENTISECOND
+				if INTRODUCER == b'\x21':
+					LABEL = INPUT_FILE.read(1)
+					SIZE  = INPUT_FILE.read(1)
+					if not SIZE:
+						break
+					BLOCK = INPUT_FILE.read(SIZE[0])
+					if LABEL == b'\xf9' and len(BLOCK) >= 3:
+						LAST_DELAY = struct.unpack('<H', BLOCK[1:3])[0]
+					if SIZE[0]:
+						SkipGifSubBlock(INPUT_FILE)
+				# 3.99.4 IMAGE BLOCK, SKIP LOCAL COLOR TABLE AND LZW DATA
+				elif INTRODUCER == b'\x2c':
+					DESCRIPTOR = INPUT_FILE.read(9)
+					if len(DESCRIPTOR) < 9:
+						break
+					if DESCRIPTOR[8] & 0x80:
+						INPUT_FILE.seek(3 << ((DESCRIPTOR[8] & 0x07) + 1), os.SEEK_CUR)
+					INPUT_FILE.read(1)
+					SkipGifSubBlock(INPUT_FILE)
+				# 3.99.5 TRAILER, TRUNCATED, OR BROKEN FILE
 				else:
-					# 3.4.118 CONVERT VIDEO FILE
-					CONVERTION_RESULT = ConvertVideoWithFFMPEG(FILE, OUTPUT_PATH)
-					# 3.4.119 CONVERTION RESULT SUCCESS
-					if CONVERTION_RESULT == 1:
-						# 3.4.120 REMOVE ORIGINAL FILE
-						try:
-							os.remove(FILE)
-						# 3.4.121 ERROR PERMISSION DENIED HANDLING
-						except PermissionError:
-							print("[!] File %s Permission Denied Error" % FILE.name[-64:])
-							continue
-						# 3.4.122 ERROR FILE NOT FOUND HANDLING
-						except FileNotFoundError:
-							print("[!] File %s File Not Found Error" % FILE.name[-64:])
-							continue
-						# 3.4.123 PRINT SUCCESS VIDEO FILE
-						print(" + [+] %s --- %s" % (FILE.name[-64:], OUTPUT_PATH.name[-64:]))
-						# 3.4.124 ADD VIDEO COUNT	
-						VIDEO_COUNT += 1
-					# 3.4.125 CONVERTION RESULT SKIP
-					elif CONVERTION_RESULT == 2:
-						# 3.4.126 RENAME FILE SKIP
-						try:
-							os.rename(FILE, OUTPUT_PATH)
-						# 3.4.127 ERROR PERMISSION DENIED HANDLING
-						except PermissionError:
-							print("[!] File %s Permission Denied Error" % FILE.name[-64:])
-							continue
-						# 3.4.128 ERROR FILE NOT FOUND HANDLING
-						except FileNotFoundError:
-							print("[!] File %s File Not Found Error" % FILE.name[-64:])
-							continue
-						
-						# 3.4.129 PRINT SKIP VIDEO FILE
-						print(" + [+] %s >>> %s" % (FILE.name[-64:], OUTPUT_PATH.name[-64:]))
-						# 3.4.130 ADD VIDEO COUNT
-						VIDEO_COUNT += 1
-					# 3.4.131 CONVERTION RESULT ERROR
-					else:
-						# 3.4.132 PRINT ERROR VIDEO FILE
-						print(" + [+] %s XXX %s" % (FILE.name[-64:], FILE.name[-64:]))
-# 4 MAIN PROGRAM
-# 4.1 MAIN PROGRAM FUNCTION
+					break
+	# 3.99.6 ERROR READ FILE HANDLING
+	except OSError:
+		return None
+	# 3.99.7 RETURN LAST DELAY, NONE IF NO GRAPHIC CONTROL EXTENSION
+	return LAST_DELAY
+# 3.100 SKIP GIF DATA SUB BLOCK UNTIL BLOCK TERMINATOR
+def SkipGifSubBlock(INPUT_FILE):
+	# 3.100.1 LOOPING PER SUB BLOCK, SIZE BYTE 0 END BLOCK
+	while True:
+		SIZE = INPUT_FILE.read(1)
+		if not SIZE or SIZE == b'\x00':
+			return
+		INPUT_FILE.seek(SIZE[0], os.SEEK_CUR)
+# 3.101 REMOVE TEMPORARY OUTPUT LEFT BY DEAD RUN WITHOUT USABLE JOURNAL RECORD
+def RemoveOrphanTempOutput(FOLDER_NAME, KEEP_NAME_SET):
+	# 3.101.1 LIST TEMPORARY OUTPUT IN FOLDER
+	try:
+		with os.scandir(FOLDER_NAME) as ENTRY_LIST:
+			ORPHAN_NAME_LIST = [ENTRY.name for ENTRY in ENTRY_LIST if ENTRY.name.startswith('TEMP_OUTPUT_') and ENTRY.name not in KEEP_NAME_SET and ENTRY.is_file(follow_symlinks=False)]
+	# 3.101.2 ERROR FOLDER DISAPPEARED OR PERMISSION DENIED HANDLING
+	except OSError:
+		return
+	# 3.101.3 LOOPING REMOVE PER ORPHAN, JOB OF THIS FOLDER ALREADY FINISHED SO NOTHING ELSE WRITE IT
+	for NAME in ORPHAN_NAME_LIST:
+		if RemoveFileSafely(pathlib.Path(FOLDER_NAME, NAME), QUIET=True):
+			print("[*] Recover XXX %s" % NAME[-64:])
+# 4 BENCHMARK
+# 4.1 MEASURE PEAK MEMORY OF CURRENT PROCESS
+def GetPeakMemoryMegabyte():
+	# 4.1.1 FILTER NO RESOURCE MODULE ON WINDOWS
+	if resource is None:
+		return float('nan')
+	# 4.1.2 GET MAXIMUM RESIDENT SET SIZE
+	PEAK_MEMORY = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+	# 4.1.3 MACOS REPORT BYTE, LINUX REPORT KILOBYTE
+	if sys.platform == 'darwin':
+		return PEAK_MEMORY / 1048576
+	return PEAK_MEMORY / 1024
+# 4.2 RUN BENCHMARK FUNCTION IN FRESH PROCESS
+def RunInFreshProcess(FUNCTION, SETTING, *ARGUMENT):
+	# 4.2.1 ONE WORKER PROCESS PER MEASUREMENT SO PEAK MEMORY IS NOT SHARED
+	with concurrent.futures.ProcessPoolExecutor(max_workers=1, initializer=ApplyProgramSetting, initargs=(SETTING,)) as BENCHMARK_POOL:
+		return BENCHMARK_POOL.submit(FUNCTION, *ARGUMENT).result()
+# 4.3 MAKE SYNTHETIC JPEG PHOTO
+def MakeSyntheticPhoto(OUTPUT_PATH, WIDTH, HEIGHT, SEED=0):
+	# 4.3.1 DETERMINISTIC NOISE, GRADIENT, AND FRACTAL CHANNEL
+	NOISE_CHANNEL    = Image.frombytes('L', (WIDTH, HEIGHT), random.Random(SEED).randbytes(WIDTH * HEIGHT))
+	GRADIENT_CHANNEL = Image.linear_gradient('L').resize((WIDTH, HEIGHT))
+	MANDEL_CHANNEL   = Image.effect_mandelbrot((WIDTH, HEIGHT), (-2.0 + SEED * 0.01, -1.2, 0.6, 1.2), 64)
+	# 4.3.2 SAVE MERGED CHANNEL AS PHOTO
+	Image.merge('RGB', (NOISE_CHANNEL, GRADIENT_CHANNEL, MANDEL_CHANNEL)).save(OUTPUT_PATH, quality=90)
+# 4.4 PHOTO DECODE BENCHMARK WORKER
+def BenchmarkPhotoDecodeWorker(INPUT_PATH_LIST, OUTPUT_FOLDER):
+	TIME_LIST = []
+	# 4.4.1 LOOPING PER SYNTHETIC PHOTO
+	for INPUT_PATH in INPUT_PATH_LIST:
+		START_TIME = time.perf_counter()
+		ConvertPhotoWithPillow(INPUT_PATH, OUTPUT_FOLDER / ('%s.png' % INPUT_PATH.stem))
+		TIME_LIST.append(time.perf_counter() - START_TIME)
+	# 4.4.2 RETURN PER IMAGE TIME AND PEAK MEMORY
+	return TIME_LIST, GetPeakMemoryMegabyte()
+# 4.5 PHOTO DECODE BENCHMARK
+def BenchmarkPhotoDecodeMode(MEGAPIXEL_LIST=(24, 48), IMAGE_COUNT=3):
+	with tempfile.TemporaryDirectory(prefix='usvpfp-benchmark-') as BENCHMARK_FOLDER:
+		BENCHMARK_FOLDER = pathlib.Path(BENCHMARK_FOLDER)
+		# 4.5.1 LOOPING PER PHOTO SIZE
+		for MEGAPIXEL in MEGAPIXEL_LIST:
+			# 4.5.2 MAKE 4:3 SYNTHETIC JPEG PHOTO
+			HEIGHT          = int((MEGAPIXEL * 1000000 * 3 / 4) ** 0.5)
+			WIDTH           = HEIGHT * 4 // 3
+			INPUT_PATH_LIST = []
+			for INDEX in range(IMAGE_COUNT):
+				INPUT_PATH_LIST.append(BENCHMARK_FOLDER / ('%sMP_%s.jpg' % (MEGAPIXEL, INDEX)))
+				MakeSyntheticPhoto(INPUT_PATH_LIST[-1], WIDTH, HEIGHT, INDEX)
+			# 4.5.3 LOOPING PER DECODE MODE IN FRESH PROCESS
+			for PHOTO_MODE in PHOTO_DECODE_MODE:
+				SETTING = dict(GetProgramSetting(), DEFAULT_PHOTO_DECODE_MODE=PHOTO_MODE)
+				TIME_LIST, PEAK_MEMORY = RunInFreshProcess(BenchmarkPhotoDecodeWorker, SETTING, INPUT_PATH_LIST, BENCHMARK_FOLDER)
+				# 4.5.4 PRINT BENCHMARK RESULT
+				print("[*] %-7s %2sMP %dx%d : %.3f s/image (min %.3f), peak %.1f MiB" % (PHOTO_MODE, MEGAPIXEL, WIDTH, HEIGHT, sum(TIME_LIST) / len(TIME_LIST), min(TIME_LIST), PEAK_MEMORY))
+# 4.6 MAKE SYNTHETIC ANIMATED GIF FRAME BY FRAME
+def MakeSyntheticGif(OUTPUT_PATH, WIDTH, HEIGHT, FRAME_COUNT):
+	# 4.6.1 DETERMINISTIC BASE FRAME
+	BASE_FRAME = Image.merge('RGB', (
+		Image.linear_gradient('L').resize((WIDTH, HEIGHT)),
+		Image.radial_gradient('L').resize((WIDTH, HEIGHT)),
+		Image.linear_gradient('L').rotate(90).resize((WIDTH, HEIGHT)),
+	)).convert('RGBA')
+	# 4.6.2 WRITE SHIFTED FRAME WITHOUT HOLDING FRAME LIST
+	with open(OUTPUT_PATH, 'wb') as OUTPUT_FILE:
+		for FRAME_INDEX in range(FRAME_COUNT):
+			FRAME = ImageChops.offset(BASE_FRAME, FRAME_INDEX * 7, FRAME_INDEX * 3)
+			if FRAME_INDEX == 0:
+				WriteGifHeader(OUTPUT_FILE, FRAME, 0)
+			WriteGifFrame(OUTPUT_FILE, FRAME, 40 + FRAME_INDEX % 3 * 10, 1)
+		OUTPUT_FILE.write(b';')
+# 4.7 GIF BACKEND BENCHMARK WORKER
+def BenchmarkGifBackendWorker(INPUT_PATH, OUTPUT_PATH):
+	START_TIME = time.perf_counter()
+	# 4.7.1 CONVERT ANIMATED GIF
+	CONVERTION_RESULT = ConvertPhotoWithPillow(INPUT_PATH, OUTPUT_PATH)
+	# 4.7.2 RETURN TIME, PEAK MEMORY, AND OUTPUT SIZE
+	return CONVERTION_RESULT, time.perf_counter() - START_TIME, GetPeakMemoryMegabyte(), os.path.getsize(OUTPUT_PATH) if CONVERTION_RESULT == 1 else 0
+# 4.8 GIF BACKEND BENCHMARK
+def BenchmarkGifBackend(WIDTH=2560, HEIGHT=1440, FRAME_COUNT=120):
+	with tempfile.TemporaryDirectory(prefix='usvpfp-benchmark-') as BENCHMARK_FOLDER:
+		BENCHMARK_FOLDER = pathlib.Path(BENCHMARK_FOLDER)
+		INPUT_PATH       = BENCHMARK_FOLDER / 'input.gif'
+		# 4.8.1 MAKE SYNTHETIC ANIMATED GIF
+		MakeSyntheticGif(INPUT_PATH, WIDTH, HEIGHT, FRAME_COUNT)
+		SOURCE_DELAY = ReadGifLastDelay(INPUT_PATH)
+		print("[*] Input %dx%d, %d frame, %.1f MiB, last frame delay %s cs" % (WIDTH, HEIGHT, FRAME_COUNT, os.path.getsize(INPUT_PATH) / 1048576, SOURCE_DELAY))
+		# 4.8.2 LOOPING PER GIF BACKEND IN FRESH PROCESS
+		for GIF_BACKEND in GIF_RESIZE_BACKEND[1:]:
+			# 4.8.3 FILTER FFMPEG NOT INSTALLED
+			if GIF_BACKEND == 'ffmpeg' and not shutil.which('ffmpeg'):
+				print("[!] %-7s : FFMPEG Not Found" % GIF_BACKEND)
+				continue
+			SETTING = dict(GetProgramSetting(), DEFAULT_GIF_BACKEND=GIF_BACKEND)
+			CONVERTION_RESULT, ELAPSED_TIME, PEAK_MEMORY, OUTPUT_SIZE = RunInFreshProcess(BenchmarkGifBackendWorker, SETTING, INPUT_PATH, BENCHMARK_FOLDER / ('%s.gif' % GIF_BACKEND))
+			# 4.8.4 PRINT BENCHMARK RESULT
+			if CONVERTION_RESULT != 1:
+				print("[!] %-7s : Convertion Error" % GIF_BACKEND)
+				continue
+			print("[*] %-7s : %.2f s, %.1f frame/s, peak %.1f MiB, output %.1f MiB" % (GIF_BACKEND, ELAPSED_TIME, FRAME_COUNT / ELAPSED_TIME, PEAK_MEMORY, OUTPUT_SIZE / 1048576))
+			# 4.8.5 CHECK LAST FRAME DELAY KEPT
+			OUTPUT_DELAY = ReadGifLastDelay(BENCHMARK_FOLDER / ('%s.gif' % GIF_BACKEND))
+			if OUTPUT_DELAY != SOURCE_DELAY:
+				print("[!] %-7s : Last Frame Delay %s cs, Source %s cs" % (GIF_BACKEND, OUTPUT_DELAY, SOURCE_DELAY))
+# 4.9 MAKE SYNTHETIC TESTSRC2 VIDEO
+def MakeSyntheticVideo(OUTPUT_PATH, WIDTH, HEIGHT, DURATION, FRAME_RATE=30):
+	# 4.9.1 NEAR LOSSLESS SOURCE SO QUALITY METRIC MEASURE ONLY THE PROFILE
+	VIDEO_STREAM = ffmpeg.input('testsrc2=size=%dx%d:rate=%d:duration=%s' % (WIDTH, HEIGHT, FRAME_RATE, DURATION), f='lavfi')
+	AUDIO_STREAM = ffmpeg.input('sine=frequency=440:sample_rate=48000:duration=%s' % DURATION, f='lavfi')
+	(
+		ffmpeg
+		.output(VIDEO_STREAM, AUDIO_STREAM, str(OUTPUT_PATH), vcodec='libx264', crf=0, preset='ultrafast', pix_fmt='yuv420p', acodec='aac')
+		.run(overwrite_output=True, quiet=True)
+	)
+# 4.10 MEASURE SSIM AND PSNR AGAINST SCALED SOURCE
+def MeasureVideoQuality(OUTPUT_PATH, SOURCE_PATH, WIDTH, HEIGHT):
+	QUALITY = {}
+	# 4.10.1 LOOPING PER METRIC FILTER
+	for METRIC, PATTERN in (('ssim', r'All:([\d.]+)'), ('psnr', r'average:([\d.]+|inf)')):
+		REFERENCE_STREAM = ffmpeg.input(str(SOURCE_PATH)).video.filter('scale', WIDTH, HEIGHT, flags='lanczos')
+		# 4.10.2 COMPARE OUTPUT WITH REFERENCE, DISCARD VIDEO
+		STANDARD_ERROR = (
+			ffmpeg
+			.filter([ffmpeg.input(str(OUTPUT_PATH)).video, REFERENCE_STREAM], METRIC)
+			.output('-', format='null')
+			.run(capture_stdout=True, capture_stderr=True)
+		)[1].decode('utf-8', 'replace')
+		# 4.10.3 PARSE SUMMARY LINE
+		MATCH = re.findall(PATTERN, STANDARD_ERROR)
+		QUALITY[METRIC] = float(MATCH[-1]) if MATCH else None
+	# 4.10.4 RETURN QUALITY METRIC
+	return QUALITY
+# 4.11 VIDEO PROFILE BENCHMARK
+def BenchmarkVideoProfile(WIDTH=1920, HEIGHT=1080, DURATION=10, FRAME_RATE=30):
+	ORIGINAL_PROFILE = DEFAULT_VIDEO_PROFILE
+	with tempfile.TemporaryDirectory(prefix='usvpfp-benchmark-') as BENCHMARK_FOLDER:
+		BENCHMARK_FOLDER = pathlib.Path(BENCHMARK_FOLDER)
+		SOURCE_PATH      = BENCHMARK_FOLDER / 'source.mkv'
+		# 4.11.1 MAKE SYNTHETIC SOURCE VIDEO
+		try:
+			MakeSyntheticVideo(SOURCE_PATH, WIDTH, HEIGHT, DURATION, FRAME_RATE)
+		except (ffmpeg.Error, FileNotFoundError):
+			print("[!] FFMPEG Not Found Or Without lavfi And libx264")
+			return
+		PROBE_INFO = ProbeVideoWithFFMPEG(SOURCE_PATH)
+		print("[*] Input testsrc2 %dx%d, %d s, %d fps" % (WIDTH, HEIGHT, DURATION, FRAME_RATE))
+		try:
+			# 4.11.2 LOOPING PER ENCODE PROFILE
+			for VIDEO_PROFILE in VIDEO_ENCODE_PROFILE:
+				ApplyProgramSetting({'DEFAULT_VIDEO_PROFILE': VIDEO_PROFILE})
+				OUTPUT_PATH = BENCHMARK_FOLDER / ('%s.mp4' % VIDEO_PROFILE)
+				START_TIME  = time.perf_counter()
+				# 4.11.3 ENCODE WITH SAME PATH AS NORMAL RUN
+				if ConvertVideoWithFFMPEG(SOURCE_PATH, OUTPUT_PATH, PROBE_INFO) != 1:
+					print("[!] %-8s : Convertion Error" % VIDEO_PROFILE)
+					continue
+				ELAPSED_TIME = time.perf_counter() - START_TIME
+				# 4.11.4 MEASURE BITRATE AND QUALITY
+				OUTPUT_INFO = ProbeVideoWithFFMPEG(OUTPUT_PATH)
+				QUALITY     = MeasureVideoQuality(OUTPUT_PATH, SOURCE_PATH, OUTPUT_INFO['width'], OUTPUT_INFO['height'])
+				BITRATE     = os.path.getsize(OUTPUT_PATH) * 8 / 1000 / DURATION
+				# 4.11.5 PRINT BENCHMARK RESULT
+				print("[*] %-8s : %6.1f fps, %7.0f kbit/s, SSIM %.4f, PSNR %.2f dB" % (VIDEO_PROFILE, DURATION * FRAME_RATE / ELAPSED_TIME, BITRATE, QUALITY['ssim'] or float('nan'), QUALITY['psnr'] or float('nan')))
+		# 4.11.6 RESTORE PROFILE SETTING AND STOP FFMPEG RUNNER
+		finally:
+			ApplyProgramSetting({'DEFAULT_VIDEO_PROFILE': ORIGINAL_PROFILE})
+			StopFFMPEGRunner()
+# 4.12 PROBE FILE LIST WITH CURRENT PROBE SETTING
+def BenchmarkVideoProbeWorker(PATH_LIST, PROBE_POOL=None):
+	PROBE_MEMO.clear()
+	START_TIME = time.perf_counter()
+	# 4.12.1 PROBE ONE BY ONE OR THROUGH PROBE POOL
+	if PROBE_POOL is None:
+		PROBE_LIST = [ProbeVideoWithFFMPEG(PATH) for PATH in PATH_LIST]
+	else:
+		PROBE_LIST = list(PROBE_POOL.map(ProbeVideoWithFFMPEG, PATH_LIST))
+	# 4.12.2 RETURN TIME AND FAILED PROBE COUNT
+	return time.perf_counter() - START_TIME, PROBE_LIST.count(None)
+# 4.13 VIDEO PROBE BENCHMARK
+def BenchmarkVideoProbe(FILE_COUNT=500):
+	ORIGINAL_SETTING = {'DEFAULT_PROBE_WITH_PYAV': DEFAULT_PROBE_WITH_PYAV}
+	with tempfile.TemporaryDirectory(prefix='usvpfp-benchmark-') as BENCHMARK_FOLDER:
+		BENCHMARK_FOLDER = pathlib.Path(BENCHMARK_FOLDER)
+		SOURCE_PATH      = BENCHMARK_FOLDER / 'source.mkv'
+		# 4.13.1 MAKE SHORT CLIP AND COPY IT AS MANY FILE
+		try:
+			MakeSyntheticVideo(SOURCE_PATH, 640, 360, 1)
+		except (ffmpeg.Error, FileNotFoundError):
+			print("[!] FFMPEG Not Found Or Without lavfi And libx264")
+			return
+		PATH_LIST = []
+		for INDEX in range(FILE_COUNT):
+			PATH_LIST.append(BENCHMARK_FOLDER / ('clip-%05d.mkv' % INDEX))
+			shutil.copyfile(SOURCE_PATH, PATH_LIST[-1])
+		print("[*] Input %d short clip, %d probe worker" % (FILE_COUNT, DEFAULT_PROBE_WORKER_COUNT))
+		# 4.13.2 LOOPING PER PROBE BACKEND, KEEP PER FILE TIME FOR POOL SPEEDUP
+		SERIAL_TIME = {}
+		try:
+			with concurrent.futures.ThreadPoolExecutor(max_workers=DEFAULT_PROBE_WORKER_COUNT) as PROBE_POOL:
+				for PROBE_NAME, PROBE_WITH_PYAV, POOL in (('ffprobe spawn per file', False, None), ('ffprobe batch pool', False, PROBE_POOL), ('pyav per file', True, None), ('pyav batch pool', True, PROBE_POOL)):
+					# 4.13.3 FILTER PYAV NOT INSTALLED
+					if PROBE_WITH_PYAV and av is None:
+						print("[!] %-22s : PyAV Not Found, try \"pip install av\"" % PROBE_NAME)
+						continue
+					ApplyProgramSetting({'DEFAULT_PROBE_WITH_PYAV': PROBE_WITH_PYAV})
+					ELAPSED_TIME, FAILED_COUNT = BenchmarkVideoProbeWorker(PATH_LIST, POOL)
+					# 4.13.4 PRINT BENCHMARK RESULT
+					SERIAL_TIME.setdefault(PROBE_WITH_PYAV, ELAPSED_TIME)
+					print("[*] %-22s : %.2f s, %.1f ms/file, %.2fx per file, %d failed" % (PROBE_NAME, ELAPSED_TIME, ELAPSED_TIME * 1000 / FILE_COUNT, SERIAL_TIME[PROBE_WITH_PYAV] / ELAPSED_TIME, FAILED_COUNT))
+		# 4.13.5 RESTORE PROBE SETTING
+		finally:
+			ApplyProgramSetting(ORIGINAL_SETTING)
+			PROBE_MEMO.clear()
+# 4.14 VIDEO SCHEDULER BENCHMARK
+def BenchmarkVideoScheduler(WIDTH=1920, HEIGHT=1080, DURATION=5, FRAME_RATE=30, JOB_COUNT=8, PHOTO_COUNT=16):
+	ORIGINAL_SETTING = {NAME: globals()[NAME] for NAME in ('DEFAULT_FFMPEG_THREAD_COUNT', 'DEFAULT_PROGRESS_INTERVAL', 'DEFAULT_PHOTO_WORKER_COUNT', 'DEFAULT_VIDEO_CORE_BUDGET')}
+	with tempfile.TemporaryDirectory(prefix='usvpfp-benchmark-') as BENCHMARK_FOLDER:
+		BENCHMARK_FOLDER = pathlib.Path(BENCHMARK_FOLDER)
+		SOURCE_PATH      = BENCHMARK_FOLDER / 'source.mkv'
+		# 4.14.1 MAKE SYNTHETIC SOURCE VIDEO AND COPY IT PER JOB
+		try:
+			MakeSyntheticVideo(SOURCE_PATH, WIDTH, HEIGHT, DURATION, FRAME_RATE)
+		except (ffmpeg.Error, FileNotFoundError):
+			print("[!] FFMPEG Not Found Or Without lavfi And libx264")
+			return
+		PROBE_INFO = ProbeVideoWithFFMPEG(SOURCE_PATH)
+		PATH_LIST  = []
+		for INDEX in range(JOB_COUNT):
+			PATH_LIST.append(BENCHMARK_FOLDER / ('clip-%02d.mkv' % INDEX))
+			shutil.copyfile(SOURCE_PATH, PATH_LIST[-1])
+		print("[*] Input %d x testsrc2 %dx%d, %d s, %d fps, profile %s, core budget %d" % (JOB_COUNT, WIDTH, HEIGHT, DURATION, FRAME_RATE, DEFAULT_VIDEO_PROFILE, DEFAULT_VIDEO_CORE_BUDGET))
+		# 4.14.2 FIXED THREAD COUNT IN POWER OF TWO, THEN AUTO PLAN
+		THREAD_OPTION_LIST = [2 ** EXPONENT for EXPONENT in range(DEFAULT_VIDEO_CORE_BUDGET.bit_length()) if 2 ** EXPONENT <= DEFAULT_VIDEO_CORE_BUDGET] + [0]
+		try:
+			# 4.14.3 LOOPING PER THREAD OPTION
+			for THREAD_OPTION in THREAD_OPTION_LIST:
+				ApplyProgramSetting({'DEFAULT_FFMPEG_THREAD_COUNT': THREAD_OPTION, 'DEFAULT_PROGRESS_INTERVAL': 0})
+				THREAD_COUNT = PlanFFMPEGThread(PROBE_INFO)
+				START_TIME   = time.perf_counter()
+				# 4.14.4 SUBMIT ALL JOB, CORE BUDGET DECIDE HOW MANY RUN TOGETHER
+				with concurrent.futures.ThreadPoolExecutor(max_workers=JOB_COUNT) as JOB_POOL:
+					RESULT_LIST = list(JOB_POOL.map(lambda PATH: ConvertVideoWithFFMPEG(PATH, PATH.with_suffix('.mp4'), PROBE_INFO), PATH_LIST))
+				ELAPSED_TIME = time.perf_counter() - START_TIME
+				# 4.14.5 PRINT BENCHMARK RESULT
+				CONFIG_NAME  = '%s %d job x %d thread' % ('auto' if not THREAD_OPTION else 'fixed', max(1, DEFAULT_VIDEO_CORE_BUDGET // THREAD_COUNT), THREAD_COUNT)
+				if RESULT_LIST.count(1) != JOB_COUNT:
+					print("[!] %-24s : Convertion Error" % CONFIG_NAME)
+					continue
+				print("[*] %-24s : %.2f s, aggregate %.1f fps" % (CONFIG_NAME, ELAPSED_TIME, JOB_COUNT * DURATION * FRAME_RATE / ELAPSED_TIME))
+			# 4.14.6 MAKE SYNTHETIC 12 MP PHOTO FOR MIXED FOLDER
+			PHOTO_PATH_LIST = []
+			for INDEX in range(PHOTO_COUNT):
+				PHOTO_PATH_LIST.append(BENCHMARK_FOLDER / ('photo-%02d.jpg' % INDEX))
+				MakeSyntheticPhoto(PHOTO_PATH_LIST[-1], 4000, 3000, INDEX)
+			print("[*] Mixed %d x 12 MP photo and %d x video on %d cpu" % (PHOTO_COUNT, JOB_COUNT, CPU_COUNT))
+			# 4.14.7 LOOPING PER CORE SPLIT, EVERY CORE TO BOTH POOL AGAINST DEFAULT SPLIT
+			for PHOTO_WORKER_COUNT, VIDEO_CORE_BUDGET in ((CPU_COUNT, CPU_COUNT), (ORIGINAL_SETTING['DEFAULT_PHOTO_WORKER_COUNT'], ORIGINAL_SETTING['DEFAULT_VIDEO_CORE_BUDGET'])):
+				ApplyProgramSetting({'DEFAULT_FFMPEG_THREAD_COUNT': 0, 'DEFAULT_PROGRESS_INTERVAL': 0, 'DEFAULT_PHOTO_WORKER_COUNT': PHOTO_WORKER_COUNT, 'DEFAULT_VIDEO_CORE_BUDGET': VIDEO_CORE_BUDGET})
+				START_TIME = time.perf_counter()
+				# 4.14.8 RUN PHOTO POOL AND VIDEO JOB TOGETHER LIKE MIXED FOLDER
+				with concurrent.futures.ProcessPoolExecutor(max_workers=PHOTO_WORKER_COUNT, initializer=ApplyProgramSetting, initargs=(GetProgramSetting(),)) as PHOTO_POOL, concurrent.futures.ThreadPoolExecutor(max_workers=JOB_COUNT) as JOB_POOL:
+					PHOTO_FUTURE_LIST = [PHOTO_POOL.submit(ConvertPhotoWithPillow, PATH, PATH.with_suffix('.png')) for PATH in PHOTO_PATH_LIST]
+					RESULT_LIST       = list(JOB_POOL.map(lambda PATH: ConvertVideoWithFFMPEG(PATH, PATH.with_suffix('.mp4'), PROBE_INFO), PATH_LIST))
+					VIDEO_TIME        = time.perf_counter() - START_TIME
+					RESULT_LIST      += [FUTURE.result() for FUTURE in PHOTO_FUTURE_LIST]
+				ELAPSED_TIME = time.perf_counter() - START_TIME
+				# 4.14.9 PRINT BENCHMARK RESULT WITH CORE ASKED BY BOTH POOL
+				CONFIG_NAME  = '%d photo + %d ffmpeg core' % (PHOTO_WORKER_COUNT, VIDEO_CORE_BUDGET)
+				if RESULT_LIST.count(1) != JOB_COUNT + PHOTO_COUNT:
+					print("[!] %-24s : Convertion Error" % CONFIG_NAME)
+					continue
+				print("[*] %-24s : %.2f s, video done %.2f s, %.1fx cpu asked" % (CONFIG_NAME, ELAPSED_TIME, VIDEO_TIME, (PHOTO_WORKER_COUNT + VIDEO_CORE_BUDGET) / CPU_COUNT))
+		# 4.14.10 RESTORE SETTING AND STOP FFMPEG RUNNER
+		finally:
+			ApplyProgramSetting(ORIGINAL_SETTING)
+			StopFFMPEGRunner()
+# 4.15 LIST SORT KEY BEFORE PRECOMPUTED TUPLE KEY, KEPT FOR COMPARISON
+def BenchmarkNaturalSortListKey(NAME):
+	SORT_KEY = []
+	# 4.15.1 SPLIT AND CONVERT EVERY PART ON EVERY CALL
+	for PART in re.split(r'(\d+)', NAME):
+		if PART.isdigit():
+			SORT_KEY.append(int(PART))
+		else:
+			SORT_KEY.append(PART.lower())
+	return SORT_KEY
+# 4.16 NATURAL SORT BENCHMARK
+def BenchmarkNaturalSort(FILE_COUNT=1000000, FOLDER_COUNT=200000):
+	RANDOM = random.Random(0)
+	# 4.16.1 MAKE SYNTHETIC CAMERA DUMP FILE NAME
+	NAME_FORMAT_LIST = ('IMG_%04d.JPG', 'DSC%05d.jpg', 'VID_20240101_%06d.mp4', 'photo (%d).png', 'Screenshot %d.png', 'PXL_%d.MP.jpg')
+	NAME_LIST        = ['%s-%d' % (RANDOM.choice(NAME_FORMAT_LIST) % RANDOM.randrange(100000), INDEX) for INDEX in range(FILE_COUNT)]
+	print("[*] Input %d synthetic camera file name, python %s" % (FILE_COUNT, sys.version.split()[0]))
+	# 4.16.2 LIST KEY REBUILT WITH RE.SPLIT AND ISDIGIT
+	START_TIME = time.perf_counter()
+	LIST_ORDER = [NAME for SORT_KEY, NAME in sorted((BenchmarkNaturalSortListKey(NAME), NAME) for NAME in NAME_LIST)]
+	print("[*] %-28s : %.2f s" % ('list key', time.perf_counter() - START_TIME))
+	# 4.16.3 TUPLE KEY WITH PRECOMPILED REGEX, CACHE EMPTY
+	GetNaturalSortKey.cache_clear()
+	START_TIME  = time.perf_counter()
+	TUPLE_ORDER = sorted(NAME_LIST, key=GetNaturalSortKey)
+	print("[*] %-28s : %.2f s" % ('tuple key, cold cache', time.perf_counter() - START_TIME))
+	# 4.16.4 RESORT ONE LARGE FOLDER WITH WARM CACHE, LIKE PLAN THEN EXECUTE
+	FOLDER_LIST = NAME_LIST[:min(FOLDER_COUNT, SORT_KEY_CACHE_SIZE)]
+	sorted(FOLDER_LIST, key=GetNaturalSortKey)
+	START_TIME  = time.perf_counter()
+	sorted(FOLDER_LIST, key=GetNaturalSortKey)
+	print("[*] %-28s : %.2f s" % ('tuple key, warm %d' % len(FOLDER_LIST), time.perf_counter() - START_TIME))
+	# 4.16.5 CHECK BOTH KEY GIVE SAME ORDER
+	if LIST_ORDER != TUPLE_ORDER:
+		print("[!] Natural Sort Order Mismatch")
+	GetNaturalSortKey.cache_clear()
+# 4.17 MAKE DETERMINISTIC BENCHMARK CORPUS, REUSE IF SAME SCALE
+def MakeBenchmarkCorpus(CORPUS_FOLDER, SCALE):
+	CORPUS      = BENCHMARK_CORPUS[SCALE]
+	MARKER_PATH = CORPUS_FOLDER / '.usvpfp-corpus.json'
+	MARKER      = {'version': BENCHMARK_VERSION, 'scale': SCALE}
+	# 4.17.1 REUSE CORPUS MADE BY EARLIER RUN SO COMMIT COMPARE ON SAME INPUT
+	try:
+		with open(MARKER_PATH, 'r', encoding='utf-8') as MARKER_FILE:
+			if json.load(MARKER_FILE) == MARKER:
+				print("[*] Reuse Corpus %s" % str(CORPUS_FOLDER)[-64:])
+				return
+	except (OSError, ValueError):
+		pass
+	print("[*] Make %s Corpus %s" % (SCALE, str(CORPUS_FOLDER)[-64:]))
+	# 4.17.2 MAKE 4:3 PHOTO PER MEGAPIXEL AND FORMAT
+	for SUBFOLDER_NAME in ('photo', 'gif', 'video'):
+		shutil.rmtree(CORPUS_FOLDER / SUBFOLDER_NAME, ignore_errors=True)
+		(CORPUS_FOLDER / SUBFOLDER_NAME).mkdir(parents=True)
+	for MEGAPIXEL in CORPUS['megapixel']:
+		HEIGHT = int((MEGAPIXEL * 1000000 * 3 / 4) ** 0.5)
+		WIDTH  = HEIGHT * 4 // 3
+		for SUFFIX in BENCHMARK_PHOTO_FORMAT:
+			for INDEX in range(CORPUS['photo_count']):
+				MakeSyntheticPhoto(CORPUS_FOLDER / 'photo' / ('%sMP_%s%s' % (MEGAPIXEL, INDEX, SUFFIX)), WIDTH, HEIGHT, INDEX)
+	# 4.17.3 MAKE ANIMATED GIF
+	for INDEX in range(CORPUS['gif_count']):
+		MakeSyntheticGif(CORPUS_FOLDER / 'gif' / ('animation_%s.gif' % INDEX), *CORPUS['gif'])
+	# 4.17.4 MAKE TESTSRC2 VIDEO PER RESOLUTION
+	for VIDEO_NAME, (WIDTH, HEIGHT) in BENCHMARK_VIDEO_SIZE.items():
+		try:
+			MakeSyntheticVideo(CORPUS_FOLDER / 'video' / ('%s.mkv' % VIDEO_NAME), WIDTH, HEIGHT, CORPUS['video_duration'])
+		except (ffmpeg.Error, FileNotFoundError):
+			print("[!] FFMPEG Not Found Or Without lavfi And libx264, Corpus Without Video")
+			break
+	# 4.17.5 WRITE MARKER LAST SO HALF MADE CORPUS GET MADE AGAIN
+	with open(MARKER_PATH, 'w', encoding='utf-8') as MARKER_FILE:
+		json.dump(MARKER, MARKER_FILE)
+# 4.18 READ WALL TIME, CPU TIME, AND PEAK MEMORY OF PROCESS AND CHILDREN
+def MeasureBenchmarkUsage():
+	# 4.18.1 FILTER NO RESOURCE MODULE ON WINDOWS, CHILD PROCESS NOT COUNTED
+	if resource is None:
+		return time.perf_counter(), time.process_time(), float('nan')
+	# 4.18.2 SUM USER AND SYSTEM TIME OF PROCESS AND WAITED CHILD LIKE FFMPEG
+	SELF_USAGE  = resource.getrusage(resource.RUSAGE_SELF)
+	CHILD_USAGE = resource.getrusage(resource.RUSAGE_CHILDREN)
+	CPU_TIME    = SELF_USAGE.ru_utime + SELF_USAGE.ru_stime + CHILD_USAGE.ru_utime + CHILD_USAGE.ru_stime
+	# 4.18.3 RETURN WALL TIME, CPU TIME, AND LARGEST CHILD PEAK MEMORY
+	return time.perf_counter(), CPU_TIME, CHILD_USAGE.ru_maxrss / (1048576 if sys.platform == 'darwin' else 1024)
+# 4.19 RUN ONE BENCHMARK STAGE INSIDE FRESH PROCESS
+def BenchmarkStageWorker(STAGE, CORPUS_FOLDER, WORK_FOLDER, RENAME_COUNT):
+	MEDIA_LIST = [FILE for FOLDER_NAME, FILE_LIST in ScanDirectoryWithScandir(CORPUS_FOLDER) for FILE in FILE_LIST]
+	FILE_LIST  = MEDIA_LIST
+	RESULT     = {'stage': STAGE, 'failed': 0}
+	# 4.19.1 PREPARE INPUT OUTSIDE MEASURED TIME
+	if STAGE in ('scan', 'rename'):
+		FILE_LIST = []
+		for INDEX in range(RENAME_COUNT):
+			FILE_LIST.append(WORK_FOLDER / ('%03d' % (INDEX % 100 if STAGE == 'scan' else 0)) / ('IMG_%06d.jpg' % INDEX))
+			FILE_LIST[-1].parent.mkdir(exist_ok=True)
+			FILE_LIST[-1].touch()
+	elif STAGE in ('photo-convert', 'gif-convert', 'video-encode'):
+		FILE_LIST = [FILE for FILE in MEDIA_LIST if GetFileCategory(FILE) == {'photo-convert': 'photo', 'gif-convert': 'gif', 'video-encode': 'video'}[STAGE]]
+	elif STAGE == 'end-to-end':
+		shutil.copytree(CORPUS_FOLDER, WORK_FOLDER / 'corpus')
+		FILE_LIST = [WORK_FOLDER / 'corpus' / FILE.relative_to(CORPUS_FOLDER) for FILE in MEDIA_LIST]
+		ApplyProgramSetting({
+			'DEFAULT_PROBE_CACHE_PATH': WORK_FOLDER / '.usvpfp-probe-cache.sqlite3',
+			'DEFAULT_JOURNAL_PATH'    : WORK_FOLDER / '.usvpfp-journal.jsonl',
+			'DEFAULT_PROGRESS_INTERVAL': 0,
+		})
+	RESULT['files'] = len(FILE_LIST)
+	RESULT['bytes'] = sum(os.path.getsize(FILE) for FILE in FILE_LIST)
+	START_WALL, START_CPU, START_CHILD_PEAK = MeasureBenchmarkUsage()
+	# 4.19.2 RUN STAGE, KEEP PER FILE LINE OUT OF REPORT
+	with open(os.devnull, 'w') as NULL_FILE, contextlib.redirect_stdout(NULL_FILE):
+		if STAGE == 'scan':
+			RESULT['files'] = sum(len(SCAN_FILE_LIST) for FOLDER_NAME, SCAN_FILE_LIST in ScanDirectoryWithScandir(WORK_FOLDER))
+		elif STAGE == 'probe':
+			for FILE in FILE_LIST:
+				PROBE_INFO = ProbeVideoWithFFMPEG(FILE) if GetFileCategory(FILE) == 'video' else ProbeImageHeader(FILE)
+				RESULT['failed'] += PROBE_INFO is None
+		elif STAGE in ('photo-convert', 'gif-convert', 'video-encode'):
+			for FILE in FILE_LIST:
+				CONVERTION_RESULT, PROBE_INFO, METRIC = ProbeAndConvertFile(GetFileCategory(FILE), FILE, WORK_FOLDER / ('%s%s' % (FILE.name, GetOutputFormat(GetFileCategory(FILE)))))
+				RESULT['failed'] += CONVERTION_RESULT == 3
+		elif STAGE == 'rename':
+			MOVE_LIST = [(FILE, FILE.parent / ('%d.png' % INDEX)) for INDEX, FILE in enumerate(SortFileListNaturally(FILE_LIST))]
+			RESULT['failed'] += not ApplyFolderRename(OrderFolderRename(MOVE_LIST))
+		elif STAGE == 'end-to-end':
+			RESULT['folders'] = SortAndConvertAndRenameLogic(ScanDirectoryWithScandir(WORK_FOLDER / 'corpus'))
+	StopFFMPEGRunner()
+	END_WALL, END_CPU, END_CHILD_PEAK = MeasureBenchmarkUsage()
+	# 4.19.3 RETURN STAGE MEASUREMENT
+	RESULT.update({
+		'wall_second'         : round(END_WALL - START_WALL, 4),
+		'cpu_second'          : round(END_CPU - START_CPU, 4),
+		'peak_rss_mb'         : round(GetPeakMemoryMegabyte(), 1),
+		'child_peak_rss_mb'   : round(END_CHILD_PEAK, 1),
+		'files_per_second'    : round(RESULT['files'] / max(END_WALL - START_WALL, 1e-9), 2),
+	})
+	return RESULT
+# 4.20 BENCHMARK SUITE OVER SYNTHETIC CORPUS WITH JSON REPORT
+def BenchmarkSuite(SCALE='quick', OUTPUT_PATH=None, CORPUS_FOLDER=None):
+	with tempfile.TemporaryDirectory(prefix='usvpfp-benchmark-') as BENCHMARK_FOLDER:
+		BENCHMARK_FOLDER = pathlib.Path(BENCHMARK_FOLDER)
+		CORPUS_FOLDER    = pathlib.Path(CORPUS_FOLDER) if CORPUS_FOLDER else BENCHMARK_FOLDER / 'corpus'
+		# 4.20.1 MAKE OR REUSE CORPUS
+		MakeBenchmarkCorpus(CORPUS_FOLDER, SCALE)
+		# 4.20.2 RECORD ENVIRONMENT SO REPORT FROM DIFFERENT COMMIT CAN BE COMPARED
+		try:
+			COMMIT = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=os.path.dirname(os.path.abspath(__file__)), capture_output=True, text=True).stdout.strip() or None
+		except OSError:
+			COMMIT = None
+		REPORT = {
+			'version'  : BENCHMARK_VERSION,
+			'time'     : time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+			'commit'   : COMMIT,
+			'python'   : sys.version.split()[0],
+			'platform' : sys.platform,
+			'cpu_count': os.cpu_count(),
+			'scale'    : SCALE,
+			'setting'  : {NAME: GetProgramSetting()[NAME] for NAME in ('DEFAULT_PHOTO_DECODE_MODE', 'DEFAULT_GIF_BACKEND', 'DEFAULT_VIDEO_PROFILE', 'DEFAULT_PNG_PROFILE', 'DEFAULT_PHOTO_OUTPUT', 'DEFAULT_PHOTO_QUALITY', 'DEFAULT_FFMPEG_THREAD_COUNT', 'DEFAULT_VIDEO_CORE_BUDGET', 'DEFAULT_PHOTO_WORKER_COUNT')},
+			'stage'    : [],
+		}
+		print("[*] Scale %s, python %s, %s cpu, commit %s" % (SCALE, REPORT['python'], REPORT['cpu_count'], (COMMIT or 'unknown')[:12]))
+		# 4.20.3 LOOPING PER STAGE IN FRESH PROCESS AND FRESH WORK FOLDER
+		for STAGE in BENCHMARK_STAGE:
+			WORK_FOLDER = pathlib.Path(tempfile.mkdtemp(prefix='%s-' % STAGE, dir=str(BENCHMARK_FOLDER)))
+			RESULT      = RunInFreshProcess(BenchmarkStageWorker, GetProgramSetting(), STAGE, CORPUS_FOLDER, WORK_FOLDER, BENCHMARK_CORPUS[SCALE]['rename_count'])
+			shutil.rmtree(WORK_FOLDER, ignore_errors=True)
+			REPORT['stage'].append(RESULT)
+			# 4.20.4 PRINT STAGE RESULT
+			print("[*] %-13s : %6d file, %8.2f s wall, %8.2f s cpu, %10.1f file/s, peak %.1f MiB, %d failed" % (STAGE, RESULT['files'], RESULT['wall_second'], RESULT['cpu_second'], RESULT['files_per_second'], RESULT['peak_rss_mb'], RESULT['failed']))
+	# 4.20.5 WRITE JSON REPORT OR PRINT IT
+	if OUTPUT_PATH is None:
+		print(json.dumps(REPORT, indent=1))
+		return
+	try:
+		with open(OUTPUT_PATH, 'w', encoding='utf-8') as OUTPUT_FILE:
+			json.dump(REPORT, OUTPUT_FILE, indent=1)
+		print("[*] Report Written To %s" % str(OUTPUT_PATH)[-64:])
+	except OSError:
+		print("[!] Report File %s Write Error" % str(OUTPUT_PATH)[-64:])
+# 4.21 PNG ENCODE PROFILE AND OPTIMIZER BENCHMARK
+def BenchmarkPngEncode(MEGAPIXEL=12, IMAGE_COUNT=3):
+	with tempfile.TemporaryDirectory(prefix='usvpfp-benchmark-') as BENCHMARK_FOLDER:
+		BENCHMARK_FOLDER = pathlib.Path(BENCHMARK_FOLDER)
+		HEIGHT           = int((MEGAPIXEL * 1000000 * 3 / 4) ** 0.5)
+		WIDTH            = HEIGHT * 4 // 3
+		IMAGE_LIST       = []
+		# 4.21.1 MAKE SYNTHETIC PHOTO RESIZED LIKE NORMAL RUN, ENCODE ONLY IS MEASURED
+		for INDEX in range(IMAGE_COUNT):
+			MakeSyntheticPhoto(BENCHMARK_FOLDER / ('%s.jpg' % INDEX), WIDTH, HEIGHT, INDEX)
+			with Image.open(BENCHMARK_FOLDER / ('%s.jpg' % INDEX)) as INPUT_IMAGE_FILE:
+				IMAGE_LIST.append(INPUT_IMAGE_FILE.resize((WIDTH * DEFAULT_SHORT_SIDE_RESOLUTION // HEIGHT, DEFAULT_SHORT_SIDE_RESOLUTION), Image.LANCZOS))
+		print("[*] Input %s Photo %dMP Resized To %dx%d" % (IMAGE_COUNT, MEGAPIXEL, *IMAGE_LIST[0].size))
+		# 4.21.2 LOOPING PER PNG ENCODE PROFILE
+		for PNG_PROFILE, ENCODE_OPTION in PNG_ENCODE_PROFILE.items():
+			TIME_LIST, SIZE_LIST = [], []
+			for INDEX, RESIZED_IMAGE in enumerate(IMAGE_LIST):
+				START_TIME    = time.perf_counter()
+				OUTPUT_BUFFER = io.BytesIO()
+				RESIZED_IMAGE.save(OUTPUT_BUFFER, format='PNG', **ENCODE_OPTION)
+				TIME_LIST.append(time.perf_counter() - START_TIME)
+				SIZE_LIST.append(OUTPUT_BUFFER.getbuffer().nbytes)
+				with open(BENCHMARK_FOLDER / ('%s_%s.png' % (PNG_PROFILE, INDEX)), 'wb') as OUTPUT_FILE:
+					OUTPUT_FILE.write(OUTPUT_BUFFER.getbuffer())
+			# 4.21.3 PRINT ENCODE TIME VERSUS OUTPUT BYTE
+			print("[*] %-9s : %.3f s/image, %8.1f KiB/image" % (PNG_PROFILE, sum(TIME_LIST) / IMAGE_COUNT, sum(SIZE_LIST) / IMAGE_COUNT / 1024))
+		# 4.21.4 LOOPING PER INSTALLED OPTIMIZER ON TOP OF FAST PROFILE OUTPUT
+		for PNG_OPTIMIZER_NAME, COMMAND in PNG_OPTIMIZER_COMMAND.items():
+			if shutil.which(COMMAND[0]) is None:
+				print("[!] %-9s : Not Installed" % PNG_OPTIMIZER_NAME)
+				continue
+			TIME_LIST, SIZE_LIST = [], []
+			for INDEX in range(IMAGE_COUNT):
+				INPUT_PATH, OUTPUT_PATH = BENCHMARK_FOLDER / ('fast_%s.png' % INDEX), BENCHMARK_FOLDER / ('%s_%s.png' % (PNG_OPTIMIZER_NAME, INDEX))
+				START_TIME = time.perf_counter()
+				subprocess.run([PART.format(input=INPUT_PATH, output=OUTPUT_PATH) for PART in COMMAND], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+				TIME_LIST.append(time.perf_counter() - START_TIME)
+				SIZE_LIST.append(os.path.getsize(OUTPUT_PATH) if OUTPUT_PATH.exists() else os.path.getsize(INPUT_PATH))
+			# 4.21.5 PRINT OPTIMIZER TIME VERSUS OUTPUT BYTE
+			print("[*] %-9s : %.3f s/image, %8.1f KiB/image, After Fast Encode" % (PNG_OPTIMIZER_NAME, sum(TIME_LIST) / IMAGE_COUNT, sum(SIZE_LIST) / IMAGE_COUNT / 1024))
+# 4.22 LEASE QUEUE SPREAD ACROSS STAGGERED LOCAL WORKER
+def BenchmarkLeaseQueue(FOLDER_COUNT=20, PHOTO_COUNT=3, WORKER_COUNT=3, STAGGER_SECOND=3):
+	with tempfile.TemporaryDirectory(prefix='usvpfp-benchmark-') as BENCHMARK_FOLDER:
+		BENCHMARK_FOLDER = pathlib.Path(BENCHMARK_FOLDER)
+		# 4.22.1 MAKE FOLDER OF PHOTO ABOVE STANDARD RESOLUTION
+		MakeSyntheticPhoto(BENCHMARK_FOLDER / 'source.jpg', 1600, 1200)
+		for FOLDER_INDEX in range(FOLDER_COUNT):
+			(BENCHMARK_FOLDER / ('folder_%03d' % FOLDER_INDEX)).mkdir()
+			for PHOTO_INDEX in range(PHOTO_COUNT):
+				shutil.copyfile(BENCHMARK_FOLDER / 'source.jpg', BENCHMARK_FOLDER / ('folder_%03d' % FOLDER_INDEX) / ('photo_%s.jpg' % PHOTO_INDEX))
+		(BENCHMARK_FOLDER / 'source.jpg').unlink()
+		print("[*] Input %d Folder Of %d Photo, %d Worker Started %d s Apart" % (FOLDER_COUNT, PHOTO_COUNT, WORKER_COUNT, STAGGER_SECOND))
+		# 4.22.2 RUN COORDINATOR AND STAGGERED WORKER AS SEPARATE PROCESS LIKE SEPARATE HOST
+		COMMAND      = [sys.executable, os.path.abspath(__file__)]
+		START_TIME   = time.perf_counter()
+		PROCESS_LIST = [subprocess.Popen(COMMAND + ['--coordinator'], cwd=BENCHMARK_FOLDER, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)]
+		for WORKER_INDEX in range(WORKER_COUNT):
+			if WORKER_INDEX:
+				time.sleep(STAGGER_SECOND)
+			PROCESS_LIST.append(subprocess.Popen(COMMAND + ['--worker'], cwd=BENCHMARK_FOLDER, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL))
+		for PROCESS in PROCESS_LIST:
+			PROCESS.wait()
+		ELAPSED_TIME = time.perf_counter() - START_TIME
+		# 4.22.3 COUNT DONE FOLDER PER WORKER FROM LEASE OWNER
+		CONNECTION = sqlite3.connect(str(BENCHMARK_FOLDER / DEFAULT_QUEUE_PATH.name))
+		OWNER_LIST = CONNECTION.execute("SELECT owner, COUNT(*) FROM lease WHERE state = 'done' GROUP BY owner ORDER BY MIN(heartbeat)").fetchall()
+		DONE_COUNT = sum(COUNT for OWNER, COUNT in OWNER_LIST)
+		CONNECTION.close()
+		# 4.22.4 PRINT FOLDER PER WORKER, EVERY WORKER SHOULD GET SHARE OF QUEUE
+		for OWNER, COUNT in OWNER_LIST:
+			print("[*] Worker %-32s : %3d Folder" % (OWNER[-32:], COUNT))
+		print("[*] %d Of %d Folder Done In %.1f s" % (DONE_COUNT, FOLDER_COUNT, ELAPSED_TIME))
+		if len(OWNER_LIST) < WORKER_COUNT:
+			print("[!] %d Worker Got No Folder, Lease Not Spread" % (WORKER_COUNT - len(OWNER_LIST)))
+# 5 MAIN PROGRAM
+# 5.1 PARSE COMMAND LINE ARGUMENT
+def ParseArgumentWithArgparse():
+	ARGUMENT_PARSER = argparse.ArgumentParser(description="United Standard Video & Photo Format Program", epilog="required: pip install ffmpeg-python pillow, optional: pip install av for video probe inside process without ffprobe spawn")
+	# 5.1.1 PHOTO DECODE MODE ARGUMENT
+	ARGUMENT_PARSER.add_argument('--photo-mode', choices=PHOTO_DECODE_MODE, default=DEFAULT_PHOTO_DECODE_MODE, help="quality: full decode, fast: draft JPEG decode and reducing_gap resize")
+	# 5.1.2 ANIMATED GIF BACKEND ARGUMENT
+	ARGUMENT_PARSER.add_argument('--gif-backend', choices=GIF_RESIZE_BACKEND, default=DEFAULT_GIF_BACKEND, help="auto: ffmpeg for large gif, stream: frame by frame with bounded memory, memory: hold all frame, ffmpeg: palettegen and paletteuse")
+	# 5.1.3 VIDEO ENCODE PROFILE ARGUMENT
+	ARGUMENT_PARSER.add_argument('--video-profile', choices=tuple(VIDEO_ENCODE_PROFILE), default=DEFAULT_VIDEO_PROFILE, help="archive: slow crf 18, balanced: medium crf 20, fast: veryfast crf 22, draft: ultrafast crf 26")
+	# 5.1.4 PNG ENCODE PROFILE AND OPTIMIZER ARGUMENT
+	ARGUMENT_PARSER.add_argument('--png-profile', choices=tuple(PNG_ENCODE_PROFILE), default=DEFAULT_PNG_PROFILE, help="fast: zlib level 1 rle, balanced: level 6, small: level 9, optimize: pillow optimize, slowest")
+	ARGUMENT_PARSER.add_argument('--png-optimizer', choices=tuple(PNG_OPTIMIZER_COMMAND), help="also run external optimizer on committed png in background pool, keep result only if smaller")
+	# 5.1.5 PHOTO OUTPUT FORMAT ARGUMENT
+	ARGUMENT_PARSER.add_argument('--photo-output', choices=tuple(PHOTO_OUTPUT_FORMAT), default=DEFAULT_PHOTO_OUTPUT, help="png: lossless, webp: lossy at --photo-quality, webp-lossless, avif: lossy at --photo-quality if pillow built with avif")
+	ARGUMENT_PARSER.add_argument('--photo-quality', type=int, default=DEFAULT_PHOTO_QUALITY, help="quality 1 to 100 for lossy webp and avif output")
+	# 5.1.6 SEGMENT ENCODE THRESHOLD ARGUMENT
+	ARGUMENT_PARSER.add_argument('--segment-min-second', type=int, default=DEFAULT_SEGMENT_MIN_SECOND, help="encode video at least this long as parallel segment, 0 for never")
+	# 5.1.7 PLAN ARGUMENT
+	ARGUMENT_PARSER.add_argument('--dry-run', action='store_true', help="print planned convertion and rename without touching media")
+	ARGUMENT_PARSER.add_argument('--plan-output', metavar='PATH', help="write convertion plan as json lines without touching media")
+	ARGUMENT_PARSER.add_argument('--execute-plan', metavar='PATH', help="execute convertion plan from --plan-output instead of scan")
+	# 5.1.8 DISTRIBUTED QUEUE ARGUMENT
+	ARGUMENT_GROUP = ARGUMENT_PARSER.add_mutually_exclusive_group()
+	ARGUMENT_GROUP.add_argument('--coordinator', action='store_true', help="enqueue scanned folder as lease in shared queue and wait for worker")
+	ARGUMENT_GROUP.add_argument('--worker', action='store_true', help="claim folder lease from shared queue and convert it, run on any host sharing working directory")
+	ARGUMENT_PARSER.add_argument('--queue', metavar='PATH', default=str(DEFAULT_QUEUE_PATH), help="shared sqlite lease queue for --coordinator and --worker")
+	# 5.1.9 BENCHMARK ARGUMENT
+	ARGUMENT_PARSER.add_argument('--benchmark', choices=('photo-decode', 'gif-backend', 'video-profile', 'video-probe', 'video-scheduler', 'natural-sort', 'png-encode', 'lease-queue', 'suite'), help="run benchmark on synthetic media instead of working directory, suite: every stage with json report")
+	ARGUMENT_PARSER.add_argument('--benchmark-scale', choices=tuple(BENCHMARK_CORPUS), default='quick', help="corpus size for --benchmark suite")
+	ARGUMENT_PARSER.add_argument('--benchmark-output', metavar='PATH', help="write --benchmark suite json report to file instead of print")
+	ARGUMENT_PARSER.add_argument('--benchmark-corpus', metavar='PATH', help="make corpus once in this folder and reuse it on next --benchmark suite")
+	# 5.1.10 RUN METRIC ARGUMENT
+	ARGUMENT_PARSER.add_argument('--metrics-output', metavar='PATH', default=str(DEFAULT_METRICS_PATH), help="json report of stage time histogram and file count per extension, written at exit")
+	ARGUMENT_PARSER.add_argument('--metrics-textfile', metavar='PATH', help="also write metric in prometheus text format, for node exporter textfile collector")
+	# 5.1.11 PROFILE ARGUMENT
+	ARGUMENT_PARSER.add_argument('--profile', metavar='PATH', nargs='?', const=str(DEFAULT_WORKING_DIRECTORY / '.usvpfp-profile.folded'), help="sample stack of every convertion and write collapsed stack for flamegraph, default .usvpfp-profile.folded")
+	# 5.1.12 RETURN PARSED ARGUMENT
+	return ARGUMENT_PARSER.parse_args()
+# 5.2 MAIN PROGRAM FUNCTION
 def Main():
-	# 4.1.1 CHECK DIRECTORY EXIST
+	ARGUMENT = ParseArgumentWithArgparse()
+	# 5.2.1 APPLY COMMAND LINE ARGUMENT
+	ApplyProgramSetting({
+		'DEFAULT_PHOTO_DECODE_MODE' : ARGUMENT.photo_mode,
+		'DEFAULT_GIF_BACKEND'       : ARGUMENT.gif_backend,
+		'DEFAULT_VIDEO_PROFILE'     : ARGUMENT.video_profile,
+		'DEFAULT_PNG_PROFILE'       : ARGUMENT.png_profile,
+		'DEFAULT_PNG_OPTIMIZER'     : ARGUMENT.png_optimizer,
+		'DEFAULT_PHOTO_OUTPUT'      : ARGUMENT.photo_output,
+		'DEFAULT_PHOTO_QUALITY'     : ARGUMENT.photo_quality,
+		'DEFAULT_SEGMENT_MIN_SECOND': ARGUMENT.segment_min_second,
+		'DEFAULT_METRICS_PATH'      : ARGUMENT.metrics_output,
+		'DEFAULT_METRICS_TEXTFILE'  : ARGUMENT.metrics_textfile,
+		'DEFAULT_PROFILE_PATH'      : ARGUMENT.profile,
+	})
+	if DEFAULT_PROFILE_PATH:
+		os.register_at_fork(after_in_child=ResetProfileSampler)
+	if DEFAULT_PNG_OPTIMIZER and shutil.which(PNG_OPTIMIZER_COMMAND[DEFAULT_PNG_OPTIMIZER][0]) is None:
+		print("[!] PNG Optimizer %s Not Found, Skip Optimize" % DEFAULT_PNG_OPTIMIZER)
+		ApplyProgramSetting({'DEFAULT_PNG_OPTIMIZER': None})
+	if DEFAULT_PHOTO_OUTPUT != 'png' and not features.check(GetOutputFormat('photo')[1:]):
+		print("[!] Pillow Without %s Support, Try Other --photo-output" % DEFAULT_PHOTO_OUTPUT.upper())
+		return
+	START_TIME, START_COUNTER = time.time(), time.perf_counter()
 	try:
+		# 5.2.2 RUN BENCHMARK
+		if ARGUMENT.benchmark == 'photo-decode':
+			BenchmarkPhotoDecodeMode()
+			return
+		if ARGUMENT.benchmark == 'gif-backend':
+			BenchmarkGifBackend()
+			return
+		if ARGUMENT.benchmark == 'video-profile':
+			BenchmarkVideoProfile()
+			return
+		if ARGUMENT.benchmark == 'video-probe':
+			BenchmarkVideoProbe()
+			return
+		if ARGUMENT.benchmark == 'video-scheduler':
+			BenchmarkVideoScheduler()
+			return
+		if ARGUMENT.benchmark == 'natural-sort':
+			BenchmarkNaturalSort()
+			return
+		if ARGUMENT.benchmark == 'png-encode':
+			BenchmarkPngEncode()
+			return
+		if ARGUMENT.benchmark == 'lease-queue':
+			BenchmarkLeaseQueue()
+			return
+		if ARGUMENT.benchmark == 'suite':
+			BenchmarkSuite(ARGUMENT.benchmark_scale, ARGUMENT.benchmark_output, ARGUMENT.benchmark_corpus)
+			return
+		# 5.2.3 CHECK DIRECTORY EXIST
 		if not DEFAULT_WORKING_DIRECTORY.exists():
 			print("[!] Direktori Tidak Ditemukan")
 			return
-		# 4.1.2 CHECK DIRECTORY IS DIRECTORY
+		# 5.2.4 CHECK DIRECTORY IS DIRECTORY
 		if not DEFAULT_WORKING_DIRECTORY.is_dir():
 			print("[!] Direktori Tidak Valid")
 			return
-		# 4.1.3 START SCAN DIRECTORY
-		print("[*] Scan Directory %s" % str(DEFAULT_WORKING_DIRECTORY.resolve())[-64:])
-		SCAN_DIRECTORY_RESULT = ScanDirectoryWithPathlib(DEFAULT_WORKING_DIRECTORY)
-		# 4.1.4 FILTER SCAN RESULT CONTENT
-		if not SCAN_DIRECTORY_RESULT:
+		# 5.2.5 RUN COORDINATOR, ENQUEUE FOLDER INSTEAD OF CONVERT
+		if ARGUMENT.coordinator:
+			print("[*] Coordinate Directory %s" % str(DEFAULT_WORKING_DIRECTORY.resolve())[-64:])
+			if RunLeaseCoordinator(ARGUMENT.queue) is not None:
+				print("[*] All Operation Finish, Exit")
+			return
+		# 5.2.6 RUN WORKER, CONVERT CLAIMED FOLDER UNTIL QUEUE EMPTY
+		if ARGUMENT.worker:
+			try:
+				print("[*] Worker Processed %d Folder, Exit" % RunLeaseWorker(ARGUMENT.queue))
+			finally:
+				WriteMetricReport('worker', START_TIME, time.perf_counter() - START_COUNTER)
+			return
+		# 5.2.7 START SCAN DIRECTORY OR READ PLAN FILE
+		INCREMENTAL_STATE = LoadIncrementalState(DEFAULT_STATE_PATH) if DEFAULT_INCREMENTAL_MODE else None
+		if ARGUMENT.execute_plan:
+			print("[*] Execute Plan %s" % ARGUMENT.execute_plan[-64:])
+			SCAN_DIRECTORY_RESULT = ReadPlanFile(ARGUMENT.execute_plan)
+		else:
+			print("[*] Scan Directory %s" % str(DEFAULT_WORKING_DIRECTORY.resolve())[-64:])
+			SCAN_DIRECTORY_RESULT = ScanDirectoryWithScandir(DEFAULT_WORKING_DIRECTORY, INCREMENTAL_STATE)
+		# 5.2.8 PLAN ONLY RUN, PRINT OR WRITE PLAN AND KEEP STATE UNTOUCHED
+		if ARGUMENT.dry_run or ARGUMENT.plan_output:
+			if ARGUMENT.dry_run:
+				FOLDER_COUNT = SortAndConvertAndRenameLogic(SCAN_DIRECTORY_RESULT, INCREMENTAL_STATE, PrintFolderPlan)
+			else:
+				with open(ARGUMENT.plan_output, 'w', encoding='utf-8') as PLAN_FILE:
+					FOLDER_COUNT = SortAndConvertAndRenameLogic(SCAN_DIRECTORY_RESULT, INCREMENTAL_STATE, lambda PLAN: PLAN_FILE.write(json.dumps(PLAN, separators=(',', ':')) + '\n'))
+			print("[*] Planned %s Folder, Nothing Changed" % FOLDER_COUNT)
+			return
+		# 5.2.9 SORT, CONVERT, AND RENAME FILE WHILE SCANNING
+		try:
+			FOLDER_COUNT = SortAndConvertAndRenameLogic(SCAN_DIRECTORY_RESULT, INCREMENTAL_STATE)
+		# 5.2.10 SAVE INCREMENTAL STATE AND WRITE RUN METRIC EVEN AFTER INTERRUPT
+		finally:
+			if INCREMENTAL_STATE is not None:
+				SaveIncrementalState(DEFAULT_STATE_PATH, INCREMENTAL_STATE)
+			WriteMetricReport('convert', START_TIME, time.perf_counter() - START_COUNTER)
+		# 5.2.11 FILTER SCAN RESULT CONTENT
+		if not FOLDER_COUNT:
+			if INCREMENTAL_STATE is not None:
+				print("[*] No Changed Folder Since Last Run")
+				return
 			print("[!] Empty Directory")
 			return
-		# 4.1.5 SORT, CONVERT, AND RENAME FILE
-		SortAndConvertAndRenameLogic(SCAN_DIRECTORY_RESULT)
-		# 4.1.6 PRINT ALL OPERATION END
+		# 5.2.12 PRINT ALL OPERATION END
 		print("[*] All Operation Finish, Exit")
-	# 4.1.6 ERROR KEYBOARD INTERRUPT HANDLING
+	# 5.2.13 ERROR KEYBOARD INTERRUPT HANDLING
 	except KeyboardInterrupt:
 		print("[!] Keyboard Interrupt")
 		return
-# 4.2 START PROGRAM
+# 5.3 START PROGRAM
 if __name__ == '__main__':
 	Main()
-# 4.3 END OF FILE
\ No newline at end of file
+# 5.4 END OF FILE
\ No newline at end of file